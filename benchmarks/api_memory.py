@@ -0,0 +1,83 @@
+"""
+Requests per second of the metadata endpoints with the in-memory engine.
+
+The app runs in-process behind httpx's ASGI transport with METADATA_ENGINE
+set to memory, so the figures are the cost of the API layer itself (routing,
+auth, validation, serialisation) with no network or database underneath.
+Use them as the ceiling the Hasura and Postgres engines are compared to.
+
+Usage:
+    python -m benchmarks.api_memory [requests] [concurrency] [objects]
+"""
+import sys
+import time
+import uuid
+import asyncio
+import logging
+
+import httpx
+from jose import jwt
+
+from config.settings import settings
+from src.database.memory import InMemoryEngine
+from src.schema.requests.storage import Bucket
+
+OWNER = uuid.uuid4()
+
+
+async def seed(app, objects: int):
+    engine = InMemoryEngine(store=app.state.metadata_store)
+    await engine.create_bucket(Bucket(name="benchmark"), OWNER)
+    for i in range(objects):
+        await engine.create_file("benchmark", f"obj-{i:09d}", OWNER)
+
+
+async def hammer(client: httpx.AsyncClient, method: str, url: str, requests: int, concurrency: int, **kwargs):
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.request(method, url, **kwargs)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def run(requests: int, concurrency: int, objects: int):
+    settings.METADATA_ENGINE = "memory"
+    from main import app
+
+    token = jwt.encode(
+        {"sub": str(OWNER), "aud": "authenticated", "exp": int(time.time()) + 3600},
+        settings.GOTRUE_JWT_SECRET,
+        algorithm=settings.ALGORITHM
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    cases = (
+        ("list buckets", "GET", "/v1/buckets", {}),
+        ("list files", "GET", "/v1/buckets/benchmark", {"params": {"limit": 100}}),
+        ("batch get", "POST", "/v1/buckets/benchmark/batch/get",
+         {"json": {"keys": [f"obj-{i:09d}" for i in range(0, objects, max(objects // 50, 1))]}}),
+    )
+
+    async with app.router.lifespan_context(app):
+        await seed(app, objects)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", headers=headers) as client:
+            for name, method, url, kwargs in cases:
+                elapsed = await hammer(client, method, url, requests, concurrency, **kwargs)
+                print(f"{name:<14} {requests / elapsed:>9.0f} req/s {elapsed / requests * 1e3:>7.2f} ms each")
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    objects = int(sys.argv[3]) if len(sys.argv) > 3 else 100_000
+    logging.disable(logging.INFO)
+    asyncio.run(run(requests, concurrency, objects))
+
+
+if __name__ == "__main__":
+    main()
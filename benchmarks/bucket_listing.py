@@ -0,0 +1,90 @@
+"""
+Latency of listing one user's buckets as the total number of buckets grows.
+
+A mock Hasura holds ``total`` buckets spread over many owners. The unfiltered
+query returns the whole table, as the listing did before owner filtering. The
+paginated query gets only the caller's first page, which an index on
+(owner, name) gives a real database at a cost independent of the table size.
+
+Usage:
+    python -m benchmarks.bucket_listing [requests] [totals...]
+"""
+import sys
+import json
+import logging
+import time
+import uuid
+import asyncio
+
+import httpx
+
+from src.database.async_database import AsyncDatabaseEngine
+from src.schema.requests.storage import Bucket
+
+OWNER = uuid.uuid4()
+OWNED = 20
+
+# The listing query before owner filtering
+UNFILTERED_QUERY = """
+    query GetBuckets {
+      storage_bucket {
+        owner
+        name
+        id
+      }
+    }
+"""
+
+
+def make_transport(total: int) -> httpx.MockTransport:
+    owners = [OWNER] + [uuid.uuid4() for _ in range(total // OWNED)]
+    table = [
+        {"id": str(uuid.uuid4()), "name": f"bucket-{i:08d}", "owner": str(owners[i % len(owners)])}
+        for i in range(total)
+    ]
+    whole = json.dumps({"data": {"storage_bucket": table}}).encode()
+    owned = sorted((row for row in table if row["owner"] == str(OWNER)), key=lambda row: row["name"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if "variables" not in body:
+            return httpx.Response(200, content=whole)
+        page = [{"id": row["id"], "name": row["name"]} for row in owned[:body["variables"]["limit"]]]
+        return httpx.Response(200, json={"data": {"storage_bucket": page}})
+
+    return httpx.MockTransport(handler)
+
+
+async def unfiltered(engine: AsyncDatabaseEngine):
+    result = await engine._execute(UNFILTERED_QUERY)
+    buckets = [Bucket(**bucket) for bucket in result["data"]["storage_bucket"]]
+    return [bucket for bucket in buckets if bucket.owner == OWNER]
+
+
+async def paginated(engine: AsyncDatabaseEngine):
+    return await engine.get_buckets(owner_id=OWNER, limit=101)
+
+
+async def measure(total: int, requests: int):
+    async with httpx.AsyncClient(transport=make_transport(total)) as client:
+        engine = AsyncDatabaseEngine(client=client, token="benchmark")
+        line = f"{total:>9} buckets"
+        for name, listing in (("unfiltered", unfiltered), ("paginated", paginated)):
+            start = time.perf_counter()
+            for _ in range(requests):
+                await listing(engine)
+            elapsed = time.perf_counter() - start
+            line += f"  {name} {elapsed / requests * 1e3:>9.2f} ms"
+        print(line)
+
+
+def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    totals = [int(arg) for arg in sys.argv[2:]] or [1_000, 10_000, 100_000]
+    for total in totals:
+        asyncio.run(measure(total, requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Cost of revalidating a cached download with and without conditional GET.
+
+Runs the application in process with the in-memory metadata engine and a
+local backend whose reads wait ``latency`` milliseconds, like S3 would.
+A client holding a copy of an object re-fetches it ``requests`` times:
+once with plain GETs, once sending back the ETag it was given, which is
+answered with a 304 from the metadata alone. The object is taken as older
+than PRESIGNED_UPLOAD_EXPIRATION, past which no presigned upload url can
+still rewrite it.
+
+Usage:
+    python -m benchmarks.conditional_get [requests] [object KiB] [latency ms]
+"""
+import os
+import sys
+import time
+import uuid
+import logging
+import tempfile
+
+from jose import jwt
+from fastapi.testclient import TestClient
+
+from config.settings import settings
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    size = int(sys.argv[2]) * 1024 if len(sys.argv) > 2 else 1024 * 1024
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.02
+    logging.disable(logging.INFO)
+
+    token = jwt.encode(
+        {"sub": str(uuid.uuid4()), "aud": "authenticated", "exp": int(time.time()) + 3600},
+        settings.GOTRUE_JWT_SECRET,
+        algorithm=settings.ALGORITHM
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with tempfile.TemporaryDirectory() as root:
+        settings.STORAGE_TYPE = "local"
+        settings.METADATA_ENGINE = "memory"
+        settings.LOCAL_STORAGE_ROOT = root
+        settings.LOCAL_STORAGE_FSYNC = "never"
+        settings.PRESIGNED_UPLOAD_EXPIRATION = 0
+        import main as application
+
+        with TestClient(application.app) as client:
+            storage = application.app.state.storage_registry.default()
+            get_object = storage.get_object
+
+            def slow_get_object(*args, **kwargs):
+                time.sleep(latency)
+                return get_object(*args, **kwargs)
+
+            storage.get_object = slow_get_object
+            client.post("/v1/buckets", json={"name": "bench"}, headers=headers)
+            client.put("/v1/buckets/bench/object.bin", content=os.urandom(size), headers=headers)
+            etag = client.get("/v1/buckets/bench/object.bin", headers=headers).headers["etag"]
+
+            print(f"{requests} revalidations of a {size // 1024} KiB object, {latency * 1e3:.0f} ms per backend read")
+            for name, extra in (("plain", {}), ("conditional", {"If-None-Match": etag})):
+                received = 0
+                start = time.perf_counter()
+                for _ in range(requests):
+                    response = client.get("/v1/buckets/bench/object.bin", headers={**headers, **extra})
+                    received += len(response.content)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{name:<12} {requests / elapsed:>8.0f} req/s {elapsed / requests * 1e3:>7.2f} ms/req  "
+                    f"status {response.status_code}  received {received / 2**20:>8.1f} MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
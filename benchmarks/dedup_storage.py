@@ -0,0 +1,103 @@
+"""
+Bytes stored and upload throughput with and without deduplication.
+
+Uploads the same workload to a plain local backend and to a deduplicating
+backend on top of another local backend. A ``duplicate ratio`` share of the
+uploads repeats content already uploaded to some other bucket (as when the
+same SDK bundle or checkpoint is pushed to many buckets); the rest is new.
+Object sizes are drawn between 256 KiB and 4 MiB.
+
+"sent" counts the bytes each backend had to write: with deduplication,
+repeated content is hashed and indexed but never sent to the backend.
+
+Usage:
+    python -m benchmarks.dedup_storage [uploads] [duplicate ratio] [buckets]
+"""
+import io
+import os
+import sys
+import time
+import random
+import logging
+import tempfile
+
+from src.application.types.storage import StorageAction
+from src.application.types.local import LocalStorageActions
+from src.application.types.dedup import DedupStorageActions
+
+
+class CountingStorage(LocalStorageActions):
+    """Local backend counting the bytes it receives"""
+
+    sent = 0
+
+    def upload_fileobj(self, file_obj, object_name, bucket_name, metadata=None) -> bool:
+        start = file_obj.tell()
+        stored = super().upload_fileobj(file_obj, object_name, bucket_name, metadata)
+        self.sent += file_obj.tell() - start
+        return stored
+
+
+def workload(uploads: int, ratio: float, buckets: int, seed: int = 1) -> list[tuple[str, str, bytes]]:
+    rng = random.Random(seed)
+    contents: list[bytes] = []
+    items = []
+    for i in range(uploads):
+        if contents and rng.random() < ratio:
+            content = rng.choice(contents)
+        else:
+            content = os.urandom(rng.randint(256 * 1024, 4 * 1024 * 1024))
+            contents.append(content)
+        items.append((f"bucket-{rng.randrange(buckets)}", f"object-{i:06d}", content))
+    return items
+
+
+def disk_usage(root: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for directory, _, names in os.walk(root)
+        for name in names
+        if not name.startswith("index.sqlite3")
+    )
+
+
+def run(name: str, storage: StorageAction, backend: CountingStorage, root: str, items: list):
+    for bucket_name in {item[0] for item in items}:
+        storage.create_bucket(bucket_name)
+
+    uploaded = sum(len(content) for _, _, content in items)
+    start = time.perf_counter()
+    for bucket_name, object_name, content in items:
+        if not storage.upload_fileobj(io.BytesIO(content), object_name, bucket_name):
+            raise RuntimeError(f"Upload of {object_name} failed")
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{name:<8} uploaded {uploaded / 2**20:>8.1f} MiB  sent {backend.sent / 2**20:>8.1f} MiB  "
+        f"on disk {disk_usage(root) / 2**20:>8.1f} MiB  {uploaded / 2**20 / elapsed:>7.1f} MiB/s"
+    )
+
+
+def main():
+    uploads = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    ratio = float(sys.argv[2]) if len(sys.argv) > 2 else 0.6
+    buckets = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    logging.disable(logging.INFO)
+
+    items = workload(uploads, ratio, buckets)
+    unique = len({content for _, _, content in items})
+    print(f"{uploads} uploads, {unique} distinct contents, {buckets} buckets")
+
+    with tempfile.TemporaryDirectory() as root:
+        plain = CountingStorage(os.path.join(root, "plain"), fsync="never")
+        run("plain", plain, plain, os.path.join(root, "plain"), items)
+        plain.close()
+
+        backend = CountingStorage(os.path.join(root, "blobs"), fsync="never")
+        dedup = DedupStorageActions(backend, os.path.join(root, "dedup"), grace_period=0)
+        run("dedup", dedup, backend, os.path.join(root, "blobs"), items)
+        dedup.close()
+
+
+if __name__ == "__main__":
+    main()
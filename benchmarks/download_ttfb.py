@@ -0,0 +1,71 @@
+"""
+Time-to-first-byte, throughput and server memory for object downloads.
+
+Runs against a live server, e.g. one started with ``make run`` and backed by
+MinIO holding a 1 GB object:
+
+    python -m benchmarks.download_ttfb --url http://localhost:8100/v1/buckets/bench/1g.bin \\
+        --token "$TOKEN" --pid "$(pgrep -f 'uvicorn main:app' | head -1)"
+
+``--pid`` is optional. When set, the server's peak and current RSS are read
+from /proc before and after each download.
+"""
+import argparse
+import time
+from typing import Optional
+
+import httpx
+
+
+def rss_kib(pid: Optional[int]) -> dict:
+    if pid is None:
+        return {}
+    values = {}
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith(("VmRSS:", "VmHWM:")):
+                key, value = line.split(":", 1)
+                values[key] = int(value.split()[0])
+    return values
+
+
+def download(client: httpx.Client, url: str, headers: dict) -> tuple[float, float, int, int]:
+    start = time.perf_counter()
+    ttfb = None
+    size = 0
+    with client.stream("GET", url, headers=headers) as response:
+        for chunk in response.iter_raw(1024 * 1024):
+            if ttfb is None:
+                ttfb = time.perf_counter() - start
+            size += len(chunk)
+        status = response.status_code
+    return ttfb or 0.0, time.perf_counter() - start, size, status
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--pid", type=int)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--range", dest="byte_range", help="optional Range header, e.g. bytes=0-1048575")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"}
+    if args.byte_range:
+        headers["Range"] = args.byte_range
+
+    with httpx.Client(timeout=None) as client:
+        for run in range(args.runs):
+            before = rss_kib(args.pid)
+            ttfb, total, size, status = download(client, args.url, headers)
+            after = rss_kib(args.pid)
+            print(
+                f"run {run}: status={status} ttfb={ttfb * 1000:.1f} ms total={total:.2f} s "
+                f"throughput={size / total / 2 ** 20:.1f} MiB/s "
+                f"rss={before.get('VmRSS', '-')}->{after.get('VmRSS', '-')} KiB peak={after.get('VmHWM', '-')} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
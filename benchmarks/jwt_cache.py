@@ -0,0 +1,57 @@
+"""
+Cost of verifying a bearer token with and without the verified-token cache.
+
+Tokens are verified from a thread pool, the way FastAPI runs the synchronous
+get_current_user dependency, so lock contention on the cache is included.
+
+Usage:
+    python -m benchmarks.jwt_cache [requests] [threads] [distinct tokens]
+"""
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from jose import jwt
+
+from config.settings import settings
+from src.api.deps import verify_token
+from src.core.cache import TTLCache
+
+
+def make_tokens(count: int) -> list[str]:
+    return [
+        jwt.encode(
+            {"sub": str(uuid.uuid4()), "aud": "authenticated", "exp": int(time.time()) + 3600},
+            settings.GOTRUE_JWT_SECRET,
+            algorithm=settings.ALGORITHM
+        )
+        for _ in range(count)
+    ]
+
+
+def run(tokens: list[str], requests: int, threads: int, cache) -> float:
+    def verify(i: int):
+        verify_token(tokens[i % len(tokens)], cache)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(verify, range(requests)))
+        return time.perf_counter() - start
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    distinct = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    tokens = make_tokens(distinct)
+
+    cache = TTLCache(max_size=settings.JWT_CACHE_SIZE, ttl=settings.JWT_CACHE_TTL)
+    for name, current in (("jwt.decode", None), ("cached", cache)):
+        elapsed = run(tokens, requests, threads, current)
+        print(f"{name:<12} {requests / elapsed:>12.0f} verifications/s {elapsed / requests * 1e6:>8.1f} us each")
+    print(f"cache stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
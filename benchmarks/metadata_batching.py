@@ -0,0 +1,89 @@
+"""
+Documents sent to Hasura and lookup throughput with and without batching.
+
+``requests`` concurrent get_file calls for distinct objects, spread over
+``users`` tokens, go to a mock Hasura that answers each document after
+``latency`` milliseconds and serves at most ``capacity`` documents at once.
+Batching can only merge queries made with the same token, so the gain
+shrinks as the same load is spread over more users.
+
+Usage:
+    python -m benchmarks.metadata_batching [requests] [latency ms] [capacity] [users...]
+"""
+import re
+import sys
+import json
+import time
+import uuid
+import asyncio
+import logging
+
+import httpx
+
+from config.settings import settings
+from src.database.async_database import AsyncDatabaseEngine
+from src.database.batching import GraphQLBatcher
+
+ALIAS = re.compile(r"(\w+): storage_bucket")
+ENDPOINT = f"{settings.GRAPHQL_HOST}/{settings.GRAPHQL_ENDPOINT}"
+
+
+def make_transport(latency: float, capacity: int) -> tuple[httpx.MockTransport, list]:
+    documents = []
+    slots = asyncio.Semaphore(capacity)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        async with slots:
+            await asyncio.sleep(latency)
+        documents.append(request)
+        body = json.loads(request.content)
+        keys = ALIAS.findall(body["query"]) or ["storage_bucket"]
+        variables = body.get("variables", {})
+        data = {}
+        for key in keys:
+            prefix = key[:-len("storage_bucket")]
+            obj = {
+                "id": str(uuid.uuid4()), "name": variables[f"{prefix}fileName"],
+                "bucket_id": str(uuid.uuid4()), "last_modified": "2024-01-01T00:00:00"
+            }
+            data[key] = [{"objects": [obj]}]
+        return httpx.Response(200, json={"data": data})
+
+    return httpx.MockTransport(handler), documents
+
+
+async def run(requests: int, latency: float, capacity: int, users: int):
+    line = f"{users:>5} users"
+    for name in ("direct", "batched"):
+        transport, documents = make_transport(latency, capacity)
+        async with httpx.AsyncClient(transport=transport) as client:
+            batcher = GraphQLBatcher(client, ENDPOINT, window=0.002, max_size=50) if name == "batched" else None
+            engines = [
+                AsyncDatabaseEngine(client=client, token=f"user-{user}", batcher=batcher)
+                for user in range(users)
+            ]
+            owner = uuid.uuid4()
+            start = time.perf_counter()
+            found = await asyncio.gather(*(
+                engines[i % users].get_file(bucket_name="bench", file_name=f"object-{i}", owner_id=owner)
+                for i in range(requests)
+            ))
+            elapsed = time.perf_counter() - start
+        assert all(file.name == f"object-{i}" for i, file in enumerate(found))
+        line += f"  {name} {len(documents):>5} documents {requests / elapsed:>7.0f} lookups/s"
+    print(line)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.005
+    capacity = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    users = [int(arg) for arg in sys.argv[4:]] or [1, 10, 100, 1000]
+    logging.disable(logging.WARNING)
+    print(f"{requests} concurrent get_file, {latency * 1e3:.0f} ms per document, {capacity} documents at once")
+    for count in users:
+        asyncio.run(run(requests, latency, capacity, count))
+
+
+if __name__ == "__main__":
+    main()
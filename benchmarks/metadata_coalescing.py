@@ -0,0 +1,85 @@
+"""
+GraphQL round trips and latency of bursts of identical metadata lookups.
+
+A mock Hasura answers after ``latency`` milliseconds and serves at most
+``capacity`` queries at once, like a connection-limited database would.
+Each burst sends ``concurrency`` simultaneous get_file and
+get_bucket_by_id_user calls for the same object, as a hot download link
+does; the bucket cache is left out so every bucket lookup reaches Hasura.
+
+Usage:
+    python -m benchmarks.metadata_coalescing [bursts] [concurrency] [latency ms] [capacity]
+"""
+import sys
+import time
+import uuid
+import asyncio
+import logging
+
+import httpx
+
+from src.core.singleflight import AsyncSingleFlight
+from src.database.async_database import AsyncDatabaseEngine
+
+OWNER = uuid.uuid4()
+BUCKET_ID = str(uuid.uuid4())
+
+
+def make_transport(latency: float, capacity: int) -> tuple[httpx.MockTransport, list]:
+    served = []
+    slots = asyncio.Semaphore(capacity)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        async with slots:
+            await asyncio.sleep(latency)
+        served.append(request)
+        bucket = {"id": BUCKET_ID, "name": "hot", "owner": str(OWNER), "public": False}
+        obj = {
+            "id": str(uuid.uuid4()), "name": "model.bin", "bucket_id": BUCKET_ID,
+            "last_modified": "2024-01-01T00:00:00"
+        }
+        return httpx.Response(200, json={"data": {"storage_bucket": [{**bucket, "objects": [obj]}]}})
+
+    return httpx.MockTransport(handler), served
+
+
+async def burst(engine: AsyncDatabaseEngine, concurrency: int):
+    await asyncio.gather(*(
+        call
+        for _ in range(concurrency)
+        for call in (
+            engine.get_bucket_by_id_user(bucket_name="hot", owner_id=OWNER),
+            engine.get_file(bucket_name="hot", file_name="model.bin", owner_id=OWNER),
+        )
+    ))
+
+
+async def run(bursts: int, concurrency: int, latency: float, capacity: int):
+    for name, flights in (("direct", None), ("coalesced", AsyncSingleFlight())):
+        transport, served = make_transport(latency, capacity)
+        async with httpx.AsyncClient(transport=transport) as client:
+            engine = AsyncDatabaseEngine(client=client, token="benchmark", flights=flights)
+            start = time.perf_counter()
+            for _ in range(bursts):
+                await burst(engine, concurrency)
+            elapsed = time.perf_counter() - start
+        line = f"{name:<10} {len(served) / bursts:>7.1f} queries/burst {elapsed / bursts * 1e3:>8.2f} ms/burst"
+        if flights is not None:
+            stats = flights.stats()
+            line += f"  issued {stats['issued']} coalesced {stats['coalesced']}"
+        print(line)
+
+
+def main():
+    bursts = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.005
+    capacity = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+    logging.disable(logging.INFO)
+    print(f"{bursts} bursts of {concurrency} x (get_bucket_by_id_user + get_file), "
+          f"{latency * 1e3:.0f} ms per query, {capacity} queries at once")
+    asyncio.run(run(bursts, concurrency, latency, capacity))
+
+
+if __name__ == "__main__":
+    main()
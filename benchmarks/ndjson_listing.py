@@ -0,0 +1,96 @@
+"""
+Throughput and memory of the NDJSON bucket listing against a synthetic bucket.
+
+Metadata pages come from a stub engine answering the paginated Hasura query
+locally, so the figures cover the listing pipeline (page walk, prefetch and
+encoding) without network time. The NDJSON stream is then compared with
+building one JSON array of FileObjects, the way a single-response listing does.
+
+Usage:
+    python -m benchmarks.ndjson_listing [objects] [compare objects]
+"""
+import sys
+import time
+import uuid
+import asyncio
+import tracemalloc
+
+import httpx
+
+from config.settings import settings
+from src.application.manager import StorageManager
+from src.database.async_database import AsyncDatabaseEngine
+from src.schema.response.storage import FilePage
+
+BUCKET_ID = str(uuid.uuid4())
+OWNER = uuid.uuid4()
+
+
+class SyntheticEngine(AsyncDatabaseEngine):
+    """Answers the page query for a bucket of ``size`` objects named obj-000000000..."""
+
+    def __init__(self, size: int):
+        super().__init__(client=httpx.AsyncClient(), token="benchmark")
+        self.size = size
+
+    async def _execute(self, query: str, variables: dict = None) -> dict:
+        start = 0
+        for condition in variables["where"]["_and"]:
+            if "_gt" in condition["name"]:
+                start = int(condition["name"]["_gt"][4:]) + 1
+        end = min(start + variables["limit"], self.size)
+        objects = [
+            {
+                "id": f"00000000-0000-4000-8000-{i:012d}",
+                "name": f"obj-{i:09d}",
+                "bucket_id": BUCKET_ID,
+                "last_modified": "2026-01-01T00:00:00+00:00"
+            }
+            for i in range(start, end)
+        ]
+        return {"data": {"storage_bucket": [{"objects": objects}]}}
+
+
+async def stream(size: int) -> tuple[int, int]:
+    manager = StorageManager(bucket_name="benchmark", storage=None, engine=SyntheticEngine(size), executor=None)
+    lines = sent = 0
+    async for chunk in manager.stream_files(current_user=OWNER):
+        lines += chunk.count(b"\n")
+        sent += len(chunk)
+    return lines, sent
+
+
+async def array(size: int) -> tuple[int, int]:
+    engine = SyntheticEngine(size)
+    files = await engine.get_files(bucket_name="benchmark", owner_id=OWNER, limit=size)
+    body = FilePage(items=files).model_dump_json().encode()
+    return len(files), len(body)
+
+
+def measure(name: str, size: int, listing, traced: bool):
+    start = time.perf_counter()
+    count, sent = asyncio.run(listing(size))
+    elapsed = time.perf_counter() - start
+    line = f"{name:<8} {count:>9} objects {count / elapsed:>10.0f} objects/s {sent / elapsed / 1e6:>7.1f} MB/s"
+
+    # Tracing slows everything down, so the peak is taken on a separate run
+    if traced:
+        tracemalloc.start()
+        asyncio.run(listing(size))
+        line += f" peak {tracemalloc.get_traced_memory()[1] / 1e6:>8.1f} MB"
+        tracemalloc.stop()
+    print(line)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    compare = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    print(f"page size {settings.FILES_STREAM_PAGE_SIZE}")
+
+    measure("ndjson", size, stream, traced=False)
+    for name, listing in (("ndjson", stream), ("array", array)):
+        measure(name, compare, listing, traced=True)
+
+
+if __name__ == "__main__":
+    main()
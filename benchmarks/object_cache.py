@@ -0,0 +1,102 @@
+"""
+Read throughput of hot objects with and without the disk cache.
+
+The backend is a local backend slowed down to look like S3 from a nearby
+region: every get_object waits ``latency`` milliseconds before the first
+byte. Reads follow a Zipf distribution over the objects, so a few objects
+take most of the traffic, and run on ``threads`` threads like the storage
+executor does. A second run sends ``threads`` concurrent reads of one cold
+object to show how many backend fetches they cause.
+
+Usage:
+    python -m benchmarks.object_cache [reads] [objects] [threads] [latency ms]
+"""
+import io
+import os
+import sys
+import time
+import random
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.application.types.storage import StorageAction
+from src.application.types.local import LocalStorageActions
+from src.application.types.cached import CachedStorageActions
+
+OBJECT_SIZE = 256 * 1024
+
+
+class RemoteLikeStorage(LocalStorageActions):
+    """Local backend adding a fixed latency to every read"""
+
+    def __init__(self, root: str, latency: float):
+        super().__init__(root, fsync="never")
+        self.latency = latency
+        self.gets = 0
+        self._lock = threading.Lock()
+
+    def get_object(self, *args, **kwargs):
+        with self._lock:
+            self.gets += 1
+        time.sleep(self.latency)
+        return super().get_object(*args, **kwargs)
+
+
+def read(storage: StorageAction, object_name: str) -> int:
+    return sum(len(chunk) for chunk in storage.get_object(object_name, "bench").iter_chunks(64 * 1024))
+
+
+def run(name: str, storage: StorageAction, backend: RemoteLikeStorage, keys: list[str], threads: int):
+    backend.gets = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        size = sum(pool.map(lambda key: read(storage, key), keys))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<8} {len(keys) / elapsed:>8.0f} reads/s {size / 2**20 / elapsed:>8.1f} MiB/s  "
+        f"backend gets {backend.gets}"
+    )
+
+
+def main():
+    reads = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    objects = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+    latency = float(sys.argv[4]) / 1000 if len(sys.argv) > 4 else 0.02
+    logging.disable(logging.INFO)
+
+    rng = random.Random(1)
+    weights = [1 / rank for rank in range(1, objects + 1)]
+    keys = [f"object-{i:06d}" for i in rng.choices(range(objects), weights=weights, k=reads)]
+
+    with tempfile.TemporaryDirectory() as root:
+        backend = RemoteLikeStorage(os.path.join(root, "backend"), latency)
+        backend.create_bucket("bench")
+        for i in range(objects):
+            backend.upload_fileobj(io.BytesIO(os.urandom(OBJECT_SIZE)), f"object-{i:06d}", "bench")
+
+        # A tenth of the objects fit in the cache
+        cached = CachedStorageActions(
+            backend,
+            os.path.join(root, "cache"),
+            max_bytes=objects * OBJECT_SIZE // 10,
+            max_object_size=OBJECT_SIZE,
+            revalidate_after=60
+        )
+        print(f"{reads} Zipf reads over {objects} objects of {OBJECT_SIZE // 1024} KiB, {threads} threads")
+        run("direct", backend, backend, keys, threads)
+        run("cached", cached, backend, keys, threads)
+        stats = cached.stats()
+        print(f"cache hit ratio {stats['hits'] / (stats['hits'] + stats['misses']):.1%}, evictions {stats['evictions']}")
+
+        print(f"{threads} concurrent reads of one cold object")
+        cold = ["object-cold"] * threads
+        backend.upload_fileobj(io.BytesIO(os.urandom(OBJECT_SIZE)), "object-cold", "bench")
+        run("direct", backend, backend, cold, threads)
+        run("cached", cached, backend, cold, threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Presigned download urls per second with and without the url cache.
+
+Signs urls for a Zipf-distributed set of objects on an S3 backend (SigV4,
+signed locally: no request leaves the process) and on a local backend
+(HMAC). Reported CPU time is what one url costs the worker process.
+
+Usage:
+    python -m benchmarks.presigned_urls [urls] [objects] [min remaining]
+"""
+import sys
+import time
+import random
+import logging
+import tempfile
+
+from src.application.types.storage import StorageAction
+from src.application.types.s3 import S3StorageActions
+from src.application.types.local import LocalStorageActions
+from src.core.cache import PresignedUrlCache
+
+
+def run(name: str, storage: StorageAction, keys: list[str]):
+    start = time.perf_counter()
+    cpu = time.process_time()
+    for key in keys:
+        storage.get_presigned_url("bench", key, 3600)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    line = f"{name:<12} {len(keys) / elapsed:>9.0f} urls/s {cpu / len(keys) * 1e6:>7.1f} us CPU/url"
+    if storage.url_cache is not None:
+        line += f"  signatures {storage.url_cache.stats()['signatures']}"
+    print(line)
+
+
+def main():
+    urls = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    objects = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    min_remaining = float(sys.argv[3]) if len(sys.argv) > 3 else 0.5
+    logging.disable(logging.INFO)
+
+    rng = random.Random(1)
+    weights = [1 / rank for rank in range(1, objects + 1)]
+    keys = [f"object-{i:06d}" for i in rng.choices(range(objects), weights=weights, k=urls)]
+    print(f"{urls} urls over {objects} objects, reused while {min_remaining:.0%} of their lifetime is left")
+
+    with tempfile.TemporaryDirectory() as root:
+        for cached in (False, True):
+            url_cache = PresignedUrlCache(max_size=objects, min_remaining=min_remaining) if cached else None
+            s3 = S3StorageActions(
+                endpoint_url="http://localhost:9000",
+                access_key="benchmark",
+                secret_key="benchmark",
+                url_cache=url_cache
+            )
+            run(f"s3 {'cached' if cached else 'direct'}", s3, keys)
+            s3.close()
+
+        for cached in (False, True):
+            url_cache = PresignedUrlCache(max_size=objects, min_remaining=min_remaining) if cached else None
+            local = LocalStorageActions(
+                root,
+                fsync="never",
+                base_url="http://localhost:8000/v1/local",
+                signing_key="benchmark",
+                url_cache=url_cache
+            )
+            run(f"local {'cached' if cached else 'direct'}", local, keys)
+            local.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Latency of reading a small object through the authenticated and public routes.
+
+Runs the application in process against a local backend and a mock Hasura
+answering each document after ``latency`` milliseconds. The authenticated
+route verifies the token and reads the bucket and object metadata; the
+public route only checks the in-process index of public buckets, then
+redirects to a presigned url or streams the object.
+
+Usage:
+    python -m benchmarks.public_reads [requests] [graphql latency ms]
+"""
+import sys
+import json
+import time
+import uuid
+import asyncio
+import logging
+import tempfile
+
+import httpx
+from jose import jwt
+from fastapi.testclient import TestClient
+
+from config.settings import settings
+
+OWNER = uuid.uuid4()
+BUCKET_ID = uuid.uuid4()
+
+
+def make_transport(latency: float) -> tuple[httpx.MockTransport, list]:
+    documents = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        documents.append(request)
+        query = json.loads(request.content)["query"]
+        bucket = {"id": str(BUCKET_ID), "name": "assets", "owner": str(OWNER), "public": True}
+        if "GetFile" in query:
+            obj = {"id": str(uuid.uuid4()), "name": "logo.svg", "bucket_id": str(BUCKET_ID),
+                   "last_modified": "2024-01-01T00:00:00+00:00"}
+            bucket["objects"] = [obj]
+        return httpx.Response(200, json={"data": {"storage_bucket": [bucket]}})
+
+    return httpx.MockTransport(handler), documents
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.005
+    # The refresh run at startup cannot reach a real Hasura
+    logging.disable(logging.ERROR)
+
+    token = jwt.encode(
+        {"sub": str(OWNER), "aud": "authenticated", "exp": int(time.time()) + 3600},
+        settings.GOTRUE_JWT_SECRET,
+        algorithm=settings.ALGORITHM
+    )
+
+    with tempfile.TemporaryDirectory() as root:
+        settings.STORAGE_TYPE = "local"
+        settings.LOCAL_STORAGE_ROOT = root
+        settings.LOCAL_STORAGE_FSYNC = "never"
+        settings.METADATA_ENGINE = "hasura"
+        settings.GRAPHQL_BATCH_WINDOW = 0
+        import main as application
+        from src.api.deps import create_service_engine
+
+        with TestClient(application.app) as client:
+            state = application.app.state
+            transport, documents = make_transport(latency)
+            state.graphql_client = httpx.AsyncClient(transport=transport)
+            client.portal.call(state.public_buckets.refresh, create_service_engine(state))
+
+            storage = state.storage_registry.default()
+            storage.create_bucket(str(BUCKET_ID))
+            storage.upload_fileobj(tempfile.SpooledTemporaryFile(), "logo.svg", str(BUCKET_ID))
+
+            print(f"{requests} reads, {latency * 1e3:.0f} ms per GraphQL document")
+            routes = (
+                ("authenticated", "/v1/buckets/assets/logo.svg", {"Authorization": f"Bearer {token}"}, "stream"),
+                ("public stream", f"/v1/public/{BUCKET_ID}/logo.svg", {}, "stream"),
+                ("public redirect", f"/v1/public/{BUCKET_ID}/logo.svg", {}, "redirect"),
+            )
+            for name, path, headers, mode in routes:
+                settings.PUBLIC_DOWNLOAD_MODE = mode
+                documents.clear()
+                start = time.perf_counter()
+                for _ in range(requests):
+                    response = client.get(path, headers=headers, follow_redirects=False)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{name:<16} {requests / elapsed:>7.0f} req/s {elapsed / requests * 1e3:>6.2f} ms/req  "
+                    f"status {response.status_code}  GraphQL documents {len(documents)}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Request rate and streaming throughput with each request logging middleware.
+
+Serves a small JSON route and a streaming download from an in-process app,
+through httpx's ASGI transport, with no middleware, the previous
+BaseHTTPMiddleware implementation (kept inline below), and the ASGI
+RequestLoggingMiddleware logging every request or a sample of them. Log
+records are built and handed to a handler that drops them, so formatting
+and I/O do not blur the comparison.
+
+Usage:
+    python -m benchmarks.request_logging [requests] [concurrency] [download MiB]
+"""
+import sys
+import time
+import uuid
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from src.core.middleware import RequestLoggingMiddleware, logger
+
+CHUNK = b"\0" * (256 * 1024)
+
+
+class BaseHTTPRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The request logging middleware as it was before the ASGI rewrite"""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        request_id = str(uuid.uuid4())
+        start_time = time.time()
+        logger.info(
+            "Request started",
+            extra={
+                "request_id": request_id,
+                "method": request.method,
+                "url": str(request.url),
+                "user_agent": request.headers.get("user-agent"),
+                "client_ip": request.client.host if request.client else None,
+            }
+        )
+        request.state.request_id = request_id
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        response.headers["X-Request-ID"] = request_id
+        logger.info(
+            "Request completed",
+            extra={"request_id": request_id, "status_code": response.status_code, "process_time": round(process_time, 4)}
+        )
+        return response
+
+
+def build_app(middleware: Optional[type], download_chunks: int, **options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/download")
+    async def download():
+        async def chunks():
+            for _ in range(download_chunks):
+                yield CHUNK
+        return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+    return app
+
+
+async def measure(app: FastAPI, requests: int, concurrency: int, downloads: int) -> tuple[float, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        slots = asyncio.Semaphore(concurrency)
+
+        async def ping():
+            async with slots:
+                (await client.get("/ping")).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(ping() for _ in range(requests)))
+        rate = requests / (time.perf_counter() - start)
+
+        received = 0
+        start = time.perf_counter()
+        for _ in range(downloads):
+            async with client.stream("GET", "/download") as response:
+                async for chunk in response.aiter_raw():
+                    received += len(chunk)
+        throughput = received / 2**20 / (time.perf_counter() - start)
+    return rate, throughput
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    download_mib = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+    downloads = 10
+
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers = [logging.NullHandler()]
+
+    download_chunks = download_mib * 2**20 // len(CHUNK)
+    variants = (
+        ("none", None, {}),
+        ("BaseHTTPMiddleware", BaseHTTPRequestLoggingMiddleware, {}),
+        ("ASGI", RequestLoggingMiddleware, {"sample_rate": 1.0}),
+        ("ASGI sampled 10%", RequestLoggingMiddleware, {"sample_rate": 0.1}),
+    )
+    print(f"{requests} small requests, {concurrency} at once; {downloads} downloads of {download_mib} MiB")
+    for name, middleware, options in variants:
+        app = build_app(middleware, download_chunks, **options)
+        rate, throughput = asyncio.run(measure(app, requests, concurrency, downloads))
+        print(f"{name:<20} {rate:>8.0f} req/s {throughput:>9.1f} MiB/s streaming")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Per-request cost of obtaining an S3 storage backend.
+
+Compares building a fresh ``S3StorageActions`` (and so a fresh boto3 client and
+urllib3 pool) for every request against fetching the shared backend from the
+``StorageRegistry``. No network traffic is involved.
+
+Usage:
+    python -m benchmarks.storage_client [iterations]
+"""
+import sys
+import time
+
+from src.application.registry import StorageRegistry
+from src.application.types.s3 import S3StorageActions
+
+ENDPOINT = "http://localhost:9000"
+
+
+def per_request(iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        S3StorageActions(endpoint_url=ENDPOINT, access_key="bench", secret_key="bench")
+    return time.perf_counter() - start
+
+
+def pooled(iterations: int) -> float:
+    registry = StorageRegistry()
+    registry.get("S3", endpoint_url=ENDPOINT, access_key="bench", secret_key="bench")
+    start = time.perf_counter()
+    for _ in range(iterations):
+        registry.get("S3", endpoint_url=ENDPOINT, access_key="bench", secret_key="bench")
+    elapsed = time.perf_counter() - start
+    registry.close()
+    return elapsed
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for name, bench in (("per-request client", per_request), ("registry lookup", pooled)):
+        elapsed = bench(iterations)
+        print(f"{name:<20} {elapsed / iterations * 1e6:>12.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
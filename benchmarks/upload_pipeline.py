@@ -0,0 +1,112 @@
+"""
+GraphQL round trips and latency of StorageManager.upload_file.
+
+The metadata engine talks to a mock Hasura answering each document after
+``graphql latency`` milliseconds; storage is a local backend whose writes
+take ``storage latency`` milliseconds, like a small S3 PUT. The previous
+pipeline (bucket lookup, create_file looking the bucket up again, upsert,
+then the write, then the url) is kept inline for comparison, with and
+without the bucket cache.
+
+Usage:
+    python -m benchmarks.upload_pipeline [uploads] [graphql latency ms] [storage latency ms]
+"""
+import io
+import sys
+import json
+import time
+import uuid
+import asyncio
+import logging
+import tempfile
+
+import httpx
+from fastapi import UploadFile
+
+from src.application.manager import StorageManager
+from src.application.types.local import LocalStorageActions
+from src.core.cache import TTLCache
+from src.core.executor import StorageExecutor
+from src.database.async_database import AsyncDatabaseEngine
+
+OWNER = uuid.uuid4()
+BUCKET_ID = uuid.uuid4()
+
+
+class SlowStorage(LocalStorageActions):
+    latency = 0.0
+
+    def upload_fileobj(self, *args, **kwargs) -> bool:
+        time.sleep(self.latency)
+        return super().upload_fileobj(*args, **kwargs)
+
+
+def make_transport(latency: float) -> tuple[httpx.MockTransport, list]:
+    documents = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        documents.append(request)
+        body = json.loads(request.content)
+        if "UpsertFile" in body["query"]:
+            row = {"id": str(uuid.uuid4()), "name": body["variables"]["name"], "last_modified": "now"}
+            return httpx.Response(200, json={"data": {"insert_storage_object_one": row}})
+        bucket = {"id": str(BUCKET_ID), "name": "bench", "owner": str(OWNER), "public": False}
+        return httpx.Response(200, json={"data": {"storage_bucket": [bucket]}})
+
+    return httpx.MockTransport(handler), documents
+
+
+async def legacy_upload(manager: StorageManager, file: UploadFile) -> str:
+    bucket = await manager.engine.get_bucket_by_id_user(bucket_name=manager.bucket_name, owner_id=OWNER)
+    await manager.engine.create_file(bucket_name=bucket.name, file_name=file.filename, owner_id=OWNER)
+    await manager.executor.run(
+        manager.storage.upload_fileobj, file_obj=file.file, bucket_name=str(bucket.id), object_name=file.filename
+    )
+    return await manager.executor.run(
+        manager.storage.get_presigned_url, object_name=file.filename, bucket_name=str(bucket.id)
+    )
+
+
+async def current_upload(manager: StorageManager, file: UploadFile) -> str:
+    return await manager.upload_file(file, OWNER)
+
+
+async def run(uploads: int, graphql_latency: float, storage: SlowStorage, executor: StorageExecutor):
+    for cached in (False, True):
+        line = f"bucket cache {'on ' if cached else 'off'}"
+        for name, upload in (("previous", legacy_upload), ("current", current_upload)):
+            transport, documents = make_transport(graphql_latency)
+            async with httpx.AsyncClient(transport=transport) as client:
+                engine = AsyncDatabaseEngine(
+                    client=client,
+                    token="benchmark",
+                    bucket_cache=TTLCache(max_size=100, ttl=60) if cached else None
+                )
+                manager = StorageManager("bench", storage=storage, engine=engine, executor=executor)
+                start = time.perf_counter()
+                for i in range(uploads):
+                    await upload(manager, UploadFile(io.BytesIO(b"x" * 1024), filename=f"object-{i}"))
+                elapsed = time.perf_counter() - start
+            line += f"  {name} {len(documents) / uploads:.1f} queries {elapsed / uploads * 1e3:>6.2f} ms"
+        print(line)
+
+
+def main():
+    uploads = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    graphql_latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.005
+    storage_latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.02
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as root:
+        storage = SlowStorage(root, fsync="never")
+        storage.latency = storage_latency
+        storage.create_bucket(str(BUCKET_ID))
+        executor = StorageExecutor(max_workers=4, max_queue=16)
+        print(f"{uploads} uploads, {graphql_latency * 1e3:.0f} ms per query, {storage_latency * 1e3:.0f} ms per write")
+        asyncio.run(run(uploads, graphql_latency, storage, executor))
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from pydantic import field_validator
-from typing import List, Optional
+from typing import List
 from pydantic_settings import BaseSettings
 
 
@@ -17,12 +17,92 @@ class Settings(BaseSettings):
     GOTRUE_JWT_SECRET: str = 'superlongjwtsecret'
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ALGORITHM: str = "HS256"
+    JWT_CACHE_SIZE: int = 10000
+    JWT_CACHE_TTL: float = 300.0
 
     # S3 CONFIG
     STORAGE_TYPE: str = "S3"
     S3_ACCESS_KEY: str = ''
     S3_ENDPOINT_URL: str = ''
     S3_SECRET_KEY: str = ''
+    S3_REGION: str = "us-east-1"
+    S3_MAX_POOL_CONNECTIONS: int = 50
+    S3_TCP_KEEPALIVE: bool = True
+    S3_MAX_RETRIES: int = 3
+    S3_RETRY_MODE: str = "standard"
+    S3_CONNECT_TIMEOUT: float = 5.0
+    S3_READ_TIMEOUT: float = 60.0
+    S3_MULTIPART_PART_SIZE: int = 8 * 1024 * 1024
+    S3_MULTIPART_CONCURRENCY: int = 4
+
+    # Local storage (STORAGE_TYPE other than "S3")
+    LOCAL_STORAGE_ROOT: str = "/tmp/ogna-storage"
+    LOCAL_STORAGE_FSYNC: str = "file"
+    LOCAL_STORAGE_BASE_URL: str = "http://localhost:8000/v1/local"
+    LOCAL_STORAGE_SIGNING_KEY: str = 'superlongsigningkey'
+
+    # Deduplication: store every unique content once, on top of STORAGE_TYPE.
+    # The index lives under DEDUP_ROOT on one host; objects stored before it was enabled are not visible
+    STORAGE_DEDUP: bool = False
+    DEDUP_ROOT: str = "/tmp/ogna-dedup"
+    DEDUP_BLOB_BUCKET: str = "ogna-blobs"
+    DEDUP_GRACE_PERIOD: float = 3600
+    # Seconds between collections of blobs orphaned for longer than DEDUP_GRACE_PERIOD
+    DEDUP_GC_INTERVAL: int = 5 * 60
+
+    # Read-through disk cache of hot objects, in front of the backend
+    STORAGE_CACHE: bool = False
+    STORAGE_CACHE_ROOT: str = "/tmp/ogna-cache"
+    # Per worker process: each one caches into its own subdirectory of STORAGE_CACHE_ROOT
+    STORAGE_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    STORAGE_CACHE_MAX_OBJECT_SIZE: int = 64 * 1024 * 1024
+    STORAGE_CACHE_REVALIDATE_AFTER: float = 30
+    # Threads copying missed objects to the cache; readers stream each copy as it is written
+    STORAGE_CACHE_FILL_WORKERS: int = 4
+
+    # Storage executor
+    STORAGE_EXECUTOR_WORKERS: int = 16
+    STORAGE_EXECUTOR_MAX_QUEUE: int = 64
+
+    # Resumable uploads
+    UPLOAD_SESSION_DIR: str = "/tmp/ogna-uploads"
+    UPLOAD_SESSION_TTL: int = 24 * 60 * 60
+    UPLOAD_SESSION_GC_INTERVAL: int = 10 * 60
+
+    # Presigned uploads
+    PRESIGNED_UPLOAD_EXPIRATION: int = 60 * 60
+    PRESIGNED_MULTIPART_THRESHOLD: int = 64 * 1024 * 1024
+
+    # Presigned download urls, reused while more than PRESIGNED_URL_MIN_REMAINING of their lifetime is left
+    PRESIGNED_URL_CACHE_SIZE: int = 10000
+    PRESIGNED_URL_MIN_REMAINING: float = 0.5
+
+    # Listings
+    BUCKETS_PAGE_SIZE: int = 100
+    BUCKETS_PAGE_MAX_SIZE: int = 1000
+    FILES_PAGE_SIZE: int = 100
+    FILES_PAGE_MAX_SIZE: int = 1000
+    FILES_STREAM_PAGE_SIZE: int = 5000
+
+    # Anonymous reads of public buckets
+    PUBLIC_BUCKETS_REFRESH_INTERVAL: float = 30
+    # Seconds without a successful refresh after which public reads are refused
+    PUBLIC_BUCKETS_MAX_AGE: float = 300
+    # "redirect" to a presigned URL, or "stream" the object through the API
+    PUBLIC_DOWNLOAD_MODE: str = "redirect"
+    PUBLIC_URL_EXPIRATION: int = 24 * 60 * 60
+
+    # Batch operations
+    BATCH_MAX_KEYS: int = 10000
+
+    # Downloads
+    DOWNLOAD_CHUNK_SIZE: int = 256 * 1024
+    # "stream" the object through the API, or "redirect" to a presigned url
+    DOWNLOAD_MODE: str = "stream"
+    DOWNLOAD_URL_EXPIRATION: int = 60 * 60
+    # Cache-Control of downloads from public and private buckets; both revalidate by ETag
+    PUBLIC_CACHE_CONTROL: str = "public, max-age=60"
+    PRIVATE_CACHE_CONTROL: str = "private, no-cache"
 
     # Database
     DATABASE_URL: str = ''
@@ -30,6 +110,13 @@ class Settings(BaseSettings):
     DATABASE_USERNAME: str = ''
     DATABASE_PASSWORD: str = ''
     DATABASE_NAME: str = ''
+    DATABASE_POOL_MIN_SIZE: int = 2
+    DATABASE_POOL_MAX_SIZE: int = 20
+    DATABASE_STATEMENT_CACHE_SIZE: int = 1024
+    DATABASE_COMMAND_TIMEOUT: float = 10.0
+
+    # Metadata engine: "hasura", "postgres" or "memory"
+    METADATA_ENGINE: str = "hasura"
 
     # CORS
     ALLOWED_HOSTS: List[str] = [
@@ -43,7 +130,21 @@ class Settings(BaseSettings):
     GRAPHQL_HOST: str = 'http://hasura:8080'
     GRAPHQL_ENDPOINT: str = '/v1/graphql'
     GRAPHQL_SECRET: str = '/v1/graphql'
+    GRAPHQL_HTTP2: bool = True
+    GRAPHQL_MAX_CONNECTIONS: int = 100
+    GRAPHQL_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    GRAPHQL_KEEPALIVE_EXPIRY: float = 30.0
+    GRAPHQL_CONNECT_TIMEOUT: float = 5.0
+    GRAPHQL_READ_TIMEOUT: float = 10.0
+    GRAPHQL_POOL_TIMEOUT: float = 5.0
+    # Seconds concurrent queries of one token wait to be sent as one document, 0 disables batching
+    GRAPHQL_BATCH_WINDOW: float = 0.002
+    GRAPHQL_BATCH_MAX_SIZE: int = 50
 
+    # Metadata caches
+    BUCKET_CACHE_SIZE: int = 10000
+    BUCKET_CACHE_TTL: float = 60.0
+    BUCKET_CACHE_NEGATIVE_TTL: float = 5.0
 
     @field_validator("ALLOWED_HOSTS", mode="before")
     @classmethod
@@ -54,9 +155,14 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
 
+    # Metrics route, served without authentication: only enable it where it is not publicly reachable
+    METRICS_ENABLED: bool = False
+
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    # Share of requests logged by the request logging middleware; server errors are always logged
+    REQUEST_LOG_SAMPLE_RATE: float = 1.0
 
     model_config = {
         "env_file": ".env",
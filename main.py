@@ -1,23 +1,85 @@
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 
 from config.settings import settings
 from src.core.logging import setup_logging
 from src.core.middleware import setup_middleware
 from src.errors.handlers import setup_exception_handlers
 from src.api.router import api_router
+from src.application.registry import StorageRegistry
+from src.database.async_database import create_graphql_client
+from src.database.postgres import create_database_pool
+from src.database.batching import GraphQLBatcher
+from src.database.memory import MemoryMetadataStore
+from src.core.executor import StorageExecutor
+from src.core.cache import TTLCache
+from src.core.singleflight import AsyncSingleFlight
+from src.application.resumable import UploadSessionStore, run_session_gc
+from src.application.types.dedup import run_blob_gc
+from src.application.public import PublicBucketIndex, run_public_bucket_refresh
+from src.api.deps import create_service_engine
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     setup_logging()
+    app.state.storage_registry = StorageRegistry()
+    app.state.storage_registry.default()
+    app.state.graphql_client = create_graphql_client()
+    app.state.graphql_batcher = GraphQLBatcher(
+        client=app.state.graphql_client,
+        endpoint=f"{settings.GRAPHQL_HOST}/{settings.GRAPHQL_ENDPOINT}",
+        window=settings.GRAPHQL_BATCH_WINDOW,
+        max_size=settings.GRAPHQL_BATCH_MAX_SIZE
+    ) if settings.GRAPHQL_BATCH_WINDOW > 0 else None
+    app.state.database_pool = None
+    app.state.metadata_store = None
+    if settings.METADATA_ENGINE == "postgres":
+        app.state.database_pool = await create_database_pool()
+    elif settings.METADATA_ENGINE == "memory":
+        app.state.metadata_store = MemoryMetadataStore()
+    app.state.jwt_cache = TTLCache(
+        max_size=settings.JWT_CACHE_SIZE,
+        ttl=settings.JWT_CACHE_TTL
+    )
+    app.state.bucket_cache = TTLCache(
+        max_size=settings.BUCKET_CACHE_SIZE,
+        ttl=settings.BUCKET_CACHE_TTL,
+        negative_ttl=settings.BUCKET_CACHE_NEGATIVE_TTL
+    )
+    app.state.metadata_flights = AsyncSingleFlight()
+    app.state.storage_executor = StorageExecutor(
+        max_workers=settings.STORAGE_EXECUTOR_WORKERS,
+        max_queue=settings.STORAGE_EXECUTOR_MAX_QUEUE
+    )
+    app.state.upload_store = UploadSessionStore(settings.UPLOAD_SESSION_DIR)
+    session_gc = asyncio.create_task(run_session_gc(
+        app.state.upload_store,
+        app.state.storage_registry.default(),
+        app.state.storage_executor
+    ))
+    blob_gc = asyncio.create_task(run_blob_gc(
+        app.state.storage_registry.deduplicated,
+        app.state.storage_executor
+    ))
+    app.state.public_buckets = PublicBucketIndex(max_age=settings.PUBLIC_BUCKETS_MAX_AGE)
+    public_refresh = asyncio.create_task(run_public_bucket_refresh(
+        app.state.public_buckets,
+        create_service_engine(app.state)
+    ))
     yield
     # Shutdown
-    # Add any cleanup code here if needed
-    pass
+    session_gc.cancel()
+    blob_gc.cancel()
+    public_refresh.cancel()
+    await app.state.graphql_client.aclose()
+    if app.state.database_pool is not None:
+        await app.state.database_pool.close()
+    app.state.storage_executor.shutdown()
+    app.state.storage_registry.close()
 
 
 def create_application() -> FastAPI:
@@ -62,4 +124,4 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.ENVIRONMENT == "development"
-    )
\ No newline at end of file
+    )
@@ -1,11 +1,22 @@
+import time
 import uuid
+import hashlib
 from typing import Optional
 from fastapi import Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 
 from config.settings import settings
-from src.core.exceptions import UnauthorizedError
+from src.core.exceptions import UnauthorizedError, NotFoundError
+from src.core.cache import TTLCache, MISSING
+from src.application.types.storage import StorageAction
+from src.database.async_database import AsyncDatabaseEngine
+from src.database.postgres import PostgresEngine
+from src.database.memory import InMemoryEngine
+from src.database.engine import MetadataEngine
+from src.core.executor import StorageExecutor
+from src.application.resumable import UploadSessionStore
+from src.application.public import PublicBucketIndex
 import logging
 
 # Security scheme
@@ -13,26 +24,122 @@ security = HTTPBearer()
 logger = logging.getLogger(__name__)
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> uuid.UUID:
-    """Get current authenticated user"""
+def verify_token(token: str, cache: Optional[TTLCache] = None) -> uuid.UUID:
+    """
+    Verify a JWT and return its subject.
+
+    Verified tokens are remembered by digest in cache until the earlier of
+    their expiry and the cache TTL, so repeated tokens skip signature checks.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    if cache is not None:
+        cached = cache.get(digest)
+        if cached is not MISSING:
+            user_id, expires_at = cached
+            if expires_at is None or expires_at > time.time():
+                return user_id
+
     try:
-        logger.error(credentials.credentials)
         payload = jwt.decode(
-            credentials.credentials,
+            token,
             settings.GOTRUE_JWT_SECRET,
             algorithms=[settings.ALGORITHM],
             audience="authenticated"
         )
-        logger.info(payload)
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        subject: str = payload.get("sub")
+        if subject is None:
             raise UnauthorizedError("Could not validate credentials")
-    except JWTError:
+        user_id = uuid.UUID(subject)
+    except (JWTError, ValueError):
         raise UnauthorizedError("Could not validate credentials")
 
-    return uuid.UUID(user_id)
+    if cache is not None:
+        expires_at = payload.get("exp")
+        ttl = cache.ttl if expires_at is None else min(cache.ttl, expires_at - time.time())
+        cache.set(digest, (user_id, expires_at), ttl=ttl)
+
+    return user_id
+
+
+def get_current_user(
+        request: Request,
+        credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> uuid.UUID:
+    """Get current authenticated user"""
+    return verify_token(credentials.credentials, request.app.state.jwt_cache)
+
+
+def require_metrics_enabled():
+    """Hide the metrics route unless METRICS_ENABLED is set"""
+    if not settings.METRICS_ENABLED:
+        raise NotFoundError("Not found")
 
 
 def get_request_id(request: Request) -> Optional[str]:
     """Get request ID from request state"""
     return getattr(request.state, "request_id", None)
+
+
+def get_storage(request: Request) -> StorageAction:
+    """Get the shared storage backend built at application startup"""
+    return request.app.state.storage_registry.default()
+
+
+def get_database_engine(
+        request: Request,
+        credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> MetadataEngine:
+    """
+    Get the metadata engine selected by METADATA_ENGINE.
+
+    The Hasura engine is bound to the caller's token on the shared GraphQL
+    client; the Postgres and in-memory engines filter on the owner themselves.
+    """
+    if settings.METADATA_ENGINE == "memory":
+        return InMemoryEngine(store=request.app.state.metadata_store)
+
+    if settings.METADATA_ENGINE == "postgres":
+        return PostgresEngine(
+            pool=request.app.state.database_pool,
+            bucket_cache=request.app.state.bucket_cache,
+            flights=request.app.state.metadata_flights
+        )
+
+    return AsyncDatabaseEngine(
+        client=request.app.state.graphql_client,
+        token=credentials.credentials,
+        bucket_cache=request.app.state.bucket_cache,
+        flights=request.app.state.metadata_flights,
+        batcher=request.app.state.graphql_batcher
+    )
+
+
+def create_service_engine(state) -> MetadataEngine:
+    """
+    Build a metadata engine for background tasks, allowed to read every owner's rows.
+
+    Args:
+        state: Application state holding the shared clients
+    """
+    if settings.METADATA_ENGINE == "memory":
+        return InMemoryEngine(store=state.metadata_store)
+
+    if settings.METADATA_ENGINE == "postgres":
+        return PostgresEngine(pool=state.database_pool)
+
+    return AsyncDatabaseEngine(client=state.graphql_client, token=None, admin_secret=settings.GRAPHQL_SECRET)
+
+
+def get_executor(request: Request) -> StorageExecutor:
+    """Get the bounded executor that runs blocking storage calls"""
+    return request.app.state.storage_executor
+
+
+def get_upload_store(request: Request) -> UploadSessionStore:
+    """Get the store holding resumable upload sessions"""
+    return request.app.state.upload_store
+
+
+def get_public_buckets(request: Request) -> PublicBucketIndex:
+    """Get the index of public bucket ids refreshed in the background"""
+    return request.app.state.public_buckets
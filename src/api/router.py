@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from config.settings import settings
-from src.api.v1.endpoints import buckets
+from src.api.v1.endpoints import buckets, local, metrics, public, uploads
 
 api_router = APIRouter()
 
@@ -9,3 +9,27 @@ api_router.include_router(
     prefix=f"{settings.API_V1_STR}/buckets",
     tags=["buckets"]
 )
+
+api_router.include_router(
+    uploads.router,
+    prefix=f"{settings.API_V1_STR}/uploads",
+    tags=["uploads"]
+)
+
+api_router.include_router(
+    public.router,
+    prefix=f"{settings.API_V1_STR}/public",
+    tags=["public"]
+)
+
+api_router.include_router(
+    metrics.router,
+    prefix=f"{settings.API_V1_STR}/metrics",
+    tags=["metrics"]
+)
+
+api_router.include_router(
+    local.router,
+    prefix=f"{settings.API_V1_STR}/local",
+    tags=["local"]
+)
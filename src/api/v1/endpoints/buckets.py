@@ -1,46 +1,60 @@
 import logging
 import uuid
-from typing import Annotated
-from fastapi import File, APIRouter, UploadFile, status, Depends, Path, Body
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Annotated, Optional
+from fastapi import File, APIRouter, UploadFile, status, Depends, Path, Body, Header, Request, Query
+from starlette.background import BackgroundTask
 
 from src.schema.response.storage import NewBucket
-from src.schema.requests.storage import Bucket
+from src.schema.requests.storage import Bucket, BatchRequest
 
 from src.application.manager import StorageManager
-from src.schema.response.storage import FileAccepted, MainResponse
-from fastapi.responses import FileResponse
+from src.schema.response.storage import FileAccepted, MainResponse, BatchResult, BatchFiles, FilePage, BucketPage
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 
-from src.api.deps import get_current_user
+from config.settings import settings
+from src.core.http import content_disposition, format_http_date, is_not_modified
+from src.core.responses import StorageObjectResponse
+
+from src.api.deps import get_current_user, get_storage, get_database_engine, get_executor
+from src.application.types.storage import StorageAction
+from src.database.engine import MetadataEngine
+from src.core.executor import StorageExecutor
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-security = HTTPBearer()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
 
 @router.post("", response_model=NewBucket, status_code=status.HTTP_201_CREATED)
 async def create_bucket(
         bucket_data: Annotated[Bucket, Body()],
         user_id: uuid.UUID = Depends(get_current_user),
-        credentials: HTTPAuthorizationCredentials = Depends(security)
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor)
 ):
-    manager = StorageManager(bucket_name=bucket_data.name, user_token=credentials.credentials)
+    manager = StorageManager(bucket_name=bucket_data.name, storage=storage, engine=engine, executor=executor)
 
-    return manager.create_bucket(
+    return await manager.create_bucket(
         bucket_data=bucket_data,
         current_user=user_id
     )
 
 
-@router.get("", status_code=status.HTTP_200_OK)
+@router.get("", response_model=BucketPage, status_code=status.HTTP_200_OK)
 async def list_buckets(
+        limit: Annotated[int, Query(ge=1, le=settings.BUCKETS_PAGE_MAX_SIZE)] = settings.BUCKETS_PAGE_SIZE,
+        cursor: Annotated[Optional[str], Query()] = None,
         user_id: uuid.UUID = Depends(get_current_user),
-        credentials: HTTPAuthorizationCredentials = Depends(security)
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor)
 ):
-    manager = StorageManager(bucket_name='', user_token=credentials.credentials)
-    return manager.get_buckets(current_user=user_id)
+    manager = StorageManager(bucket_name='', storage=storage, engine=engine, executor=executor)
+    return await manager.get_buckets(current_user=user_id, limit=limit, cursor=cursor)
 
 
 @router.post("/{bucket_name}", response_model=FileAccepted, status_code=status.HTTP_201_CREATED)
@@ -48,30 +62,104 @@ async def upload_file(
         file: Annotated[UploadFile, File()],
         bucket_name: Annotated[str, Path()],
         user_id: uuid.UUID = Depends(get_current_user),
-        credentials: HTTPAuthorizationCredentials = Depends(security)
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor)
 ):
-    manager = StorageManager(bucket_name=bucket_name, user_token=credentials.credentials)
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
 
-    url = manager.upload_file(
+    url = await manager.upload_file(
         file=file,
         current_user=user_id
     )
     logging.info(f"Object {file.filename} finalized")
 
     return FileAccepted(
-        success=True,
+        accepted=True,
         url=url
     )
 
 
-@router.get("/{bucket_name}", status_code=status.HTTP_200_OK)
+@router.get("/{bucket_name}", response_model=FilePage, status_code=status.HTTP_200_OK)
 async def list_files(
         bucket_name: Annotated[str, Path()],
+        limit: Annotated[int, Query(ge=1, le=settings.FILES_PAGE_MAX_SIZE)] = settings.FILES_PAGE_SIZE,
+        cursor: Annotated[Optional[str], Query()] = None,
+        prefix: Annotated[Optional[str], Query()] = None,
+        accept: Annotated[Optional[str], Header()] = None,
+        user_id: uuid.UUID = Depends(get_current_user),
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor)
+):
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+
+    # Walk the whole bucket as NDJSON instead of returning a single page
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(
+            manager.stream_files(current_user=user_id, cursor=cursor, prefix=prefix),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+
+    return await manager.get_files(
+        current_user=user_id,
+        limit=limit,
+        cursor=cursor,
+        prefix=prefix
+    )
+
+
+@router.post("/{bucket_name}/batch/delete", response_model=BatchResult, status_code=status.HTTP_200_OK)
+async def delete_files(
+        bucket_name: str,
+        batch: Annotated[BatchRequest, Body()],
+        user_id: uuid.UUID = Depends(get_current_user),
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor)
+):
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+    results = await manager.delete_files(file_names=batch.keys, current_user=user_id)
+    return BatchResult(results=results)
+
+
+@router.post("/{bucket_name}/batch/get", response_model=BatchFiles, status_code=status.HTTP_200_OK)
+async def get_files_by_name(
+        bucket_name: str,
+        batch: Annotated[BatchRequest, Body()],
+        user_id: uuid.UUID = Depends(get_current_user),
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor)
+):
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+    return await manager.get_files_by_name(file_names=batch.keys, current_user=user_id)
+
+
+@router.put("/{bucket_name}/{file_name}", response_model=FileAccepted, status_code=status.HTTP_201_CREATED)
+async def upload_file_stream(
+        request: Request,
+        bucket_name: str,
+        file_name: str,
         user_id: uuid.UUID = Depends(get_current_user),
-        credentials: HTTPAuthorizationCredentials = Depends(security)
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor)
 ):
-    manager = StorageManager(bucket_name=bucket_name, user_token=credentials.credentials)
-    return manager.get_files(current_user=user_id)
+    """Store the raw request body as the object, streaming it into a multipart upload"""
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+
+    url = await manager.upload_stream(
+        file_name=file_name,
+        stream=request.stream(),
+        current_user=user_id
+    )
+    logging.info(f"Object {file_name} finalized")
+
+    return FileAccepted(
+        accepted=True,
+        url=url
+    )
 
 
 @router.delete("/{bucket_name}/{file_name}", status_code=status.HTTP_201_CREATED, response_model=MainResponse)
@@ -79,9 +167,12 @@ async def delete_file(
         bucket_name: str,
         file_name: str,
         user_id: uuid.UUID = Depends(get_current_user),
-        credentials: HTTPAuthorizationCredentials = Depends(security)
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor)
 ):
-    deletion = StorageManager(bucket_name=bucket_name, user_token=credentials.credentials).delete_file(
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+    deletion = await manager.delete_file(
         file_name=file_name,
         current_user=user_id
     )
@@ -92,15 +183,72 @@ async def delete_file(
 async def get_file(
         bucket_name: str,
         file_name: str,
+        range: Annotated[Optional[str], Header()] = None,
+        if_range: Annotated[Optional[str], Header()] = None,
+        if_none_match: Annotated[Optional[str], Header()] = None,
+        if_modified_since: Annotated[Optional[str], Header()] = None,
         user_id: uuid.UUID = Depends(get_current_user),
-        credentials: HTTPAuthorizationCredentials = Depends(security)
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor)
 ):
-    file_path = StorageManager(bucket_name=bucket_name, user_token=credentials.credentials).get_file(
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+    store_file, bucket = await manager.stat_file(file_name=file_name, current_user=user_id)
+    etag, last_modified = manager.file_validators(store_file)
+
+    headers = {
+        "Cache-Control": settings.PUBLIC_CACHE_CONTROL if bucket and bucket.public else settings.PRIVATE_CACHE_CONTROL
+    }
+    if etag:
+        headers["ETag"] = etag
+    if last_modified:
+        headers["Last-Modified"] = format_http_date(last_modified)
+
+    # Answered from the metadata alone: the storage backend is never asked
+    if is_not_modified(if_none_match, if_modified_since, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if settings.DOWNLOAD_MODE == "redirect":
+        url = await manager.get_download_url(store_file)
+        if url:
+            return RedirectResponse(
+                url,
+                status_code=status.HTTP_302_FOUND,
+                headers={"Cache-Control": headers["Cache-Control"]}
+            )
+
+    stored = await manager.get_file(
         file_name=file_name,
-        current_user=user_id
+        current_user=user_id,
+        byte_range=range,
+        if_range=if_range,
+        store_file=store_file
     )
 
-    return FileResponse(
-        path=file_path,
-        filename=file_name
+    # No metadata validators: the backend's own are checked instead
+    if not etag:
+        if stored.etag:
+            headers["ETag"] = stored.etag
+        if stored.last_modified:
+            headers["Last-Modified"] = format_http_date(stored.last_modified)
+        if is_not_modified(if_none_match, if_modified_since, stored.etag, stored.last_modified):
+            stored.close()
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    headers.update({
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(stored.content_length),
+        "Content-Disposition": content_disposition(file_name),
+    })
+    if stored.content_range:
+        headers["Content-Range"] = stored.content_range
+
+    return StorageObjectResponse(
+        stored,
+        executor,
+        chunk_size=settings.DOWNLOAD_CHUNK_SIZE,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if stored.content_range else status.HTTP_200_OK,
+        media_type=stored.content_type or "application/octet-stream",
+        headers=headers,
+        background=BackgroundTask(stored.close)
     )
@@ -0,0 +1,106 @@
+import logging
+from typing import Annotated, Optional
+from fastapi import APIRouter, status, Depends, Header, Query, Request, Response
+
+from config.settings import settings
+from src.application.types.storage import StorageAction
+from src.application.types.local import LocalStorageActions
+from src.application.types.cached import CachedStorageActions
+from src.application.types.dedup import DedupStorageActions
+from src.application.upload import MultipartUploader
+from src.core.exceptions import ForbiddenError, NotFoundError
+from src.core.executor import StorageExecutor
+from src.core.http import parse_byte_range
+from src.core.responses import StorageObjectResponse
+
+from src.api.deps import get_storage, get_executor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def get_local_storage(storage: StorageAction = Depends(get_storage)) -> LocalStorageActions:
+    """Get the local backend; these routes do not exist when objects live in S3"""
+    while isinstance(storage, (CachedStorageActions, DedupStorageActions)):
+        # Presigned urls of wrapped backends point at the local backend underneath
+        storage = storage.backend
+    if not isinstance(storage, LocalStorageActions):
+        raise NotFoundError("Not found")
+    return storage
+
+
+@router.get("/{bucket_id}/{object_name:path}", status_code=status.HTTP_200_OK)
+async def get_object(
+        bucket_id: str,
+        object_name: str,
+        expires: Annotated[int, Query()],
+        signature: Annotated[str, Query()],
+        range: Annotated[Optional[str], Header()] = None,
+        storage: LocalStorageActions = Depends(get_local_storage),
+        executor: StorageExecutor = Depends(get_executor)
+):
+    if not storage.verify_signature("GET", bucket_id, object_name, expires, signature):
+        raise ForbiddenError("Invalid or expired signature")
+
+    stored = await executor.run(
+        storage.get_object,
+        object_name=object_name,
+        bucket_name=bucket_id,
+        byte_range=parse_byte_range(range)
+    )
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(stored.content_length),
+        "ETag": stored.etag
+    }
+    if stored.content_range:
+        headers["Content-Range"] = stored.content_range
+
+    return StorageObjectResponse(
+        stored,
+        executor,
+        chunk_size=settings.DOWNLOAD_CHUNK_SIZE,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if stored.content_range else status.HTTP_200_OK,
+        media_type=stored.content_type,
+        headers=headers
+    )
+
+
+@router.put("/{bucket_id}/{object_name:path}", status_code=status.HTTP_200_OK)
+async def put_object(
+        bucket_id: str,
+        object_name: str,
+        request: Request,
+        expires: Annotated[int, Query()],
+        signature: Annotated[str, Query()],
+        upload_id: Annotated[Optional[str], Query(alias="uploadId")] = None,
+        part_number: Annotated[Optional[int], Query(alias="partNumber", ge=1)] = None,
+        storage: LocalStorageActions = Depends(get_local_storage),
+        executor: StorageExecutor = Depends(get_executor)
+):
+    if not storage.verify_signature("PUT", bucket_id, object_name, expires, signature, upload_id, part_number):
+        raise ForbiddenError("Invalid or expired signature")
+
+    # Presigned part URL: the body is one part of a multipart upload
+    if upload_id is not None and part_number is not None:
+        etag = await executor.run(
+            storage.upload_part,
+            object_name=object_name,
+            bucket_name=bucket_id,
+            upload_id=upload_id,
+            part_number=part_number,
+            data=await request.body()
+        )
+        return Response(status_code=status.HTTP_200_OK, headers={"ETag": etag})
+
+    uploader = MultipartUploader(
+        storage=storage,
+        executor=executor,
+        bucket_name=bucket_id,
+        object_name=object_name
+    )
+    await uploader.upload(request.stream())
+    return Response(status_code=status.HTTP_200_OK)
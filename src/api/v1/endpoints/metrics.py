@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Request, status
+
+from src.application.types.cached import CachedStorageActions
+from src.application.types.dedup import DedupStorageActions
+from src.application.types.local import LocalStorageActions
+from src.application.types.s3 import S3StorageActions
+
+from src.api.deps import require_metrics_enabled
+
+router = APIRouter(dependencies=[Depends(require_metrics_enabled)])
+
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def get_metrics(request: Request):
+    metrics = {
+        "storage_executor": request.app.state.storage_executor.stats(),
+        "bucket_cache": request.app.state.bucket_cache.stats(),
+        "jwt_cache": request.app.state.jwt_cache.stats(),
+        "metadata_flights": request.app.state.metadata_flights.stats(),
+        "public_buckets": request.app.state.public_buckets.stats(),
+    }
+    if request.app.state.graphql_batcher is not None:
+        metrics["graphql_batcher"] = request.app.state.graphql_batcher.stats()
+    storage = request.app.state.storage_registry.default()
+    if isinstance(storage, CachedStorageActions):
+        metrics["object_cache"] = storage.stats()
+    while isinstance(storage, (CachedStorageActions, DedupStorageActions)):
+        storage = storage.backend
+    if isinstance(storage, (S3StorageActions, LocalStorageActions)) and storage.url_cache is not None:
+        metrics["presigned_urls"] = storage.url_cache.stats()
+    return metrics
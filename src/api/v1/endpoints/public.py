@@ -0,0 +1,82 @@
+import uuid
+import logging
+from typing import Annotated, Optional
+from fastapi import APIRouter, status, Depends, Header, Response
+from fastapi.responses import RedirectResponse
+from starlette.background import BackgroundTask
+
+from config.settings import settings
+from src.application.public import PublicBucketIndex
+from src.application.types.storage import StorageAction
+from src.core.exceptions import NotFoundError
+from src.core.executor import StorageExecutor
+from src.core.http import parse_byte_range, content_disposition, format_http_date, is_not_modified
+from src.core.responses import StorageObjectResponse
+
+from src.api.deps import get_storage, get_executor, get_public_buckets
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/{bucket_id}/{file_name}", status_code=status.HTTP_200_OK)
+async def get_public_file(
+        bucket_id: uuid.UUID,
+        file_name: str,
+        range: Annotated[Optional[str], Header()] = None,
+        if_none_match: Annotated[Optional[str], Header()] = None,
+        if_modified_since: Annotated[Optional[str], Header()] = None,
+        public_buckets: PublicBucketIndex = Depends(get_public_buckets),
+        storage: StorageAction = Depends(get_storage),
+        executor: StorageExecutor = Depends(get_executor)
+):
+    """Serve an object of a public bucket with no token check and no metadata lookup"""
+    if not public_buckets.is_public(bucket_id):
+        raise NotFoundError(f"Bucket {bucket_id} not found")
+
+    headers = {"Cache-Control": settings.PUBLIC_CACHE_CONTROL}
+
+    if settings.PUBLIC_DOWNLOAD_MODE == "redirect":
+        url = await executor.run(
+            storage.get_presigned_url,
+            bucket_name=str(bucket_id),
+            object_name=file_name,
+            expiration=settings.PUBLIC_URL_EXPIRATION
+        )
+        if url:
+            return RedirectResponse(url, status_code=status.HTTP_302_FOUND, headers=headers)
+
+    stored = await executor.run(
+        storage.get_object,
+        object_name=file_name,
+        bucket_name=str(bucket_id),
+        byte_range=parse_byte_range(range)
+    )
+
+    if stored.etag:
+        headers["ETag"] = stored.etag
+    if stored.last_modified:
+        headers["Last-Modified"] = format_http_date(stored.last_modified)
+    if is_not_modified(if_none_match, if_modified_since, stored.etag, stored.last_modified):
+        stored.close()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    headers.update({
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(stored.content_length),
+        "Content-Disposition": content_disposition(file_name),
+    })
+    if stored.content_range:
+        headers["Content-Range"] = stored.content_range
+
+    return StorageObjectResponse(
+        stored,
+        executor,
+        chunk_size=settings.DOWNLOAD_CHUNK_SIZE,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if stored.content_range else status.HTTP_200_OK,
+        media_type=stored.content_type or "application/octet-stream",
+        headers=headers,
+        background=BackgroundTask(stored.close)
+    )
@@ -0,0 +1,183 @@
+import logging
+import uuid
+from typing import Annotated
+from fastapi import APIRouter, status, Depends, Body, Header, Request, Response
+
+from src.schema.requests.storage import NewUploadSession, PresignedUploadRequest, PresignedUploadComplete
+from src.schema.response.storage import FileAccepted, MainResponse, UploadSessionStatus, PresignedUpload
+
+from src.application.manager import StorageManager
+from src.application.resumable import UploadSession, UploadSessionStore
+from src.application.types.storage import StorageAction
+from src.database.engine import MetadataEngine
+from src.core.executor import StorageExecutor
+
+from src.api.deps import get_current_user, get_storage, get_database_engine, get_executor, get_upload_store
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def _status(session: UploadSession) -> UploadSessionStatus:
+    return UploadSessionStatus(
+        id=session.id,
+        offset=session.offset,
+        length=session.length,
+        expires_at=session.expires_at
+    )
+
+
+@router.post("/{bucket_name}/presigned", response_model=PresignedUpload, status_code=status.HTTP_201_CREATED)
+async def presign_upload(
+        bucket_name: str,
+        upload: Annotated[PresignedUploadRequest, Body()],
+        user_id: uuid.UUID = Depends(get_current_user),
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor)
+):
+    """Issue presigned urls so the client sends the bytes straight to storage"""
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+    return await manager.presign_upload(
+        file_name=upload.file_name,
+        size=upload.size,
+        current_user=user_id
+    )
+
+
+@router.post("/{bucket_name}/presigned/complete", response_model=FileAccepted, status_code=status.HTTP_201_CREATED)
+async def complete_presigned_upload(
+        bucket_name: str,
+        upload: Annotated[PresignedUploadComplete, Body()],
+        user_id: uuid.UUID = Depends(get_current_user),
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor)
+):
+    """Register an object uploaded through presigned urls"""
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+    url = await manager.complete_presigned_upload(
+        file_name=upload.file_name,
+        upload_id=upload.upload_id,
+        parts=upload.parts,
+        current_user=user_id
+    )
+    logging.info(f"Object {upload.file_name} finalized")
+
+    return FileAccepted(
+        accepted=True,
+        url=url
+    )
+
+
+@router.post("/{bucket_name}/resumable", response_model=UploadSessionStatus, status_code=status.HTTP_201_CREATED)
+async def create_upload_session(
+        request: Request,
+        response: Response,
+        bucket_name: str,
+        upload: Annotated[NewUploadSession, Body()],
+        user_id: uuid.UUID = Depends(get_current_user),
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor),
+        store: UploadSessionStore = Depends(get_upload_store)
+):
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+    session = await manager.create_upload_session(
+        file_name=upload.file_name,
+        length=upload.length,
+        current_user=user_id,
+        store=store
+    )
+
+    response.headers["Location"] = f"{request.url.path}/{session.id}"
+    return _status(session)
+
+
+@router.head("/{bucket_name}/resumable/{upload_id}", status_code=status.HTTP_200_OK)
+async def get_upload_offset(
+        bucket_name: str,
+        upload_id: uuid.UUID,
+        user_id: uuid.UUID = Depends(get_current_user),
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor),
+        store: UploadSessionStore = Depends(get_upload_store)
+):
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+    session = await manager.get_upload_session(session_id=upload_id, current_user=user_id, store=store)
+
+    return Response(
+        status_code=status.HTTP_200_OK,
+        headers={
+            "Upload-Offset": str(session.offset),
+            "Upload-Length": str(session.length),
+            "Cache-Control": "no-store",
+        }
+    )
+
+
+@router.patch("/{bucket_name}/resumable/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def append_upload_chunk(
+        request: Request,
+        bucket_name: str,
+        upload_id: uuid.UUID,
+        upload_offset: Annotated[int, Header()],
+        user_id: uuid.UUID = Depends(get_current_user),
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor),
+        store: UploadSessionStore = Depends(get_upload_store)
+):
+    """Append the raw request body at Upload-Offset"""
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+    session = await manager.append_upload_chunk(
+        session_id=upload_id,
+        offset=upload_offset,
+        stream=request.stream(),
+        current_user=user_id,
+        store=store
+    )
+
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT,
+        headers={"Upload-Offset": str(session.offset)}
+    )
+
+
+@router.post("/{bucket_name}/resumable/{upload_id}/complete", response_model=FileAccepted,
+             status_code=status.HTTP_201_CREATED)
+async def complete_upload_session(
+        bucket_name: str,
+        upload_id: uuid.UUID,
+        user_id: uuid.UUID = Depends(get_current_user),
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor),
+        store: UploadSessionStore = Depends(get_upload_store)
+):
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+    url = await manager.complete_upload_session(session_id=upload_id, current_user=user_id, store=store)
+    logging.info(f"Resumable upload {upload_id} finalized")
+
+    return FileAccepted(
+        accepted=True,
+        url=url
+    )
+
+
+@router.delete("/{bucket_name}/resumable/{upload_id}", response_model=MainResponse)
+async def cancel_upload_session(
+        bucket_name: str,
+        upload_id: uuid.UUID,
+        user_id: uuid.UUID = Depends(get_current_user),
+        storage: StorageAction = Depends(get_storage),
+        engine: MetadataEngine = Depends(get_database_engine),
+        executor: StorageExecutor = Depends(get_executor),
+        store: UploadSessionStore = Depends(get_upload_store)
+):
+    manager = StorageManager(bucket_name=bucket_name, storage=storage, engine=engine, executor=executor)
+    cancelled = await manager.cancel_upload_session(session_id=upload_id, current_user=user_id, store=store)
+    return MainResponse(accepted=cancelled)
@@ -1,76 +1,422 @@
+import io
+import json
+import math
+import asyncio
+import time
 import uuid
 import logging
+from datetime import datetime, timezone
+from typing import Optional, AsyncIterator
 from fastapi import UploadFile
 
 from config.settings import settings
-from src.application.types.storage import StorageAction
-from src.application.types.s3 import S3StorageActions
-from src.application.types.local import LocalStorageActions
+from src.application.types.storage import StorageAction, StorageObject
+from src.application.upload import MultipartUploader
+from src.application.resumable import UploadSession, UploadSessionStore
 
 from src.schema.response.storage import NewBucket
-from src.schema.requests.storage import Bucket
-from src.database.database import DatabaseEngine
-from src.core.exceptions import BucketNotFound
+from src.schema.requests.storage import Bucket, StoredBucket
+from src.database.engine import MetadataEngine
+from src.core.exceptions import (
+    BucketNotFound, PreconditionFailedError, NotFoundError, ConflictError, ValidationError, InternalServerError
+)
+from src.core.executor import StorageExecutor
+from src.core.http import parse_byte_range, parse_if_range
+from src.core.pagination import encode_cursor, decode_cursor
 
-from src.schema.requests.storage import FileObject
+from src.schema.requests.storage import FileObject, UploadedPart
+from src.schema.response.storage import (
+    PresignedUpload, PresignedPart, BatchItemResult, BatchFiles, FilePage, BucketPage
+)
 
 logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
+MAX_MULTIPART_PARTS = 10000
+MAX_DELETE_OBJECTS = 1000
+
 
 class StorageManager:
 
-    def __init__(self, bucket_name, user_token):
+    def __init__(
+            self,
+            bucket_name,
+            storage: StorageAction,
+            engine: MetadataEngine,
+            executor: StorageExecutor
+    ):
         self.bucket_name = bucket_name
-        self.storage: StorageAction = S3StorageActions(
-            endpoint_url=settings.S3_ENDPOINT_URL,
-            access_key=settings.S3_ACCESS_KEY,
-            secret_key=settings.S3_SECRET_KEY
-        ) if settings.STORAGE_TYPE == "S3" else LocalStorageActions()
-        self.engine = DatabaseEngine(token=user_token)
-
-    def create_bucket(self, bucket_data: Bucket, current_user: uuid.UUID) -> NewBucket:
+        self.storage = storage
+        self.engine = engine
+        self.executor = executor
+
+    async def create_bucket(self, bucket_data: Bucket, current_user: uuid.UUID) -> NewBucket:
         logger.info(f"Creating bucket {bucket_data.name}")
-        bucket = self.engine.create_bucket(
+        bucket = await self.engine.create_bucket(
             bucket_data=bucket_data,
             user_id=current_user
         )
-        complete = self.storage.create_bucket(bucket_name=str(bucket.id))
+        if bucket is None:
+            raise InternalServerError(f"Bucket {bucket_data.name} could not be created")
+        complete = await self.executor.run(self.storage.create_bucket, bucket_name=str(bucket.id))
         return NewBucket(accepted=complete)
 
-    def upload_file(self, file: UploadFile, current_user: uuid.UUID) -> str:
+    async def upload_file(self, file: UploadFile, current_user: uuid.UUID) -> str:
         logger.info(f"Uploading bucket {file.filename}")
 
-        bucket = self.engine.get_bucket_by_id_user(
+        bucket = await self.engine.get_bucket_by_id_user(
             bucket_name=self.bucket_name,
             owner_id=current_user
         )
 
         if bucket is None:
             raise BucketNotFound(self.bucket_name)
+        if not file.filename:
+            raise ValidationError("The uploaded file has no name")
 
-        self.engine.create_file(
-            bucket_name=bucket.name,
-            file_name=file.filename,
+        # Bytes first: a failed transfer must not leave a record behind
+        stored = await self.executor.run(
+            self.storage.upload_fileobj,
+            file_obj=file.file,
+            bucket_name=str(bucket.id),
+            object_name=file.filename
+        )
+        if not stored:
+            raise InternalServerError(f"Upload of {file.filename} could not be stored")
+
+        return await self._commit_upload(bucket.id, bucket.name, file.filename, current_user)
+
+    async def upload_stream(self, file_name: str, stream: AsyncIterator[bytes], current_user: uuid.UUID) -> str:
+        logger.info(f"Streaming upload of {file_name}")
+
+        bucket = await self.engine.get_bucket_by_id_user(
+            bucket_name=self.bucket_name,
             owner_id=current_user
         )
 
-        object_name = file.filename
+        if bucket is None:
+            raise BucketNotFound(self.bucket_name)
 
-        self.storage.upload_fileobj(
-            file_obj=file.file,
+        uploader = MultipartUploader(
+            storage=self.storage,
+            executor=self.executor,
             bucket_name=str(bucket.id),
-            object_name=object_name
+            object_name=file_name
         )
+        size = await uploader.upload(stream)
+        logger.info(f"Stored {size} bytes for {file_name}")
+
+        return await self._commit_upload(bucket.id, bucket.name, file_name, current_user)
+
+    async def _commit_upload(
+            self,
+            bucket_id: uuid.UUID,
+            bucket_name: str,
+            file_name: str,
+            current_user: uuid.UUID
+    ) -> str:
+        """
+        Record an object whose bytes are stored and return its url.
+
+        The record is written while the url is signed. If it cannot be written,
+        bytes that no record points to are deleted again.
+        """
+        try:
+            _, url = await asyncio.gather(
+                self.engine.upsert_file(bucket_id=bucket_id, file_name=file_name),
+                self.executor.run(
+                    self.storage.get_presigned_url,
+                    object_name=file_name,
+                    bucket_name=str(bucket_id)
+                )
+            )
+        except Exception:
+            await self._discard_unrecorded(bucket_id, bucket_name, file_name, current_user)
+            raise
+        return url
+
+    async def _discard_unrecorded(
+            self,
+            bucket_id: uuid.UUID,
+            bucket_name: str,
+            file_name: str,
+            current_user: uuid.UUID
+    ):
+        # An overwritten object keeps its previous record: its bytes must stay
+        try:
+            if await self.engine.get_file(bucket_name=bucket_name, file_name=file_name, owner_id=current_user):
+                return
+            await self.executor.run(self.storage.delete_file, object_name=file_name, bucket_name=str(bucket_id))
+            logger.warning(f"Deleted {file_name} from storage after its record failed")
+        except Exception as e:
+            logger.error(f"Could not delete unrecorded object {file_name}: {e}")
+
+    async def presign_upload(self, file_name: str, size: int, current_user: uuid.UUID) -> PresignedUpload:
+        logger.info(f"Presigning upload of {file_name}")
+
+        if not self.storage.supports_presigned_uploads:
+            raise ValidationError("Presigned uploads are not available with this storage backend")
+
+        bucket = await self.engine.get_bucket_by_id_user(
+            bucket_name=self.bucket_name,
+            owner_id=current_user
+        )
+
+        if bucket is None:
+            raise BucketNotFound(self.bucket_name)
+
+        expiration = settings.PRESIGNED_UPLOAD_EXPIRATION
+        if size <= settings.PRESIGNED_MULTIPART_THRESHOLD:
+            # The url can replace an existing object with no metadata write: move its
+            # last_modified so file_validators stops trusting it while the url lives
+            if await self.engine.get_file(bucket_name=bucket.name, file_name=file_name, owner_id=current_user):
+                await self.engine.upsert_file(bucket_id=bucket.id, file_name=file_name)
+            url = await self.executor.run(
+                self.storage.get_presigned_upload_url,
+                bucket_name=str(bucket.id),
+                object_name=file_name,
+                expiration=expiration
+            )
+            return PresignedUpload(file_name=file_name, url=url, expires_in=expiration)
+
+        # S3 caps multipart uploads at 10000 parts: grow parts for huge objects
+        part_size = max(settings.S3_MULTIPART_PART_SIZE, math.ceil(size / MAX_MULTIPART_PARTS))
+        part_count = math.ceil(size / part_size)
 
-        return self.storage.get_presigned_url(
-            object_name=object_name,
+        upload_id = await self.executor.run(
+            self.storage.create_multipart_upload,
+            object_name=file_name,
             bucket_name=str(bucket.id)
         )
 
-    def delete_file(self, file_name: str, current_user: uuid.UUID) -> bool:
+        def presign_parts() -> list[PresignedPart]:
+            parts = []
+            for part_number in range(1, part_count + 1):
+                url = self.storage.get_presigned_part_url(
+                    bucket_name=str(bucket.id),
+                    object_name=file_name,
+                    upload_id=upload_id,
+                    part_number=part_number,
+                    expiration=expiration
+                )
+                if url is None:
+                    raise InternalServerError(f"Could not presign part {part_number} of {file_name}")
+                parts.append(PresignedPart(part_number=part_number, url=url))
+            return parts
+
+        return PresignedUpload(
+            file_name=file_name,
+            upload_id=upload_id,
+            part_size=part_size,
+            parts=await self.executor.run(presign_parts),
+            expires_in=expiration
+        )
+
+    async def complete_presigned_upload(
+            self,
+            file_name: str,
+            upload_id: Optional[str],
+            parts: list[UploadedPart],
+            current_user: uuid.UUID
+    ) -> str:
+        logger.info(f"Completing presigned upload of {file_name}")
+
+        bucket = await self.engine.get_bucket_by_id_user(
+            bucket_name=self.bucket_name,
+            owner_id=current_user
+        )
+
+        if bucket is None:
+            raise BucketNotFound(self.bucket_name)
+
+        if upload_id:
+            stored = await self.executor.run(
+                self.storage.complete_multipart_upload,
+                object_name=file_name,
+                bucket_name=str(bucket.id),
+                upload_id=upload_id,
+                parts=[
+                    {'PartNumber': part.part_number, 'ETag': part.etag}
+                    for part in sorted(parts, key=lambda part: part.part_number)
+                ]
+            )
+            if not stored:
+                raise ConflictError(f"Multipart upload of {file_name} could not be completed")
+        else:
+            stored = await self.executor.run(
+                self.storage.object_exists,
+                bucket_name=str(bucket.id),
+                object_name=file_name
+            )
+            if not stored:
+                raise FileNotFoundError(2, "No such file or directory", file_name)
+            # The client sent the object straight to storage
+            self.storage.invalidate(bucket_name=str(bucket.id), object_name=file_name)
+
+        return await self._commit_upload(bucket.id, bucket.name, file_name, current_user)
+
+    async def create_upload_session(
+            self,
+            file_name: str,
+            length: int,
+            current_user: uuid.UUID,
+            store: UploadSessionStore
+    ) -> UploadSession:
+        logger.info(f"Opening resumable upload of {file_name}")
+
+        bucket = await self.engine.get_bucket_by_id_user(
+            bucket_name=self.bucket_name,
+            owner_id=current_user
+        )
+
+        if bucket is None:
+            raise BucketNotFound(self.bucket_name)
+
+        session = UploadSession(
+            bucket_id=bucket.id,
+            bucket_name=bucket.name,
+            owner=current_user,
+            file_name=file_name,
+            length=length,
+            expires_at=time.time() + settings.UPLOAD_SESSION_TTL
+        )
+        await self.executor.run(store.save, session)
+        return session
+
+    async def get_upload_session(
+            self,
+            session_id: uuid.UUID,
+            current_user: uuid.UUID,
+            store: UploadSessionStore
+    ) -> UploadSession:
+        session = await self.executor.run(store.get, session_id)
+
+        if session is None or session.owner != current_user or session.bucket_name != self.bucket_name:
+            raise NotFoundError(f"Upload {session_id} not found")
+        # Expired sessions are gone even before collect_expired_sessions aborts their upload
+        if session.expires_at <= time.time():
+            raise NotFoundError(f"Upload {session_id} not found")
+
+        return session
+
+    async def append_upload_chunk(
+            self,
+            session_id: uuid.UUID,
+            offset: int,
+            stream: AsyncIterator[bytes],
+            current_user: uuid.UUID,
+            store: UploadSessionStore
+    ) -> UploadSession:
+        await self.get_upload_session(session_id, current_user, store)
+
+        with store.lock(session_id):
+            # Re-read under the lock: another request may have moved the offset, or the session expired
+            session = await self.get_upload_session(session_id, current_user, store)
+            if offset != session.offset:
+                raise ConflictError(f"Upload offset is {session.offset}, got {offset}")
+
+            part_size = settings.S3_MULTIPART_PART_SIZE
+            buffer = bytearray(await self.executor.run(store.read_tail, session_id))
+            try:
+                async for chunk in stream:
+                    if session.offset + len(chunk) > session.length:
+                        raise ValidationError("Chunk exceeds the declared upload length")
+                    buffer += chunk
+                    session.offset += len(chunk)
+                    while len(buffer) >= part_size:
+                        await self._store_session_part(session, bytes(buffer[:part_size]))
+                        del buffer[:part_size]
+            finally:
+                # Keep whatever arrived, even if the client dropped mid-chunk
+                session.expires_at = time.time() + settings.UPLOAD_SESSION_TTL
+                await self.executor.run(store.write_tail, session_id, bytes(buffer))
+                await self.executor.run(store.save, session)
+
+        return session
+
+    async def complete_upload_session(
+            self,
+            session_id: uuid.UUID,
+            current_user: uuid.UUID,
+            store: UploadSessionStore
+    ) -> str:
+        await self.get_upload_session(session_id, current_user, store)
+
+        with store.lock(session_id):
+            # Checked again under the lock, which collect_expired_sessions takes before aborting
+            session = await self.get_upload_session(session_id, current_user, store)
+            if session.offset != session.length:
+                raise ConflictError(f"Upload is incomplete: {session.offset} of {session.length} bytes received")
+
+            tail = await self.executor.run(store.read_tail, session_id)
+            if session.upload_id is None:
+                stored = await self.executor.run(
+                    self.storage.upload_fileobj,
+                    file_obj=io.BytesIO(tail),
+                    object_name=session.file_name,
+                    bucket_name=str(session.bucket_id)
+                )
+            else:
+                if tail:
+                    await self._store_session_part(session, tail)
+                stored = await self.executor.run(
+                    self.storage.complete_multipart_upload,
+                    object_name=session.file_name,
+                    bucket_name=str(session.bucket_id),
+                    upload_id=session.upload_id,
+                    parts=session.parts
+                )
+            if not stored:
+                raise InternalServerError(f"Upload of {session.file_name} could not be stored")
+
+            url = await self._commit_upload(session.bucket_id, session.bucket_name, session.file_name, current_user)
+            await self.executor.run(store.delete, session_id)
+
+        return url
+
+    async def cancel_upload_session(
+            self,
+            session_id: uuid.UUID,
+            current_user: uuid.UUID,
+            store: UploadSessionStore
+    ) -> bool:
+        await self.get_upload_session(session_id, current_user, store)
+
+        with store.lock(session_id):
+            session = await self.get_upload_session(session_id, current_user, store)
+            if session.upload_id is not None:
+                await self.executor.run(
+                    self.storage.abort_multipart_upload,
+                    object_name=session.file_name,
+                    bucket_name=str(session.bucket_id),
+                    upload_id=session.upload_id
+                )
+            await self.executor.run(store.delete, session_id)
+
+        return True
+
+    async def _store_session_part(self, session: UploadSession, data: bytes):
+        if session.upload_id is None:
+            session.upload_id = await self.executor.run(
+                self.storage.create_multipart_upload,
+                object_name=session.file_name,
+                bucket_name=str(session.bucket_id)
+            )
+
+        part_number = len(session.parts) + 1
+        etag = await self.executor.run(
+            self.storage.upload_part,
+            object_name=session.file_name,
+            bucket_name=str(session.bucket_id),
+            upload_id=session.upload_id,
+            part_number=part_number,
+            data=data
+        )
+        session.parts.append({'PartNumber': part_number, 'ETag': etag})
+
+    async def delete_file(self, file_name: str, current_user: uuid.UUID) -> bool:
         logger.info(f"Deleting bucket {file_name}")
-        search_file = self.engine.get_file(
+        search_file = await self.engine.get_file(
             bucket_name=self.bucket_name,
             file_name=file_name,
             owner_id=current_user
@@ -79,47 +425,243 @@ class StorageManager:
         if search_file is None:
             raise FileNotFoundError(2, "No such file or directory", file_name)
 
-        self.engine.delete_file(
+        await self.engine.delete_file(
             bucket_name=self.bucket_name,
             owner_id=current_user,
             file_name=file_name
         )
 
-        return self.storage.delete_file(object_name=file_name, bucket_name=str(search_file.bucket_id))
+        return await self.executor.run(
+            self.storage.delete_file,
+            object_name=file_name,
+            bucket_name=str(search_file.bucket_id)
+        )
 
-    def get_file(self, file_name: str, current_user: uuid.UUID):
-        logger.info(f"Getting bucket {file_name}")
+    async def delete_files(self, file_names: list[str], current_user: uuid.UUID) -> list[BatchItemResult]:
+        file_names = self._batch_keys(file_names)
+        logger.info(f"Deleting {len(file_names)} files from {self.bucket_name}")
 
-        store_file = self.engine.get_file(
+        deleted = await self.engine.delete_files(
             bucket_name=self.bucket_name,
-            file_name=file_name,
+            file_names=file_names,
+            owner_id=current_user
+        )
+
+        errors: dict[str, Optional[str]] = {name: "File not found" for name in file_names}
+        if deleted:
+            bucket_id = str(deleted[0].bucket_id)
+            names = [file.name for file in deleted]
+            chunks = await asyncio.gather(*[
+                self.executor.run(
+                    self.storage.delete_files,
+                    object_names=names[start:start + MAX_DELETE_OBJECTS],
+                    bucket_name=bucket_id
+                )
+                for start in range(0, len(names), MAX_DELETE_OBJECTS)
+            ])
+            for chunk in chunks:
+                errors.update(chunk)
+
+        return [
+            BatchItemResult(key=name, success=errors[name] is None, error=errors[name])
+            for name in file_names
+        ]
+
+    async def get_files_by_name(self, file_names: list[str], current_user: uuid.UUID) -> BatchFiles:
+        file_names = self._batch_keys(file_names)
+
+        files = await self.engine.get_files_by_name(
+            bucket_name=self.bucket_name,
+            file_names=file_names,
             owner_id=current_user
         )
 
+        found = {file.name for file in files}
+        return BatchFiles(
+            files=files,
+            missing=[name for name in file_names if name not in found]
+        )
+
+    @staticmethod
+    def _batch_keys(file_names: list[str]) -> list[str]:
+        file_names = list(dict.fromkeys(file_names))
+        if len(file_names) > settings.BATCH_MAX_KEYS:
+            raise ValidationError(f"At most {settings.BATCH_MAX_KEYS} keys can be processed at once")
+        return file_names
+
+    async def stat_file(self, file_name: str, current_user: uuid.UUID) -> tuple[FileObject, Optional[StoredBucket]]:
+        """
+        Look an object and its bucket up in the metadata, without touching storage.
+
+        Returns:
+            The object, and its bucket if still found
+
+        Raises:
+            FileNotFoundError: if the object does not exist
+        """
+        bucket, store_file = await asyncio.gather(
+            self.engine.get_bucket_by_id_user(bucket_name=self.bucket_name, owner_id=current_user),
+            self.engine.get_file(bucket_name=self.bucket_name, file_name=file_name, owner_id=current_user)
+        )
         if store_file is None:
             raise FileNotFoundError(2, "No such file or directory", file_name)
+        return store_file, bucket
 
-        logger.info(store_file)
+    def file_validators(self, store_file: FileObject) -> tuple[Optional[str], Optional[datetime]]:
+        """
+        Build the ETag and Last-Modified of an object from its metadata.
 
-        file_path = f"/tmp/{str(current_user)}"
+        Every write through the API refreshes last_modified after the bytes are
+        stored, so the pair changes whenever the content may have: a strong
+        ETag that can be checked without reading the object.
 
-        self.storage.download_file(
-            object_name=file_name,
-            file_path=file_path,
-            bucket_name=str(store_file.bucket_id)
+        Presigned upload urls, and the local PUT route they point to, replace
+        the bytes without a metadata write for PRESIGNED_UPLOAD_EXPIRATION
+        after they are issued, and issuing one refreshes last_modified. No
+        validators are built for objects modified more recently than that on
+        backends offering presigned uploads: their requests go to the backend.
+
+        Returns:
+            The ETag and the last modification time, None if the metadata cannot vouch for the content
+        """
+        if store_file.id is None or not store_file.last_modified:
+            return None, None
+        last_modified = datetime.fromisoformat(store_file.last_modified)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        if self.storage.supports_presigned_uploads:
+            age = (datetime.now(timezone.utc) - last_modified).total_seconds()
+            if age < settings.PRESIGNED_UPLOAD_EXPIRATION:
+                return None, None
+        version = int(last_modified.timestamp() * 1_000_000)
+        return f'"{store_file.id.hex}-{version:x}"', last_modified
+
+    async def get_download_url(self, store_file: FileObject) -> Optional[str]:
+        """
+        Presign a download url for an object, valid for DOWNLOAD_URL_EXPIRATION.
+
+        Returns:
+            The url, or None if the backend cannot presign downloads
+        """
+        return await self.executor.run(
+            self.storage.get_presigned_url,
+            bucket_name=str(store_file.bucket_id),
+            object_name=store_file.name,
+            expiration=settings.DOWNLOAD_URL_EXPIRATION
+        )
+
+    async def get_file(
+            self,
+            file_name: str,
+            current_user: uuid.UUID,
+            byte_range: Optional[str] = None,
+            if_range: Optional[str] = None,
+            store_file: Optional[FileObject] = None
+    ) -> StorageObject:
+        logger.info(f"Getting bucket {file_name}")
+
+        if store_file is None:
+            store_file, _ = await self.stat_file(file_name, current_user)
+
+        byte_range = parse_byte_range(byte_range)
+        validator = parse_if_range(if_range) if byte_range else None
+        if if_range and byte_range and validator is None:
+            # An If-Range we cannot evaluate never matches: send everything
+            byte_range = None
+
+        etag, last_modified = self.file_validators(store_file)
+        if validator is not None and last_modified is not None:
+            # Clients got the metadata validators, so If-Range is checked against them
+            if validator != etag and validator != last_modified.replace(microsecond=0):
+                byte_range = None
+            validator = None
+
+        try:
+            return await self.executor.run(
+                self.storage.get_object,
+                object_name=file_name,
+                bucket_name=str(store_file.bucket_id),
+                byte_range=byte_range,
+                if_match=validator if isinstance(validator, str) else None,
+                if_unmodified_since=validator if isinstance(validator, datetime) else None
+            )
+        except PreconditionFailedError:
+            # If-Range did not match the current representation
+            return await self.executor.run(
+                self.storage.get_object,
+                object_name=file_name,
+                bucket_name=str(store_file.bucket_id)
+            )
+
+    async def get_files(
+            self,
+            current_user: uuid.UUID,
+            limit: int,
+            cursor: Optional[str] = None,
+            prefix: Optional[str] = None
+    ) -> FilePage:
+        after = decode_cursor(cursor)
+
+        # One extra row tells whether another page follows
+        files = await self.engine.get_files(
+            bucket_name=self.bucket_name,
+            owner_id=current_user,
+            limit=limit + 1,
+            after=after[0] if after else None,
+            prefix=prefix
         )
 
-        return file_path
+        next_cursor = encode_cursor(str(files[limit - 1].name)) if len(files) > limit else None
+        return FilePage(items=files[:limit], next_cursor=next_cursor)
 
-    def get_files(self, current_user: uuid.UUID) -> list[FileObject]:
+    def stream_files(
+            self,
+            current_user: uuid.UUID,
+            cursor: Optional[str] = None,
+            prefix: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield every object of the bucket as newline-delimited JSON.
 
-        return self.engine.get_files(
+        Rows are encoded straight from the metadata pages, one chunk per page,
+        so memory use does not depend on the size of the bucket. The cursor is
+        decoded here, before the response starts, so a bad one is still a 422.
+        """
+        after = decode_cursor(cursor)
+        pages = self.engine.iter_files(
             bucket_name=self.bucket_name,
-            owner_id=current_user
+            owner_id=current_user,
+            page_size=settings.FILES_STREAM_PAGE_SIZE,
+            after=after[0] if after else None,
+            prefix=prefix
         )
+        return self._ndjson(pages)
 
-    def get_buckets(self, current_user: uuid.UUID):
-        results = self.engine.get_buckets(
-            owner_id=current_user
+    @staticmethod
+    async def _ndjson(pages: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+        async for page in pages:
+            yield "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in page).encode()
+
+    async def get_buckets(self, current_user: uuid.UUID, limit: int, cursor: Optional[str] = None) -> BucketPage:
+        key = decode_cursor(cursor, parts=2)
+        after = None
+        if key is not None:
+            name, bucket_id = key
+            try:
+                uuid.UUID(bucket_id)
+            except ValueError:
+                raise ValidationError("Invalid pagination cursor")
+            after = (name, bucket_id)
+
+        # One extra row tells whether another page follows
+        buckets = await self.engine.get_buckets(
+            owner_id=current_user,
+            limit=limit + 1,
+            after=after
         )
-        return [bucket for bucket in results]
+
+        next_cursor = None
+        if len(buckets) > limit:
+            last = buckets[limit - 1]
+            next_cursor = encode_cursor(last.name, str(last.id))
+        return BucketPage(items=buckets[:limit], next_cursor=next_cursor)
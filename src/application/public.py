@@ -0,0 +1,76 @@
+import time
+import uuid
+import asyncio
+import logging
+from typing import Optional
+
+from config.settings import settings
+from src.database.engine import MetadataEngine
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+
+class PublicBucketIndex:
+    """
+    In-process set of the public bucket ids, answering anonymous reads.
+
+    The set is replaced wholesale by each refresh, so a bucket made public or
+    private is seen as such from the next one. If refreshes keep failing for
+    more than ``max_age`` seconds the index stops answering yes rather than
+    serve from an arbitrarily old view.
+    """
+
+    def __init__(self, max_age: float):
+        """
+        Args:
+            max_age: Seconds after the last successful refresh during which the ids are trusted
+        """
+        self.max_age = max_age
+        self._ids: frozenset[uuid.UUID] = frozenset()
+        self._refreshed_at: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.hits = 0
+        self.misses = 0
+
+    def is_public(self, bucket_id: uuid.UUID) -> bool:
+        """Tell whether anonymous reads of a bucket are allowed"""
+        fresh = self._refreshed_at is not None and time.monotonic() - self._refreshed_at <= self.max_age
+        if fresh and bucket_id in self._ids:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def replace(self, bucket_ids: set[uuid.UUID]):
+        """Swap in the ids read by a refresh"""
+        self._ids = frozenset(bucket_ids)
+        self._refreshed_at = time.monotonic()
+        self.refreshes += 1
+
+    async def refresh(self, engine: MetadataEngine):
+        """Reload the ids from the metadata, keeping the previous ones on failure"""
+        try:
+            self.replace(await engine.fetch_public_bucket_ids())
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Public bucket refresh failed: {e}")
+
+    def stats(self) -> dict:
+        """Snapshot of the public bucket index for metrics"""
+        return {
+            "buckets": len(self._ids),
+            "age": None if self._refreshed_at is None else time.monotonic() - self._refreshed_at,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+async def run_public_bucket_refresh(index: PublicBucketIndex, engine: MetadataEngine):
+    """Refresh the index right away, then periodically until cancelled"""
+    while True:
+        await index.refresh(engine)
+        await asyncio.sleep(settings.PUBLIC_BUCKETS_REFRESH_INTERVAL)
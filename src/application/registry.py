@@ -0,0 +1,142 @@
+import threading
+import logging
+from typing import Optional
+from botocore.config import Config
+
+from config.settings import settings
+from src.application.types.storage import StorageAction
+from src.application.types.s3 import S3StorageActions
+from src.application.types.local import LocalStorageActions
+from src.application.types.dedup import DedupStorageActions
+from src.application.types.cached import CachedStorageActions
+from src.core.cache import PresignedUrlCache
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+
+class StorageRegistry:
+    """Process-wide registry holding one storage backend per backend configuration."""
+
+    def __init__(self):
+        self._backends: dict[tuple, StorageAction] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def client_config() -> Config:
+        """Build the botocore client config from settings."""
+        return Config(
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=settings.S3_TCP_KEEPALIVE,
+            connect_timeout=settings.S3_CONNECT_TIMEOUT,
+            read_timeout=settings.S3_READ_TIMEOUT,
+            retries={
+                "max_attempts": settings.S3_MAX_RETRIES,
+                "mode": settings.S3_RETRY_MODE
+            }
+        )
+
+    @staticmethod
+    def url_cache() -> Optional[PresignedUrlCache]:
+        """Build the presigned url cache of one backend, None if disabled."""
+        if settings.PRESIGNED_URL_CACHE_SIZE <= 0:
+            return None
+        return PresignedUrlCache(
+            max_size=settings.PRESIGNED_URL_CACHE_SIZE,
+            min_remaining=settings.PRESIGNED_URL_MIN_REMAINING
+        )
+
+    def get(
+            self,
+            storage_type: str,
+            endpoint_url: Optional[str] = None,
+            access_key: Optional[str] = None,
+            secret_key: Optional[str] = None,
+            region: Optional[str] = None
+    ) -> StorageAction:
+        """
+        Return the shared backend for a configuration, building it on first use.
+
+        Args:
+            storage_type: Backend type ("S3" or anything else for local storage)
+            endpoint_url: S3-compatible endpoint
+            access_key: Access key ID
+            secret_key: Secret access key
+            region: AWS region
+
+        Returns:
+            The storage backend shared by every caller using the same configuration
+        """
+        key = (storage_type, endpoint_url, access_key, secret_key, region)
+
+        backend = self._backends.get(key)
+        if backend is not None:
+            return backend
+
+        with self._lock:
+            backend = self._backends.get(key)
+            if backend is None:
+                logger.info(f"Building {storage_type} storage backend for '{endpoint_url}'")
+                backend = S3StorageActions(
+                    endpoint_url=endpoint_url,
+                    access_key=access_key,
+                    secret_key=secret_key,
+                    region=region or settings.S3_REGION,
+                    client_config=self.client_config(),
+                    url_cache=self.url_cache()
+                ) if storage_type == "S3" else LocalStorageActions(
+                    root=settings.LOCAL_STORAGE_ROOT,
+                    fsync=settings.LOCAL_STORAGE_FSYNC,
+                    base_url=settings.LOCAL_STORAGE_BASE_URL,
+                    signing_key=settings.LOCAL_STORAGE_SIGNING_KEY,
+                    url_cache=self.url_cache()
+                )
+                if settings.STORAGE_DEDUP:
+                    backend = DedupStorageActions(
+                        backend=backend,
+                        root=settings.DEDUP_ROOT,
+                        blob_bucket=settings.DEDUP_BLOB_BUCKET,
+                        grace_period=settings.DEDUP_GRACE_PERIOD
+                    )
+                if settings.STORAGE_CACHE:
+                    backend = CachedStorageActions(
+                        backend=backend,
+                        root=settings.STORAGE_CACHE_ROOT,
+                        max_bytes=settings.STORAGE_CACHE_MAX_BYTES,
+                        max_object_size=settings.STORAGE_CACHE_MAX_OBJECT_SIZE,
+                        revalidate_after=settings.STORAGE_CACHE_REVALIDATE_AFTER,
+                        fill_workers=settings.STORAGE_CACHE_FILL_WORKERS
+                    )
+                self._backends[key] = backend
+        return backend
+
+    def default(self) -> StorageAction:
+        """Return the backend configured through settings."""
+        return self.get(
+            storage_type=settings.STORAGE_TYPE,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            region=settings.S3_REGION
+        )
+
+    def deduplicated(self) -> list[DedupStorageActions]:
+        """Return the deduplicating layers of the backends built so far."""
+        with self._lock:
+            backends = list(self._backends.values())
+        layers = []
+        for backend in backends:
+            # Wrappers keep the backend they wrap in .backend
+            layer: Optional[StorageAction] = backend
+            while layer is not None and not isinstance(layer, DedupStorageActions):
+                layer = getattr(layer, "backend", None)
+            if layer is not None:
+                layers.append(layer)
+        return layers
+
+    def close(self):
+        """Close every backend and forget them."""
+        with self._lock:
+            for backend in self._backends.values():
+                backend.close()
+            self._backends.clear()
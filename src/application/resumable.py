@@ -0,0 +1,134 @@
+import os
+import time
+import uuid
+import fcntl
+import asyncio
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Iterator
+
+from pydantic import BaseModel, Field
+
+from config.settings import settings
+from src.application.types.storage import StorageAction
+from src.core.exceptions import ConflictError
+from src.core.executor import StorageExecutor
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+
+class UploadSession(BaseModel):
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, description="Session id")
+    bucket_id: uuid.UUID = Field(..., description="UID of the target bucket")
+    bucket_name: str = Field(..., description="Name of the target bucket")
+    owner: uuid.UUID = Field(..., description="UID of the uploading user")
+    file_name: str = Field(..., description="Name of the object being uploaded")
+    length: int = Field(..., description="Declared total size in bytes")
+    offset: int = Field(default=0, description="Bytes received so far")
+    upload_id: Optional[str] = Field(default=None, description="Storage multipart upload id")
+    parts: list[dict] = Field(default_factory=list, description="Parts already stored")
+    expires_at: float = Field(..., description="Unix time after which the session is collected")
+
+
+class UploadSessionStore:
+    """
+    Upload sessions persisted as JSON files on a directory shared by the workers.
+
+    Bytes received after the last full part are kept next to the session in a
+    ``.tail`` file until enough data arrives to store another part.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, session_id: uuid.UUID, suffix: str) -> Path:
+        return self.directory / f"{session_id}{suffix}"
+
+    def get(self, session_id: uuid.UUID) -> Optional[UploadSession]:
+        try:
+            return UploadSession.model_validate_json(self._path(session_id, ".json").read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def save(self, session: UploadSession):
+        path = self._path(session.id, ".json")
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(session.model_dump_json())
+        os.replace(tmp, path)
+
+    def delete(self, session_id: uuid.UUID):
+        for suffix in (".json", ".tail", ".lock"):
+            self._path(session_id, suffix).unlink(missing_ok=True)
+
+    def read_tail(self, session_id: uuid.UUID) -> bytes:
+        try:
+            return self._path(session_id, ".tail").read_bytes()
+        except FileNotFoundError:
+            return b""
+
+    def write_tail(self, session_id: uuid.UUID, data: bytes):
+        path = self._path(session_id, ".tail")
+        tmp = path.with_suffix(".tail.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    @contextmanager
+    def lock(self, session_id: uuid.UUID) -> Iterator[None]:
+        """Hold the session exclusively; concurrent writers get a ConflictError"""
+        with open(self._path(session_id, ".lock"), "a") as handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise ConflictError(f"Upload {session_id} is being modified by another request")
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def sessions(self) -> Iterator[UploadSession]:
+        for path in self.directory.glob("*.json"):
+            try:
+                yield UploadSession.model_validate_json(path.read_bytes())
+            except (FileNotFoundError, ValueError):
+                continue
+
+
+def collect_expired_sessions(store: UploadSessionStore, storage: StorageAction) -> int:
+    """Abort the multipart uploads of expired sessions and forget them"""
+    collected = 0
+    now = time.time()
+    for listed in store.sessions():
+        if listed.expires_at > now:
+            continue
+        try:
+            with store.lock(listed.id):
+                # A request may have extended or finished the session since it was listed
+                session = store.get(listed.id)
+                if session is None or session.expires_at > now:
+                    continue
+                if session.upload_id:
+                    storage.abort_multipart_upload(
+                        object_name=session.file_name,
+                        bucket_name=str(session.bucket_id),
+                        upload_id=session.upload_id
+                    )
+                store.delete(session.id)
+                collected += 1
+        except ConflictError:
+            continue
+    if collected:
+        logger.info(f"Collected {collected} expired upload sessions")
+    return collected
+
+
+async def run_session_gc(store: UploadSessionStore, storage: StorageAction, executor: StorageExecutor):
+    """Periodically collect expired sessions until cancelled"""
+    while True:
+        await asyncio.sleep(settings.UPLOAD_SESSION_GC_INTERVAL)
+        try:
+            await executor.run(collect_expired_sessions, store, storage)
+        except Exception as e:
+            logger.error(f"Upload session collection failed: {e}")
@@ -0,0 +1,626 @@
+import os
+import time
+import uuid
+import shutil
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, BinaryIO, Iterator
+
+from config.settings import settings
+from src.application.types.storage import StorageAction, StorageObject, FileStorageObject
+from src.core.cache import TTLCache
+from src.core.exceptions import PreconditionFailedError, RangeNotSatisfiableError
+from src.core.http import resolve_byte_range
+from src.core.singleflight import SingleFlight
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class _Entry:
+    __slots__ = ("path", "size", "etag", "content_type", "last_modified", "validated")
+
+    def __init__(
+            self,
+            path: Path,
+            size: int,
+            etag: Optional[str],
+            content_type: Optional[str],
+            last_modified: Optional[datetime]
+    ):
+        self.path = path
+        self.size = size
+        self.etag = etag
+        self.content_type = content_type
+        self.last_modified = last_modified
+        self.validated = time.monotonic()
+
+
+class _Fill:
+    """Copy of an object being written to disk, readable while it grows."""
+
+    def __init__(self, tmp: Path):
+        self.tmp = tmp
+        self.size: Optional[int] = None
+        self.etag: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.last_modified: Optional[datetime] = None
+        self.written = 0
+        self.failed = False
+        # Set when the object is written meanwhile: the copy is served to its readers but not kept
+        self.stale = False
+        self._fd: Optional[int] = None
+        self._cond = threading.Condition()
+
+    def start(self, stored: StorageObject):
+        """Create the copy for the object the backend opened"""
+        self._fd = os.open(self.tmp, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        self.size = stored.content_length
+        self.etag = stored.etag
+        self.content_type = stored.content_type
+        self.last_modified = stored.last_modified
+
+    def open(self) -> Optional[int]:
+        """Open the copy for reading, or None once it is finished"""
+        with self._cond:
+            if self._fd is None:
+                return None
+            return os.dup(self._fd)
+
+    def write(self, chunk: bytes):
+        if self._fd is None:
+            raise OSError(f"copy {self.tmp} is not open")
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(self._fd, view):]
+        with self._cond:
+            self.written += len(chunk)
+            self._cond.notify_all()
+
+    def wait(self, position: int) -> bool:
+        """
+        Wait until the byte at position is written.
+
+        Returns:
+            False if the copy stopped before reaching it
+        """
+        with self._cond:
+            while self.written <= position and not self.failed:
+                self._cond.wait()
+            return self.written > position
+
+    def close(self):
+        with self._cond:
+            self.failed = self.written != self.size
+            os.close(self._fd)
+            self._fd = None
+            self._cond.notify_all()
+
+
+class _FillObject(StorageObject):
+    """
+    StorageObject read from a copy still being filled.
+
+    Reads wait for the copy to get past them. If the copy stops short, the
+    rest is read from the backend, which must still have the same ETag.
+    """
+
+    def __init__(self, backend: StorageAction, key: tuple[str, str], fill: _Fill, fd: int, offset: int, **kwargs):
+        super().__init__(os.fdopen(fd, "rb"), **kwargs)
+        self.backend = backend
+        self.key = key
+        self.fill = fill
+        self.offset = offset
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        """Yield the served slice in chunks of at most chunk_size bytes as the copy reaches them."""
+        fd = self.body.fileno()
+        position = self.offset
+        end = self.offset + self.content_length
+        try:
+            while position < end:
+                if not self.fill.wait(position):
+                    yield from self._resume(position, end, chunk_size)
+                    return
+                chunk = os.pread(fd, min(chunk_size, self.fill.written - position, end - position), position)
+                position += len(chunk)
+                yield chunk
+        finally:
+            self.close()
+
+    def _resume(self, position: int, end: int, chunk_size: int) -> Iterator[bytes]:
+        bucket_name, object_name = self.key
+        logger.warning(f"Copy of '{object_name}' stopped, reading the rest from the backend")
+        stored = self.backend.get_object(
+            object_name,
+            bucket_name,
+            byte_range=f"bytes={position}-{end - 1}",
+            if_match=self.etag
+        )
+        yield from stored.iter_chunks(chunk_size)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class CachedStorageActions(StorageAction):
+    """
+    Read-through disk cache in front of another backend.
+
+    Objects read through get_object are copied to local disk and served from
+    there, with ranges and preconditions applied locally. The cache holds at
+    most ``max_bytes``, evicting the least recently read objects first;
+    objects larger than ``max_object_size`` are never cached.
+
+    A miss starts copying the object on a small pool of fill threads. The
+    reader that missed, and every reader arriving while the copy runs, read
+    the copy as it grows: the backend sends the object once, and the first
+    bytes go out without waiting for the whole object. Entries older than
+    ``revalidate_after`` seconds are checked against the backend ETag with a
+    one byte conditional read before being served, which catches writes
+    made by other processes or straight to the backend. Writes going through
+    this backend invalidate the entry once the backend has the new content;
+    a copy being filled meanwhile is not kept.
+
+    Each process keeps its copies in its own subdirectory of ``root`` and
+    its own ``max_bytes`` budget, so with several workers the disk used is
+    up to ``max_bytes`` per worker, and a hot object is copied once per
+    worker. Subdirectories of processes that are no longer running are
+    removed when a process starts.
+    """
+
+    def __init__(
+            self,
+            backend: StorageAction,
+            root: str,
+            max_bytes: int,
+            max_object_size: int,
+            revalidate_after: float = 30,
+            fill_workers: int = 4
+    ):
+        """
+        Initialize cached storage service.
+
+        Args:
+            backend: Storage the objects are read from
+            root: Directory holding one subdirectory of cached copies per process
+            max_bytes: Total size of the cached copies of this process
+            max_object_size: Size above which objects are served from the backend directly
+            revalidate_after: Seconds a cached copy is served before its ETag is checked again
+            fill_workers: Threads copying missed objects from the backend
+        """
+        self.backend = backend
+        self.supports_presigned_uploads = backend.supports_presigned_uploads
+        self.root = Path(root) / str(os.getpid())
+        self.max_bytes = max_bytes
+        self.max_object_size = max_object_size
+        self.revalidate_after = revalidate_after
+
+        # Copies left by a dead process, or a previous process with this pid, are in no index
+        for directory in Path(root).glob("[0-9]*"):
+            if directory == self.root or not _process_alive(int(directory.name)):
+                shutil.rmtree(directory, ignore_errors=True)
+        (self.root / "tmp").mkdir(parents=True, exist_ok=True)
+
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._size = 0
+        self._fills: dict[tuple[str, str], _Fill] = {}
+        # Objects found too large, read from the backend without trying to cache them
+        self._uncacheable = TTLCache(max_size=10000, ttl=revalidate_after)
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._filler = ThreadPoolExecutor(max_workers=fill_workers, thread_name_prefix="cache-fill")
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def close(self):
+        """Finish the copies in progress and close the backend."""
+        self._filler.shutdown(wait=True)
+        self.backend.close()
+
+    def stats(self) -> dict:
+        """Snapshot of cache usage for metrics"""
+        with self._lock:
+            stats: dict = {
+                "objects": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "filling": len(self._fills),
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+            }
+        stats["fetches"] = self._flights.stats()
+        return stats
+
+    def _copy_path(self, key: tuple[str, str]) -> Path:
+        digest = hashlib.sha256("\0".join(key).encode()).hexdigest()
+        return self.root / digest[:2] / f"{digest}.{uuid.uuid4().hex}"
+
+    def invalidate(self, bucket_name: str, object_name: str):
+        """Drop the cached copy of an object, and any copy being filled."""
+        key = (bucket_name, object_name)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry.size
+            fill = self._fills.pop(key, None)
+            if fill is not None:
+                fill.stale = True
+        self._uncacheable.invalidate(key)
+        if entry is not None:
+            entry.path.unlink(missing_ok=True)
+
+    def _lookup(self, key: tuple[str, str]) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _insert(self, key: tuple[str, str], entry: _Entry, fill: _Fill) -> bool:
+        evicted = []
+        with self._lock:
+            if fill.stale:
+                return False
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+                evicted.append(previous)
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, oldest = self._entries.popitem(last=False)
+                self._size -= oldest.size
+                self.evictions += 1
+                evicted.append(oldest)
+        # Readers holding a copy open keep reading it after the unlink
+        for old in evicted:
+            old.path.unlink(missing_ok=True)
+        return True
+
+    def _start_fill(self, key: tuple[str, str]) -> Optional[_Fill]:
+        """
+        Open an object on the backend and start copying it to disk.
+
+        Returns:
+            The copy being filled, or None if the object is too large to cache
+        """
+        bucket_name, object_name = key
+        with self._lock:
+            fill = self._fills.get(key)
+            if fill is not None and fill.size is not None:
+                return fill
+            # Registered before the backend read, so a write meanwhile marks it stale
+            fill = self._fills[key] = _Fill(self.root / "tmp" / uuid.uuid4().hex)
+
+        stored = None
+        try:
+            stored = self.backend.get_object(object_name, bucket_name)
+            if stored.content_length > min(self.max_object_size, self.max_bytes):
+                stored.close()
+                self._uncacheable.set(key, True)
+                self._forget(key, fill)
+                return None
+            fill.start(stored)
+            self._filler.submit(self._copy, key, fill, stored)
+        except BaseException:
+            if stored is not None:
+                stored.close()
+            self._forget(key, fill)
+            if fill.size is not None:
+                fill.close()
+            fill.tmp.unlink(missing_ok=True)
+            raise
+        return fill
+
+    def _forget(self, key: tuple[str, str], fill: _Fill):
+        with self._lock:
+            if self._fills.get(key) is fill:
+                del self._fills[key]
+
+    def _copy(self, key: tuple[str, str], fill: _Fill, stored: StorageObject):
+        """Copy an object to disk on a fill thread, then make the copy an entry"""
+        object_name = key[1]
+        try:
+            for chunk in stored.iter_chunks(COPY_CHUNK_SIZE):
+                fill.write(chunk)
+            if fill.written != fill.size:
+                raise OSError(f"backend sent {fill.written} of {fill.size} bytes")
+
+            path = self._copy_path(key)
+            path.parent.mkdir(exist_ok=True)
+            os.replace(fill.tmp, path)
+            entry = _Entry(path, fill.written, fill.etag, fill.content_type, fill.last_modified)
+            if not self._insert(key, entry, fill):
+                # Written while being copied: read the new content from the backend
+                logger.info(f"Discarding stale copy of '{object_name}'")
+                path.unlink(missing_ok=True)
+        except Exception as e:
+            logger.error(f"Failed to cache '{object_name}': {e}")
+            fill.tmp.unlink(missing_ok=True)
+        finally:
+            # Entry first: a reader finding the copy closed looks the entry up again
+            self._forget(key, fill)
+            fill.close()
+
+    def _is_current(self, key: tuple[str, str], entry: _Entry) -> bool:
+        """Check a cached copy against the backend ETag"""
+        bucket_name, object_name = key
+        with self._lock:
+            self.revalidations += 1
+        try:
+            stored = self.backend.get_object(
+                object_name,
+                bucket_name,
+                byte_range="bytes=0-0" if entry.size else None,
+                if_match=entry.etag
+            )
+        except (PreconditionFailedError, RangeNotSatisfiableError, FileNotFoundError):
+            return False
+        stored.close()
+        return True
+
+    def _entry(self, key: tuple[str, str]) -> Optional[_Entry]:
+        entry = self._lookup(key)
+        if entry is None or time.monotonic() - entry.validated <= self.revalidate_after:
+            return entry
+        if not self._flights.do(("revalidate", key), lambda: self._is_current(key, entry)):
+            self.invalidate(*key)
+            return None
+        entry.validated = time.monotonic()
+        return entry
+
+    def _open(self, key: tuple[str, str]) -> Optional[tuple[_Entry, BinaryIO]]:
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        try:
+            return entry, open(entry.path, "rb")
+        except FileNotFoundError:
+            # Evicted or invalidated between the lookup and the open
+            return None
+
+    def _follow(self, key: tuple[str, str]) -> tuple[Optional[_Fill], Optional[int]]:
+        """Open the copy of an object being filled, starting one if there is none"""
+        with self._lock:
+            fill = self._fills.get(key)
+        if fill is None or fill.size is None:
+            fill = self._flights.do(("fill", key), lambda: self._start_fill(key))
+        if fill is None:
+            return None, None
+        return fill, fill.open()
+
+    def get_object(
+            self,
+            object_name: str,
+            bucket_name: str,
+            byte_range: Optional[str] = None,
+            if_match: Optional[str] = None,
+            if_unmodified_since: Optional[datetime] = None
+    ) -> StorageObject:
+        """
+        Open an object for streaming, from the cache when possible.
+
+        Args:
+            object_name: Object name
+            bucket_name: Bucket name or did where the file is stored
+            byte_range: HTTP Range value (e.g. "bytes=0-1023")
+            if_match: Only serve the object if its ETag matches
+            if_unmodified_since: Only serve the object if unmodified since this time
+
+        Returns:
+            Handle on the object body
+        """
+        key = (bucket_name, object_name)
+        if self._uncacheable.get(key) is True:
+            return self.backend.get_object(object_name, bucket_name, byte_range, if_match, if_unmodified_since)
+
+        for _ in range(3):
+            opened = self._open(key)
+            if opened is not None:
+                entry, handle = opened
+                with self._lock:
+                    self.hits += 1
+                return self._serve(handle, entry, byte_range, if_match, if_unmodified_since)
+
+            with self._lock:
+                self.misses += 1
+            fill, fd = self._follow(key)
+            if fill is None:
+                break
+            if fd is not None:
+                return self._serve_fill(key, fill, fd, byte_range, if_match, if_unmodified_since)
+            # Finished between the lookup and the open: served from the entry it became
+
+        return self.backend.get_object(object_name, bucket_name, byte_range, if_match, if_unmodified_since)
+
+    @staticmethod
+    def _check(
+            etag: Optional[str],
+            last_modified: Optional[datetime],
+            size: int,
+            byte_range: Optional[str],
+            if_match: Optional[str],
+            if_unmodified_since: Optional[datetime]
+    ) -> tuple[int, int, Optional[str]]:
+        if if_match and if_match != etag:
+            raise PreconditionFailedError()
+        if if_unmodified_since and last_modified and last_modified > if_unmodified_since:
+            raise PreconditionFailedError()
+        return resolve_byte_range(byte_range, size)
+
+    def _serve(
+            self,
+            handle: BinaryIO,
+            entry: _Entry,
+            byte_range: Optional[str],
+            if_match: Optional[str],
+            if_unmodified_since: Optional[datetime]
+    ) -> StorageObject:
+        try:
+            start, end, content_range = self._check(
+                entry.etag, entry.last_modified, entry.size, byte_range, if_match, if_unmodified_since
+            )
+        except BaseException:
+            handle.close()
+            raise
+
+        return FileStorageObject(
+            body=handle,
+            offset=start,
+            content_length=end - start + 1,
+            etag=entry.etag,
+            content_type=entry.content_type,
+            content_range=content_range,
+            last_modified=entry.last_modified
+        )
+
+    def _serve_fill(
+            self,
+            key: tuple[str, str],
+            fill: _Fill,
+            fd: int,
+            byte_range: Optional[str],
+            if_match: Optional[str],
+            if_unmodified_since: Optional[datetime]
+    ) -> StorageObject:
+        try:
+            if fill.size is None:
+                raise OSError(f"copy {fill.tmp} was opened before it started")
+            start, end, content_range = self._check(
+                fill.etag, fill.last_modified, fill.size, byte_range, if_match, if_unmodified_since
+            )
+        except BaseException:
+            os.close(fd)
+            raise
+
+        return _FillObject(
+            self.backend,
+            key,
+            fill,
+            fd,
+            offset=start,
+            content_length=end - start + 1,
+            etag=fill.etag,
+            content_type=fill.content_type,
+            content_range=content_range,
+            last_modified=fill.last_modified
+        )
+
+    def create_bucket(self, bucket_name: str, acl: str = 'private') -> bool:
+        return self.backend.create_bucket(bucket_name, acl)
+
+    def upload_fileobj(
+            self,
+            file_obj: BinaryIO,
+            object_name: str,
+            bucket_name: str,
+            metadata: Optional[dict] = None
+    ) -> bool:
+        try:
+            return self.backend.upload_fileobj(file_obj, object_name, bucket_name, metadata)
+        finally:
+            self.invalidate(bucket_name, object_name)
+
+    def create_multipart_upload(self, object_name: str, bucket_name: str) -> str:
+        return self.backend.create_multipart_upload(object_name, bucket_name)
+
+    def upload_part(
+            self,
+            object_name: str,
+            bucket_name: str,
+            upload_id: str,
+            part_number: int,
+            data: bytes
+    ) -> str:
+        return self.backend.upload_part(object_name, bucket_name, upload_id, part_number, data)
+
+    def complete_multipart_upload(
+            self,
+            object_name: str,
+            bucket_name: str,
+            upload_id: str,
+            parts: list[dict]
+    ) -> bool:
+        try:
+            return self.backend.complete_multipart_upload(object_name, bucket_name, upload_id, parts)
+        finally:
+            self.invalidate(bucket_name, object_name)
+
+    def abort_multipart_upload(self, object_name: str, bucket_name: str, upload_id: str) -> bool:
+        return self.backend.abort_multipart_upload(object_name, bucket_name, upload_id)
+
+    def download_file(self, object_name: str, bucket_name: str, file_path: str) -> bool:
+        return self.backend.download_file(object_name, bucket_name, file_path)
+
+    def delete_file(self, object_name: str, bucket_name: str) -> bool:
+        try:
+            return self.backend.delete_file(object_name, bucket_name)
+        finally:
+            self.invalidate(bucket_name, object_name)
+
+    def delete_files(self, object_names: list[str], bucket_name: str) -> dict[str, Optional[str]]:
+        try:
+            return self.backend.delete_files(object_names, bucket_name)
+        finally:
+            for object_name in object_names:
+                self.invalidate(bucket_name, object_name)
+
+    def list_files(self, bucket_name: str, prefix: str = "") -> list:
+        return self.backend.list_files(bucket_name, prefix)
+
+    def list_files_page(
+            self,
+            bucket_name: str,
+            prefix: str = "",
+            continuation_token: Optional[str] = None,
+            max_keys: int = 1000
+    ) -> tuple[list[str], Optional[str]]:
+        return self.backend.list_files_page(bucket_name, prefix, continuation_token, max_keys)
+
+    def get_presigned_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        return self.backend.get_presigned_url(bucket_name, object_name, expiration)
+
+    def object_exists(self, bucket_name: str, object_name: str) -> bool:
+        return self.backend.object_exists(bucket_name, object_name)
+
+    def get_presigned_upload_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        return self.backend.get_presigned_upload_url(bucket_name, object_name, expiration)
+
+    def get_presigned_part_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            upload_id: str,
+            part_number: int,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        return self.backend.get_presigned_part_url(bucket_name, object_name, upload_id, part_number, expiration)
@@ -0,0 +1,738 @@
+import os
+import json
+import asyncio
+import time
+import uuid
+import shutil
+import sqlite3
+import hashlib
+import logging
+import mimetypes
+import tempfile
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional, BinaryIO, Callable, Iterable
+
+from config.settings import settings
+from src.application.types.storage import StorageAction, StorageObject
+from src.application.types.local import _prefix_upper_bound
+from src.core.exceptions import PreconditionFailedError, ServiceUnavailableError
+from src.core.executor import StorageExecutor
+from src.core.sqlite import ThreadLocalConnections
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+COPY_CHUNK_SIZE = 1024 * 1024
+MAX_GC_BATCH = 1000
+# A collection marked longer ago than this is taken as abandoned (crashed worker) and run again
+COLLECTION_TIMEOUT = 300
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS blobs (
+        digest TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        refcount INTEGER NOT NULL,
+        orphaned REAL,
+        collecting REAL
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS blobs_orphaned ON blobs (orphaned) WHERE orphaned IS NOT NULL;
+    CREATE TABLE IF NOT EXISTS buckets (
+        name TEXT PRIMARY KEY,
+        acl TEXT NOT NULL,
+        created REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS objects (
+        bucket TEXT NOT NULL,
+        key TEXT NOT NULL,
+        digest TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        content_type TEXT,
+        metadata TEXT,
+        modified REAL NOT NULL,
+        PRIMARY KEY (bucket, key)
+    ) WITHOUT ROWID;
+"""
+
+
+class DedupStorageActions(StorageAction):
+    """
+    Content-addressed storage on top of another backend.
+
+    Every object is hashed (SHA-256) while it is received and its content is
+    stored once in the backend, as ``<blob_bucket>/<digest>``; a SQLite index
+    maps each bucket key to its digest and counts the keys referencing every
+    blob. Content already stored is never sent to the backend again.
+
+    A blob whose last key is deleted is only marked orphaned. It is removed
+    from the backend by collect_garbage, run periodically by the application
+    (see run_blob_gc), once it has stayed orphaned for ``grace_period``
+    seconds, so an upload that found the blob present is not left pointing
+    at deleted content. Blobs being collected are marked in the index first
+    and deleted from the backend without holding the index lock; uploads of
+    the content of such a blob are refused as unavailable until the
+    collection ends rather than wait for it.
+
+    Presigned uploads would send content to the backend without hashing it,
+    so this backend does not offer them.
+
+    Limits:
+        The index is a SQLite file under ``root``, shared by the workers of
+        one host only. Several hosts deduplicating into the same backend
+        would each collect blobs the others still reference: run it on one
+        host, or give each host its own blob bucket.
+
+        Only buckets and objects written through this backend are indexed.
+        Buckets and objects already in the backend when deduplication is
+        turned on are not visible through it and have to be copied in.
+    """
+
+    supports_presigned_uploads = False
+
+    def __init__(
+            self,
+            backend: StorageAction,
+            root: str,
+            blob_bucket: str = "blobs",
+            grace_period: float = 3600
+    ):
+        """
+        Initialize deduplicating storage service.
+
+        Args:
+            backend: Storage holding the blobs
+            root: Directory holding the index and in-progress uploads
+            blob_bucket: Backend bucket the blobs are stored in
+            grace_period: Seconds an orphaned blob is kept before it is deleted
+        """
+        self.backend = backend
+        self.root = Path(root)
+        self.blob_bucket = blob_bucket
+        self.grace_period = grace_period
+
+        for directory in ("tmp", "uploads"):
+            (self.root / directory).mkdir(parents=True, exist_ok=True)
+
+        self._index = ThreadLocalConnections(self.root / "index.sqlite3")
+        self._db.executescript(_SCHEMA)
+        # Indexes created before collections were marked
+        if "collecting" not in {row[1] for row in self._db.execute("PRAGMA table_info(blobs)")}:
+            self._db.execute("ALTER TABLE blobs ADD COLUMN collecting REAL")
+        self.backend.create_bucket(blob_bucket)
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        return self._index.get()
+
+    def close(self):
+        """Close the index connections and the backend."""
+        self._index.close()
+        self.backend.close()
+
+    def _bucket_exists(self, bucket_name: str) -> bool:
+        row = self._db.execute("SELECT 1 FROM buckets WHERE name = ?", (bucket_name,)).fetchone()
+        return row is not None
+
+    def _lookup(self, object_name: str, bucket_name: str) -> tuple:
+        row = self._db.execute(
+            "SELECT digest, size, content_type, modified FROM objects WHERE bucket = ? AND key = ?",
+            (bucket_name, object_name)
+        ).fetchone()
+        if row is None:
+            raise FileNotFoundError(2, "No such file or directory", object_name)
+        return row
+
+    def _hash(self, file_obj: BinaryIO) -> tuple[BinaryIO, int, int, str]:
+        """
+        Hash a file-like object in one streaming pass.
+
+        Seekable sources (uploads spooled by the framework, files) are read in
+        place and rewound; others are copied to a temporary file on the way so
+        they can still be sent to the backend afterwards.
+
+        Returns:
+            Readable body, its start position, its size and its hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        size = 0
+        seekable = getattr(file_obj, "seekable", lambda: False)()
+        body = file_obj if seekable else tempfile.TemporaryFile(dir=self.root / "tmp")
+        start = file_obj.tell() if seekable else 0
+        for chunk in iter(lambda: file_obj.read(COPY_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+            if not seekable:
+                body.write(chunk)
+        body.seek(start)
+        return body, start, size, digest.hexdigest()
+
+    def _blob_exists(self, digest: str) -> bool:
+        """
+        Tell whether a blob is stored and usable.
+
+        Raises:
+            ServiceUnavailableError: if the blob is being collected
+        """
+        row = self._db.execute("SELECT collecting FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if row is not None and row[0] is not None:
+            raise ServiceUnavailableError("Content is being collected, retry later")
+        return row is not None
+
+    def _link(
+            self,
+            bucket_name: str,
+            object_name: str,
+            digest: str,
+            size: int,
+            uploaded: bool,
+            metadata: Optional[dict] = None
+    ) -> bool:
+        """
+        Point a key at a blob, taking a reference on it.
+
+        Returns:
+            False if the blob is not stored and this upload did not send it
+
+        Raises:
+            ServiceUnavailableError: if the blob is being collected
+        """
+        content_type = mimetypes.guess_type(object_name)[0] or "binary/octet-stream"
+        with self._index.transaction() as db:
+            row = db.execute("SELECT collecting FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if row is not None and row[0] is not None:
+                raise ServiceUnavailableError("Content is being collected, retry later")
+            if row is None:
+                if not uploaded:
+                    return False
+                db.execute("INSERT INTO blobs (digest, size, refcount) VALUES (?, ?, 0)", (digest, size))
+
+            previous = db.execute(
+                "SELECT digest FROM objects WHERE bucket = ? AND key = ?",
+                (bucket_name, object_name)
+            ).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO objects (bucket, key, digest, size, content_type, metadata, modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (bucket_name, object_name, digest, size, content_type,
+                 json.dumps(metadata) if metadata else None, time.time())
+            )
+            db.execute("UPDATE blobs SET refcount = refcount + 1, orphaned = NULL WHERE digest = ?", (digest,))
+            if previous is not None:
+                self._release(db, previous[0])
+        return True
+
+    @staticmethod
+    def _release(db: sqlite3.Connection, digest: str):
+        """Drop a reference on a blob, marking it orphaned when it was the last one"""
+        db.execute(
+            "UPDATE blobs SET refcount = refcount - 1, "
+            "orphaned = CASE WHEN refcount <= 1 THEN ? ELSE orphaned END WHERE digest = ?",
+            (time.time(), digest)
+        )
+
+    def _store(
+            self,
+            file_obj: BinaryIO,
+            object_name: str,
+            bucket_name: str,
+            metadata: Optional[dict] = None
+    ) -> str:
+        """
+        Hash an object, send its content to the backend unless already stored and index it.
+
+        Returns:
+            Hex SHA-256 digest of the object
+        """
+        body, start, size, digest = self._hash(file_obj)
+        try:
+            uploaded = False
+            # A blob found present may be collected before it is linked: send it again then
+            for _ in range(3):
+                if not uploaded and not self._blob_exists(digest):
+                    body.seek(start)
+                    if not self.backend.upload_fileobj(body, digest, self.blob_bucket):
+                        raise OSError(f"Failed to store blob {digest}")
+                    uploaded = True
+                if self._link(bucket_name, object_name, digest, size, uploaded, metadata):
+                    logger.info(f"Stored '{object_name}' as blob {digest} ({'new' if uploaded else 'deduplicated'})")
+                    return digest
+                uploaded = False
+            raise OSError(f"Blob {digest} kept being collected while uploading")
+        finally:
+            if body is not file_obj:
+                body.close()
+
+    def create_bucket(self, bucket_name: str, acl: str = 'private') -> bool:
+        """
+        Create a new bucket in the index.
+
+        Args:
+            bucket_name: Name of the bucket to create
+            acl: Access control list, recorded but not enforced
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self._db.execute(
+                "INSERT OR IGNORE INTO buckets (name, acl, created) VALUES (?, ?, ?)",
+                (bucket_name, acl, time.time())
+            )
+            logger.info(f"Successfully created bucket '{bucket_name}'")
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Failed to create bucket: {e}")
+            return False
+
+    def upload_fileobj(
+            self,
+            file_obj: BinaryIO,
+            object_name: str,
+            bucket_name: str,
+            metadata: Optional[dict] = None
+    ) -> bool:
+        """
+        Upload a file-like object, storing its content only if it is new.
+
+        Args:
+            file_obj: File-like object to upload
+            object_name: Object name
+            bucket_name: Bucket name or did where the file will be stored
+            metadata: Optional metadata dictionary
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            if not self._bucket_exists(bucket_name):
+                raise FileNotFoundError(2, "No such bucket", bucket_name)
+            self._store(file_obj, object_name, bucket_name, metadata)
+            return True
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Failed to upload file object: {e}")
+            return False
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        if not upload_id.isalnum():
+            raise FileNotFoundError(2, "No such upload", upload_id)
+        return self.root / "uploads" / upload_id
+
+    def _upload_target(self, upload_id: str, object_name: str, bucket_name: str) -> Path:
+        upload_dir = self._upload_dir(upload_id)
+        try:
+            target = json.loads((upload_dir / "target").read_text())
+        except FileNotFoundError:
+            raise FileNotFoundError(2, "No such upload", upload_id)
+        if target != {"bucket": bucket_name, "key": object_name}:
+            raise FileNotFoundError(2, "No such upload", upload_id)
+        return upload_dir
+
+    def create_multipart_upload(self, object_name: str, bucket_name: str) -> str:
+        """
+        Start a multipart upload.
+
+        Parts are kept next to the index until the upload completes, since
+        the digest of the object is only known once every part is in.
+
+        Args:
+            object_name: Object name
+            bucket_name: Bucket name or did where the file will be stored
+
+        Returns:
+            The upload id identifying the multipart upload
+        """
+        if not self._bucket_exists(bucket_name):
+            raise FileNotFoundError(2, "No such bucket", bucket_name)
+
+        upload_id = uuid.uuid4().hex
+        upload_dir = self._upload_dir(upload_id)
+        upload_dir.mkdir()
+        (upload_dir / "target").write_text(json.dumps({"bucket": bucket_name, "key": object_name}))
+        logger.info(f"Started multipart upload for '{object_name}'")
+        return upload_id
+
+    def upload_part(
+            self,
+            object_name: str,
+            bucket_name: str,
+            upload_id: str,
+            part_number: int,
+            data: bytes
+    ) -> str:
+        """
+        Upload one part of a multipart upload.
+
+        Args:
+            object_name: Object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
+            part_number: 1-based position of the part
+            data: Part content
+
+        Returns:
+            The ETag of the stored part
+        """
+        upload_dir = self._upload_target(upload_id, object_name, bucket_name)
+        digest = hashlib.md5(data, usedforsecurity=False).hexdigest()
+        tmp = self.root / "tmp" / uuid.uuid4().hex
+        tmp.write_bytes(data)
+        os.replace(tmp, upload_dir / f"{part_number:05d}.{digest}")
+
+        # A part uploaded again replaces the previous one
+        for previous in upload_dir.glob(f"{part_number:05d}.*"):
+            if previous.name != f"{part_number:05d}.{digest}":
+                previous.unlink(missing_ok=True)
+        return f'"{digest}"'
+
+    def complete_multipart_upload(
+            self,
+            object_name: str,
+            bucket_name: str,
+            upload_id: str,
+            parts: list[dict]
+    ) -> bool:
+        """
+        Assemble the uploaded parts and store the object like a single upload.
+
+        Args:
+            object_name: Object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
+            parts: [{"PartNumber": n, "ETag": etag}, ...] in ascending order
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            upload_dir = self._upload_target(upload_id, object_name, bucket_name)
+            paths = []
+            for part in parts:
+                digest = part['ETag'].strip('"')
+                path = upload_dir / f"{part['PartNumber']:05d}.{digest}"
+                if not path.exists():
+                    raise FileNotFoundError(2, "No such part", str(part['PartNumber']))
+                paths.append(path)
+
+            with tempfile.TemporaryFile(dir=self.root / "tmp") as assembled:
+                for path in paths:
+                    with open(path, "rb") as source:
+                        shutil.copyfileobj(source, assembled, COPY_CHUNK_SIZE)
+                assembled.seek(0)
+                self._store(assembled, object_name, bucket_name)
+
+            shutil.rmtree(upload_dir, ignore_errors=True)
+            logger.info(f"Completed multipart upload of '{object_name}' with {len(parts)} parts")
+            return True
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Failed to complete multipart upload: {e}")
+            return False
+
+    def abort_multipart_upload(self, object_name: str, bucket_name: str, upload_id: str) -> bool:
+        """
+        Abort a multipart upload and discard its parts.
+
+        Args:
+            object_name: Object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            shutil.rmtree(self._upload_target(upload_id, object_name, bucket_name))
+            logger.info(f"Aborted multipart upload of '{object_name}'")
+            return True
+        except OSError as e:
+            logger.error(f"Failed to abort multipart upload: {e}")
+            return False
+
+    def download_file(self, object_name: str, bucket_name: str, file_path: str) -> bool:
+        """
+        Download a stored file to a local path.
+
+        Args:
+            object_name: Object name
+            bucket_name: Bucket name or did where the file is stored
+            file_path: Local path to save the file
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            digest = self._lookup(object_name, bucket_name)[0]
+        except (FileNotFoundError, sqlite3.Error) as e:
+            logger.error(f"Failed to download file: {e}")
+            return False
+        return self.backend.download_file(digest, self.blob_bucket, file_path)
+
+    def get_object(
+            self,
+            object_name: str,
+            bucket_name: str,
+            byte_range: Optional[str] = None,
+            if_match: Optional[str] = None,
+            if_unmodified_since: Optional[datetime] = None
+    ) -> StorageObject:
+        """
+        Open an object for streaming, optionally restricted to a byte range.
+
+        The ETag of an object is its quoted SHA-256 digest.
+
+        Args:
+            object_name: Object name
+            bucket_name: Bucket name or did where the file is stored
+            byte_range: HTTP Range value (e.g. "bytes=0-1023")
+            if_match: Only serve the object if its ETag matches
+            if_unmodified_since: Only serve the object if unmodified since this time
+
+        Returns:
+            Handle on the object body
+        """
+        digest, _, content_type, modified = self._lookup(object_name, bucket_name)
+        etag = f'"{digest}"'
+        last_modified = datetime.fromtimestamp(int(modified), tz=timezone.utc)
+        if if_match and if_match != etag:
+            raise PreconditionFailedError()
+        if if_unmodified_since and last_modified > if_unmodified_since:
+            raise PreconditionFailedError()
+
+        stored = self.backend.get_object(digest, self.blob_bucket, byte_range=byte_range)
+        stored.etag = etag
+        stored.content_type = content_type
+        stored.last_modified = last_modified
+        return stored
+
+    def collect_garbage(self) -> int:
+        """
+        Delete the blobs orphaned for longer than the grace period.
+
+        The index write lock is only held to mark the blobs and, once the
+        backend has deleted them, to drop their rows; the backend call runs
+        without it, so uploads and deletes do not wait on the backend.
+
+        Returns:
+            Number of blobs deleted from the backend
+        """
+        now = time.time()
+        with self._index.transaction() as db:
+            digests = [
+                row[0] for row in db.execute(
+                    "SELECT digest FROM blobs WHERE orphaned IS NOT NULL AND orphaned <= ? AND refcount = 0 "
+                    "AND (collecting IS NULL OR collecting <= ?) LIMIT ?",
+                    (now - self.grace_period, now - COLLECTION_TIMEOUT, MAX_GC_BATCH)
+                )
+            ]
+            # Marked blobs are no longer linked by uploads, which wait for the collection instead
+            db.executemany("UPDATE blobs SET collecting = ? WHERE digest = ?", [(now, digest) for digest in digests])
+        if not digests:
+            return 0
+
+        try:
+            errors = self.backend.delete_files(digests, self.blob_bucket)
+        except Exception as e:
+            errors = {digest: str(e) for digest in digests}
+        deleted = [digest for digest in digests if errors.get(digest) is None]
+
+        with self._index.transaction() as db:
+            db.executemany(
+                "DELETE FROM blobs WHERE digest = ? AND refcount = 0",
+                [(digest,) for digest in deleted]
+            )
+            # Blobs the backend kept are collected again by a later run
+            db.executemany(
+                "UPDATE blobs SET collecting = NULL WHERE digest = ?",
+                [(digest,) for digest in digests if digest not in deleted]
+            )
+        if len(deleted) < len(digests):
+            logger.warning(f"Backend kept {len(digests) - len(deleted)} orphaned blobs, retrying later")
+        logger.info(f"Collected {len(deleted)} orphaned blobs")
+        return len(deleted)
+
+    def _unlink(self, object_names: list[str], bucket_name: str):
+        with self._index.transaction() as db:
+            for object_name in object_names:
+                row = db.execute(
+                    "DELETE FROM objects WHERE bucket = ? AND key = ? RETURNING digest",
+                    (bucket_name, object_name)
+                ).fetchone()
+                if row is not None:
+                    self._release(db, row[0])
+
+    def delete_file(self, object_name: str, bucket_name: str) -> bool:
+        """
+        Delete a key, releasing its reference on the blob.
+
+        Args:
+            object_name: Object name to delete
+            bucket_name: Bucket name or did where the file is stored
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self._unlink([object_name], bucket_name)
+            logger.info(f"Successfully deleted '{object_name}'")
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Failed to delete file: {e}")
+            return False
+
+    def delete_files(self, object_names: list[str], bucket_name: str) -> dict[str, Optional[str]]:
+        """
+        Delete several keys in one index transaction.
+
+        Args:
+            object_names: Object names to delete
+            bucket_name: Bucket name or did where the files are stored
+
+        Returns:
+            Mapping of every object name to an error message, or None if deleted
+        """
+        try:
+            self._unlink(object_names, bucket_name)
+        except sqlite3.Error as e:
+            return {object_name: str(e) for object_name in object_names}
+        return {object_name: None for object_name in object_names}
+
+    def list_files(self, bucket_name: str, prefix: str = "") -> list:
+        """
+        List files in a bucket.
+
+        Args:
+            bucket_name: Bucket name or did where the files are stored
+            prefix: Optional prefix to filter files
+
+        Returns:
+            List of object keys
+        """
+        keys = []
+        token = None
+        while True:
+            page, token = self.list_files_page(bucket_name, prefix=prefix, continuation_token=token)
+            keys.extend(page)
+            if token is None:
+                return keys
+
+    def list_files_page(
+            self,
+            bucket_name: str,
+            prefix: str = "",
+            continuation_token: Optional[str] = None,
+            max_keys: int = 1000
+    ) -> tuple[list[str], Optional[str]]:
+        """
+        List one page of object keys from the index.
+
+        Args:
+            bucket_name: Bucket name or did where the files are stored
+            prefix: Optional prefix to filter files
+            continuation_token: Token returned with the previous page, if any
+            max_keys: Maximum number of keys returned
+
+        Returns:
+            Object keys of the page and the token of the next page, or None on the last page
+        """
+        conditions = ["bucket = ?"]
+        params: list = [bucket_name]
+        if prefix:
+            conditions.append("key >= ?")
+            params.append(prefix)
+            upper = _prefix_upper_bound(prefix)
+            if upper is not None:
+                conditions.append("key < ?")
+                params.append(upper)
+        if continuation_token:
+            conditions.append("key > ?")
+            params.append(continuation_token)
+        params.append(max_keys + 1)
+
+        rows = self._db.execute(
+            f"SELECT key FROM objects WHERE {' AND '.join(conditions)} ORDER BY key LIMIT ?",
+            params
+        ).fetchall()
+        keys = [row[0] for row in rows[:max_keys]]
+        next_token = keys[-1] if len(rows) > max_keys else None
+        return keys, next_token
+
+    def get_presigned_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        """
+        Generate a presigned URL for downloading the blob behind a key.
+
+        Args:
+            bucket_name: Bucket name or did where the file is stored
+            object_name: Object name
+            expiration: URL expiration time in seconds (default: 1 hour)
+
+        Returns:
+            Presigned URL or None if failed
+        """
+        try:
+            digest = self._lookup(object_name, bucket_name)[0]
+        except FileNotFoundError:
+            return None
+        return self.backend.get_presigned_url(self.blob_bucket, digest, expiration)
+
+    def object_exists(self, bucket_name: str, object_name: str) -> bool:
+        """
+        Check whether a key is stored.
+
+        Args:
+            bucket_name: Bucket name or did where the file is stored
+            object_name: Object name
+
+        Returns:
+            True if the object exists, False otherwise
+        """
+        row = self._db.execute(
+            "SELECT 1 FROM objects WHERE bucket = ? AND key = ?",
+            (bucket_name, object_name)
+        ).fetchone()
+        return row is not None
+
+    def get_presigned_upload_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        """
+        Presigned uploads would bypass hashing, so none are issued.
+
+        Returns:
+            None
+        """
+        return None
+
+    def get_presigned_part_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            upload_id: str,
+            part_number: int,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        """
+        Presigned uploads would bypass hashing, so none are issued.
+
+        Returns:
+            None
+        """
+        return None
+
+
+async def run_blob_gc(backends: Callable[[], Iterable[DedupStorageActions]], executor: StorageExecutor):
+    """Periodically collect the orphaned blobs of every deduplicating backend until cancelled"""
+    while True:
+        await asyncio.sleep(settings.DEDUP_GC_INTERVAL)
+        for backend in backends():
+            try:
+                # A full batch may have left more behind
+                while await executor.run(backend.collect_garbage) >= MAX_GC_BATCH:
+                    pass
+            except Exception as e:
+                logger.error(f"Blob collection failed: {e}")
@@ -1,140 +1,668 @@
 import os
-import boto3
-from typing import Optional, BinaryIO
+import hmac
+import json
+import time
+import uuid
+import shutil
+import sqlite3
+import hashlib
 import logging
+import mimetypes
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional, BinaryIO, Iterable
+from urllib.parse import quote, urlencode
 
-from src.application.types.storage import StorageAction
+from config.settings import settings
+from src.application.types.storage import StorageAction, StorageObject, FileStorageObject
+from src.core.cache import PresignedUrlCache
+from src.core.exceptions import PreconditionFailedError
+from src.core.http import resolve_byte_range
+from src.core.sqlite import ThreadLocalConnections
 
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
+FSYNC_POLICIES = ("always", "file", "never")
+COPY_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS buckets (
+        name TEXT PRIMARY KEY,
+        acl TEXT NOT NULL,
+        created REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS objects (
+        bucket TEXT NOT NULL,
+        key TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        etag TEXT NOT NULL,
+        content_type TEXT,
+        metadata TEXT,
+        mtime_ns INTEGER NOT NULL,
+        PRIMARY KEY (bucket, key)
+    ) WITHOUT ROWID;
+"""
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with prefix, if any"""
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
 
 class LocalStorageActions(StorageAction):
-    """Service for storing files in S3-compatible storage."""
+    """
+    Service for storing files on a local filesystem.
+
+    Objects are stored under ``<root>/buckets/<bucket>/<aa>/<bb>/<sha256(key)>``
+    so no directory grows past a few thousand entries, and every write goes to
+    ``<root>/tmp`` first and is renamed into place, so readers never see a
+    partial object. Sizes, ETags and content types live in a SQLite index
+    next to the data, which also answers prefix listings in key order.
+    """
 
     def __init__(
             self,
-            endpoint_url: Optional[str] = None,
-            access_key: Optional[str] = None,
-            secret_key: Optional[str] = None,
-            bucket_name: str = "my-storage-bucket",
-            region: str = "us-east-1"
+            root: str,
+            fsync: str = "file",
+            base_url: str = "",
+            signing_key: str = "",
+            url_cache: Optional[PresignedUrlCache] = None
     ):
         """
-        Initialize S3 storage service.
+        Initialize local storage service.
 
         Args:
-            endpoint_url: S3-compatible endpoint (e.g., MinIO, DigitalOcean Spaces)
-            access_key: Access key ID
-            secret_key: Secret access key
-            bucket_name: Name of the bucket to use
-            region: AWS region
+            root: Directory holding the objects and the index
+            fsync: "always" syncs files and directories, "file" only file contents, "never" leaves it to the OS
+            base_url: Public URL of the local storage routes, used to build presigned URLs
+            signing_key: Secret used to sign presigned URLs
+            url_cache: Cache reusing presigned download URLs
         """
-        self.bucket_name = bucket_name
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}', expected one of {FSYNC_POLICIES}")
 
-        # Initialize S3 client
-        self.s3_client = boto3.client(
-            's3',
-            endpoint_url=endpoint_url,
-            aws_access_key_id=access_key or os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=secret_key or os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=region
+        self.root = Path(root)
+        self.fsync = fsync
+        self.base_url = base_url.rstrip("/")
+        self.signing_key = signing_key.encode()
+        self.url_cache = url_cache
+
+        for directory in ("buckets", "tmp", "uploads"):
+            (self.root / directory).mkdir(parents=True, exist_ok=True)
+
+        self._index = ThreadLocalConnections(
+            self.root / "index.sqlite3",
+            synchronous="FULL" if fsync == "always" else "NORMAL"
         )
+        self._db.executescript(_SCHEMA)
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        return self._index.get()
+
+    def close(self):
+        """Close the index connections opened by every thread."""
+        self._index.close()
+
+    def _bucket_dir(self, bucket_name: str) -> Path:
+        if not bucket_name or bucket_name.startswith(".") or "/" in bucket_name or "\0" in bucket_name:
+            raise ValueError(f"Invalid bucket name '{bucket_name}'")
+        return self.root / "buckets" / bucket_name
 
-    def _ensure_bucket_exists(self):
-        """Create bucket if it doesn't exist."""
-        raise Exception('Not implemented')
+    def _object_path(self, bucket_name: str, object_name: str) -> Path:
+        digest = hashlib.sha256(object_name.encode()).hexdigest()
+        return self._bucket_dir(bucket_name) / digest[:2] / digest[2:4] / digest
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        if not upload_id.isalnum():
+            raise FileNotFoundError(2, "No such upload", upload_id)
+        return self.root / "uploads" / upload_id
+
+    def _sync_dir(self, directory: Path):
+        if self.fsync != "always":
+            return
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _write_temp(self, chunks: Iterable[bytes]) -> tuple[Path, int, str, int]:
+        """
+        Write chunks to a new temporary file.
+
+        Returns:
+            Path, size, hex MD5 digest and modification time (ns) of the file
+        """
+        tmp = self.root / "tmp" / uuid.uuid4().hex
+        digest = hashlib.md5(usedforsecurity=False)
+        size = 0
+        try:
+            with open(tmp, "wb") as handle:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    handle.write(chunk)
+                    size += len(chunk)
+                handle.flush()
+                if self.fsync != "never":
+                    os.fsync(handle.fileno())
+                mtime_ns = os.fstat(handle.fileno()).st_mtime_ns
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return tmp, size, digest.hexdigest(), mtime_ns
+
+    def _write_atomic(self, target: Path, chunks: Iterable[bytes]) -> tuple[int, str]:
+        """
+        Write chunks to a temporary file, then rename it over target.
+
+        The directory of target must exist: a part finishing after its upload
+        was aborted fails here instead of re-creating the upload directory.
+
+        Returns:
+            Size and hex MD5 digest of the written content
+        """
+        tmp, size, digest, _ = self._write_temp(chunks)
+        try:
+            os.replace(tmp, target)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        self._sync_dir(target.parent)
+        return size, digest
+
+    def _publish(
+            self,
+            tmp: Path,
+            bucket_name: str,
+            object_name: str,
+            size: int,
+            etag: str,
+            mtime_ns: int,
+            metadata: Optional[dict] = None
+    ):
+        """
+        Rename a written temporary file over an object and index it.
+
+        The rename and the index row share one index write transaction, so
+        concurrent writers of a key are serialized and the row always
+        describes the file that won the rename. Size and mtime come from the
+        temporary file itself, not from a later stat of the object path.
+        """
+        target = self._object_path(bucket_name, object_name)
+        content_type = mimetypes.guess_type(object_name)[0] or "binary/octet-stream"
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with self._index.transaction() as db:
+                os.replace(tmp, target)
+                db.execute(
+                    "INSERT OR REPLACE INTO objects (bucket, key, size, etag, content_type, metadata, mtime_ns) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (bucket_name, object_name, size, etag, content_type,
+                     json.dumps(metadata) if metadata else None, mtime_ns)
+                )
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        self._sync_dir(target.parent)
+
+    def _remove(self, bucket_name: str, object_name: str):
+        """Drop an object and its index row, serialized with writers of the key like _publish"""
+        path = self._object_path(bucket_name, object_name)
+        with self._index.transaction() as db:
+            db.execute("DELETE FROM objects WHERE bucket = ? AND key = ?", (bucket_name, object_name))
+            path.unlink(missing_ok=True)
+
+    def _bucket_exists(self, bucket_name: str) -> bool:
+        row = self._db.execute("SELECT 1 FROM buckets WHERE name = ?", (bucket_name,)).fetchone()
+        return row is not None
 
     def create_bucket(self, bucket_name: str, acl: str = 'private') -> bool:
         """
-        Create a new bucket in S3 storage.
+        Create a new bucket in local storage.
 
         Args:
             bucket_name: Name of the bucket to create
-            acl: Access control list (private, public-read, public-read-write, etc.)
+            acl: Access control list, recorded but not enforced
 
         Returns:
             True if successful, False otherwise
         """
-        raise Exception('Not implemented')
+        try:
+            self._bucket_dir(bucket_name).mkdir(exist_ok=True)
+            self._db.execute(
+                "INSERT OR IGNORE INTO buckets (name, acl, created) VALUES (?, ?, ?)",
+                (bucket_name, acl, time.time())
+            )
+            logger.info(f"Successfully created bucket '{bucket_name}'")
+            return True
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.error(f"Failed to create bucket: {e}")
+            return False
 
-    def upload_file(
+    def upload_fileobj(
             self,
-            file_path: str,
-            object_name: Optional[str] = None,
+            file_obj: BinaryIO,
+            object_name: str,
+            bucket_name: str,
             metadata: Optional[dict] = None
     ) -> bool:
         """
-        Upload a file to S3 storage.
+        Upload a file-like object to local storage.
 
         Args:
-            file_path: Path to the file to upload
-            object_name: S3 object name (defaults to file basename)
+            file_obj: File-like object to upload
+            object_name: Object name
+            bucket_name: Bucket name or did where the file will be stored
             metadata: Optional metadata dictionary
 
         Returns:
             True if successful, False otherwise
         """
-        raise Exception('Not implemented')
+        try:
+            if not self._bucket_exists(bucket_name):
+                raise FileNotFoundError(2, "No such bucket", bucket_name)
+            tmp, size, digest, mtime_ns = self._write_temp(iter(lambda: file_obj.read(COPY_CHUNK_SIZE), b""))
+            self._publish(tmp, bucket_name, object_name, size, f'"{digest}"', mtime_ns, metadata)
+            logger.info(f"Successfully uploaded file object as '{object_name}'")
+            return True
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.error(f"Failed to upload file object: {e}")
+            return False
 
-    def upload_fileobj(
+    def create_multipart_upload(self, object_name: str, bucket_name: str) -> str:
+        """
+        Start a multipart upload.
+
+        Args:
+            object_name: Object name
+            bucket_name: Bucket name or did where the file will be stored
+
+        Returns:
+            The upload id identifying the multipart upload
+        """
+        if not self._bucket_exists(bucket_name):
+            raise FileNotFoundError(2, "No such bucket", bucket_name)
+
+        upload_id = uuid.uuid4().hex
+        upload_dir = self._upload_dir(upload_id)
+        upload_dir.mkdir()
+        (upload_dir / "target").write_text(json.dumps({"bucket": bucket_name, "key": object_name}))
+        logger.info(f"Started multipart upload for '{object_name}'")
+        return upload_id
+
+    def _upload_target(self, upload_id: str, object_name: str, bucket_name: str) -> Path:
+        upload_dir = self._upload_dir(upload_id)
+        try:
+            target = json.loads((upload_dir / "target").read_text())
+        except FileNotFoundError:
+            raise FileNotFoundError(2, "No such upload", upload_id)
+        if target != {"bucket": bucket_name, "key": object_name}:
+            raise FileNotFoundError(2, "No such upload", upload_id)
+        return upload_dir
+
+    def upload_part(
             self,
-            file_obj: BinaryIO,
             object_name: str,
-            metadata: Optional[dict] = None
+            bucket_name: str,
+            upload_id: str,
+            part_number: int,
+            data: bytes
+    ) -> str:
+        """
+        Upload one part of a multipart upload.
+
+        Parts are stored as ``<number>.<md5>`` so completing an upload can
+        check the ETags it is given without reading the parts back.
+
+        Args:
+            object_name: Object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
+            part_number: 1-based position of the part
+            data: Part content
+
+        Returns:
+            The ETag of the stored part
+        """
+        upload_dir = self._upload_target(upload_id, object_name, bucket_name)
+        digest = hashlib.md5(data, usedforsecurity=False).hexdigest()
+        self._write_atomic(upload_dir / f"{part_number:05d}.{digest}", [data])
+
+        # A part uploaded again replaces the previous one
+        for previous in upload_dir.glob(f"{part_number:05d}.*"):
+            if previous.name != f"{part_number:05d}.{digest}":
+                previous.unlink(missing_ok=True)
+        return f'"{digest}"'
+
+    def complete_multipart_upload(
+            self,
+            object_name: str,
+            bucket_name: str,
+            upload_id: str,
+            parts: list[dict]
     ) -> bool:
         """
-        Upload a file-like object to S3 storage.
+        Assemble the uploaded parts into the final object.
+
+        Parts are concatenated with copy_file_range where the kernel supports
+        it, so their content does not pass through user space.
 
         Args:
-            file_obj: File-like object to upload
-            object_name: S3 object name
-            metadata: Optional metadata dictionary
+            object_name: Object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
+            parts: [{"PartNumber": n, "ETag": etag}, ...] in ascending order
 
         Returns:
             True if successful, False otherwise
         """
-        raise Exception('Not implemented')
+        try:
+            upload_dir = self._upload_target(upload_id, object_name, bucket_name)
+            paths = []
+            for part in parts:
+                digest = part['ETag'].strip('"')
+                path = upload_dir / f"{part['PartNumber']:05d}.{digest}"
+                if not path.exists():
+                    raise FileNotFoundError(2, "No such part", str(part['PartNumber']))
+                paths.append(path)
+
+            tmp = self.root / "tmp" / uuid.uuid4().hex
+            size = 0
+            try:
+                with open(tmp, "wb") as output:
+                    for path in paths:
+                        size += self._append_file(output, path)
+                    output.flush()
+                    if self.fsync != "never":
+                        os.fsync(output.fileno())
+                    mtime_ns = os.fstat(output.fileno()).st_mtime_ns
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+
+            # Same ETag as S3 gives multipart objects: MD5 of the part MD5s
+            digests = b"".join(bytes.fromhex(path.name.split(".")[1]) for path in paths)
+            etag = f'"{hashlib.md5(digests, usedforsecurity=False).hexdigest()}-{len(paths)}"'
+            self._publish(tmp, bucket_name, object_name, size, etag, mtime_ns)
+            shutil.rmtree(upload_dir, ignore_errors=True)
+            logger.info(f"Completed multipart upload of '{object_name}' with {len(parts)} parts")
+            return True
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.error(f"Failed to complete multipart upload: {e}")
+            return False
 
-    def download_file(self, object_name: str, file_path: str) -> bool:
+    @staticmethod
+    def _append_file(output: BinaryIO, path: Path) -> int:
+        with open(path, "rb") as source:
+            size = os.fstat(source.fileno()).st_size
+            copied = 0
+            try:
+                while copied < size:
+                    sent = os.copy_file_range(source.fileno(), output.fileno(), size - copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+            except (AttributeError, OSError):
+                # No copy_file_range on this platform or filesystem
+                source.seek(copied)
+                output.seek(0, os.SEEK_END)
+                shutil.copyfileobj(source, output, COPY_CHUNK_SIZE)
+                copied = size
+            return copied
+
+    def abort_multipart_upload(self, object_name: str, bucket_name: str, upload_id: str) -> bool:
         """
-        Download a file from S3 storage.
+        Abort a multipart upload and discard its parts.
 
         Args:
-            object_name: S3 object name
-            file_path: Local path to save the file
+            object_name: Object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
 
         Returns:
             True if successful, False otherwise
         """
-        raise Exception('Not implemented')
+        try:
+            shutil.rmtree(self._upload_target(upload_id, object_name, bucket_name))
+            logger.info(f"Aborted multipart upload of '{object_name}'")
+            return True
+        except OSError as e:
+            logger.error(f"Failed to abort multipart upload: {e}")
+            return False
+
+    def download_file(self, object_name: str, bucket_name: str, file_path: str) -> bool:
+        """
+        Copy a stored file to a local path.
+
+        Args:
+            object_name: Object name
+            bucket_name: Bucket name or did where the file is stored
+            file_path: Local path to save the file
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            shutil.copyfile(self._object_path(bucket_name, object_name), file_path)
+            logger.info(f"Successfully downloaded '{object_name}' to '{file_path}'")
+            return True
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to download file: {e}")
+            return False
+
+    def _open(self, object_name: str, bucket_name: str) -> tuple[BinaryIO, tuple]:
+        """Open an object together with the index row describing that exact file"""
+        path = self._object_path(bucket_name, object_name)
+        for _ in range(3):
+            row = self._db.execute(
+                "SELECT size, etag, content_type, mtime_ns FROM objects WHERE bucket = ? AND key = ?",
+                (bucket_name, object_name)
+            ).fetchone()
+            if row is None:
+                break
+            try:
+                handle = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            stat = os.fstat(handle.fileno())
+            if (stat.st_size, stat.st_mtime_ns) == (row[0], row[3]):
+                return handle, row
+            # Replaced between reading the index and opening the file
+            handle.close()
+        raise FileNotFoundError(2, "No such file or directory", object_name)
 
-    def delete_file(self, object_name: str) -> bool:
+    def get_object(
+            self,
+            object_name: str,
+            bucket_name: str,
+            byte_range: Optional[str] = None,
+            if_match: Optional[str] = None,
+            if_unmodified_since: Optional[datetime] = None
+    ) -> StorageObject:
         """
-        Delete a file from S3 storage.
+        Open an object for streaming, optionally restricted to a byte range.
 
         Args:
-            object_name: S3 object name to delete
+            object_name: Object name
+            bucket_name: Bucket name or did where the file is stored
+            byte_range: HTTP Range value (e.g. "bytes=0-1023")
+            if_match: Only serve the object if its ETag matches
+            if_unmodified_since: Only serve the object if unmodified since this time
+
+        Returns:
+            Handle on the object body
+        """
+        handle, (size, etag, content_type, mtime_ns) = self._open(object_name, bucket_name)
+        last_modified = datetime.fromtimestamp(mtime_ns // 1_000_000_000, tz=timezone.utc)
+        try:
+            if if_match and if_match != etag:
+                raise PreconditionFailedError()
+            if if_unmodified_since and last_modified > if_unmodified_since:
+                raise PreconditionFailedError()
+
+            start, end, content_range = resolve_byte_range(byte_range, size)
+        except BaseException:
+            handle.close()
+            raise
+
+        return FileStorageObject(
+            body=handle,
+            offset=start,
+            content_length=end - start + 1,
+            etag=etag,
+            content_type=content_type,
+            content_range=content_range,
+            last_modified=last_modified
+        )
+
+    def delete_file(self, object_name: str, bucket_name: str) -> bool:
+        """
+        Delete a file from local storage.
+
+        Args:
+            object_name: Object name to delete
+            bucket_name: Bucket name or did where the file is stored
 
         Returns:
             True if successful, False otherwise
         """
-        raise Exception('Not implemented')
+        try:
+            self._remove(bucket_name, object_name)
+            logger.info(f"Successfully deleted '{object_name}'")
+            return True
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.error(f"Failed to delete file: {e}")
+            return False
 
-    def list_files(self, prefix: str = "") -> list:
+    def delete_files(self, object_names: list[str], bucket_name: str) -> dict[str, Optional[str]]:
         """
-        List files in S3 storage.
+        Delete several files from local storage.
 
         Args:
+            object_names: Object names to delete
+            bucket_name: Bucket name or did where the files are stored
+
+        Returns:
+            Mapping of every object name to an error message, or None if deleted
+        """
+        results: dict[str, Optional[str]] = {}
+        for object_name in object_names:
+            try:
+                self._remove(bucket_name, object_name)
+                results[object_name] = None
+            except (OSError, ValueError, sqlite3.Error) as e:
+                results[object_name] = str(e)
+        return results
+
+    def list_files(self, bucket_name: str, prefix: str = "") -> list:
+        """
+        List files in local storage.
+
+        Args:
+            bucket_name: Bucket name or did where the files are stored
             prefix: Optional prefix to filter files
 
         Returns:
             List of object keys
         """
-        raise Exception('Not implemented')
+        keys = []
+        token = None
+        while True:
+            page, token = self.list_files_page(bucket_name, prefix=prefix, continuation_token=token)
+            keys.extend(page)
+            if token is None:
+                return keys
+
+    def list_files_page(
+            self,
+            bucket_name: str,
+            prefix: str = "",
+            continuation_token: Optional[str] = None,
+            max_keys: int = 1000
+    ) -> tuple[list[str], Optional[str]]:
+        """
+        List one page of object keys.
+
+        Keys come from a range scan of the index primary key, so the cost
+        depends on the page size, not on the number of objects in the bucket.
+
+        Args:
+            bucket_name: Bucket name or did where the files are stored
+            prefix: Optional prefix to filter files
+            continuation_token: Token returned with the previous page, if any
+            max_keys: Maximum number of keys returned
+
+        Returns:
+            Object keys of the page and the token of the next page, or None on the last page
+        """
+        conditions = ["bucket = ?"]
+        params: list = [bucket_name]
+        if prefix:
+            conditions.append("key >= ?")
+            params.append(prefix)
+            upper = _prefix_upper_bound(prefix)
+            if upper is not None:
+                conditions.append("key < ?")
+                params.append(upper)
+        if continuation_token:
+            conditions.append("key > ?")
+            params.append(continuation_token)
+        params.append(max_keys + 1)
+
+        rows = self._db.execute(
+            f"SELECT key FROM objects WHERE {' AND '.join(conditions)} ORDER BY key LIMIT ?",
+            params
+        ).fetchall()
+        keys = [row[0] for row in rows[:max_keys]]
+        next_token = keys[-1] if len(rows) > max_keys else None
+        return keys, next_token
+
+    def sign(
+            self,
+            method: str,
+            bucket_name: str,
+            object_name: str,
+            expires: int,
+            upload_id: Optional[str] = None,
+            part_number: Optional[int] = None
+    ) -> str:
+        """Signature of a presigned request"""
+        message = "\n".join([method, bucket_name, object_name, str(expires), upload_id or "", str(part_number or "")])
+        return hmac.new(self.signing_key, message.encode(), hashlib.sha256).hexdigest()
+
+    def verify_signature(
+            self,
+            method: str,
+            bucket_name: str,
+            object_name: str,
+            expires: int,
+            signature: str,
+            upload_id: Optional[str] = None,
+            part_number: Optional[int] = None
+    ) -> bool:
+        """Check that a presigned request is unexpired and was signed by this service"""
+        if expires < time.time():
+            return False
+        expected = self.sign(method, bucket_name, object_name, expires, upload_id, part_number)
+        return hmac.compare_digest(expected, signature)
+
+    def _presign(self, method: str, bucket_name: str, object_name: str, expiration: int, **extra) -> str:
+        expires = int(time.time()) + expiration
+        params = {**extra, "expires": expires}
+        params["signature"] = self.sign(
+            method, bucket_name, object_name, expires, extra.get("uploadId"), extra.get("partNumber")
+        )
+        return f"{self.base_url}/{bucket_name}/{quote(object_name)}?{urlencode(params)}"
 
     def get_presigned_url(
             self,
+            bucket_name: str,
             object_name: str,
             expiration: int = 3600
     ) -> Optional[str]:
@@ -142,12 +670,79 @@ class LocalStorageActions(StorageAction):
         Generate a presigned URL for downloading a file.
 
         Args:
-            object_name: S3 object name
+            bucket_name: Bucket name or did where the file is stored
+            object_name: Object name
             expiration: URL expiration time in seconds (default: 1 hour)
 
         Returns:
             Presigned URL or None if failed
         """
-        raise Exception('Not implemented')
+        if self.url_cache is None:
+            return self._presign("GET", bucket_name, object_name, expiration)
+        return self.url_cache.get(
+            (bucket_name, object_name),
+            expiration,
+            lambda: self._presign("GET", bucket_name, object_name, expiration)
+        )
+
+    def object_exists(self, bucket_name: str, object_name: str) -> bool:
+        """
+        Check whether an object is stored.
 
+        Args:
+            bucket_name: Bucket name or did where the file is stored
+            object_name: Object name
 
+        Returns:
+            True if the object exists, False otherwise
+        """
+        row = self._db.execute(
+            "SELECT 1 FROM objects WHERE bucket = ? AND key = ?",
+            (bucket_name, object_name)
+        ).fetchone()
+        return row is not None
+
+    def get_presigned_upload_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        """
+        Generate a presigned URL for uploading a file with a single PUT.
+
+        Args:
+            bucket_name: Bucket name or did where the file will be stored
+            object_name: Object name
+            expiration: URL expiration time in seconds (default: 1 hour)
+
+        Returns:
+            Presigned URL or None if failed
+        """
+        return self._presign("PUT", bucket_name, object_name, expiration)
+
+    def get_presigned_part_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            upload_id: str,
+            part_number: int,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        """
+        Generate a presigned URL for uploading one part of a multipart upload.
+
+        Args:
+            bucket_name: Bucket name or did where the file will be stored
+            object_name: Object name
+            upload_id: Id returned by create_multipart_upload
+            part_number: 1-based position of the part
+            expiration: URL expiration time in seconds (default: 1 hour)
+
+        Returns:
+            Presigned URL or None if failed
+        """
+        return self._presign(
+            "PUT", bucket_name, object_name, expiration,
+            uploadId=upload_id, partNumber=part_number
+        )
@@ -1,11 +1,15 @@
 import os
 import logging
 import boto3
+from datetime import datetime
 from typing import Optional, BinaryIO
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from config.settings import settings
-from src.application.types.storage import StorageAction
+from src.application.types.storage import StorageAction, StorageObject
+from src.core.cache import PresignedUrlCache
+from src.core.exceptions import PreconditionFailedError, RangeNotSatisfiableError
 
 logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
@@ -19,27 +23,41 @@ class S3StorageActions(StorageAction):
             endpoint_url: Optional[str] = None,
             access_key: Optional[str] = None,
             secret_key: Optional[str] = None,
-            region: str = "us-east-1"
+            region: str = "us-east-1",
+            client_config: Optional[Config] = None,
+            url_cache: Optional[PresignedUrlCache] = None
     ):
         """
         Initialize S3 storage service.
 
+        The underlying boto3 client is thread-safe and owns its own connection
+        pool, so a single instance is meant to be shared by every request.
+
         Args:
             endpoint_url: S3-compatible endpoint (e.g., MinIO, DigitalOcean Spaces)
             access_key: Access key ID
             secret_key: Secret access key
-            bucket_name: Name of the bucket to use
             region: AWS region
+            client_config: Optional botocore config (pool size, retries, timeouts)
+            url_cache: Cache reusing presigned download URLs
         """
 
-        # Initialize S3 client
-        self.s3_client = boto3.client(
+        # Sessions are not thread-safe, clients are: build the client from a
+        # private session so concurrent registries never share loader state
+        session = boto3.session.Session()
+        self.s3_client = session.client(
             's3',
-            endpoint_url=endpoint_url,
+            endpoint_url=endpoint_url or None,
             aws_access_key_id=access_key or os.getenv('AWS_ACCESS_KEY_ID'),
             aws_secret_access_key=secret_key or os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=region
+            region_name=region,
+            config=client_config
         )
+        self.url_cache = url_cache
+
+    def close(self):
+        """Release the pooled HTTP connections held by the client."""
+        self.s3_client.close()
 
     def create_bucket(self, bucket_name: str, acl: str = 'private') -> bool:
         """
@@ -109,6 +127,111 @@ class S3StorageActions(StorageAction):
             logger.error(f"Failed to upload file object: {e}")
             return False
 
+    def create_multipart_upload(self, object_name: str, bucket_name: str) -> str:
+        """
+        Start a multipart upload.
+
+        Args:
+            object_name: S3 object name
+            bucket_name: Bucket name or did where the file will be stored
+
+        Returns:
+            The upload id identifying the multipart upload
+        """
+        try:
+            response = self.s3_client.create_multipart_upload(Bucket=bucket_name, Key=object_name)
+            logger.info(f"Started multipart upload for '{object_name}'")
+            return response['UploadId']
+        except ClientError as e:
+            logger.error(f"Failed to start multipart upload: {e}")
+            raise
+
+    def upload_part(
+            self,
+            object_name: str,
+            bucket_name: str,
+            upload_id: str,
+            part_number: int,
+            data: bytes
+    ) -> str:
+        """
+        Upload one part of a multipart upload.
+
+        Args:
+            object_name: S3 object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
+            part_number: 1-based position of the part
+            data: Part content
+
+        Returns:
+            The ETag of the stored part
+        """
+        try:
+            response = self.s3_client.upload_part(
+                Bucket=bucket_name,
+                Key=object_name,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=data
+            )
+            return response['ETag']
+        except ClientError as e:
+            logger.error(f"Failed to upload part {part_number} of '{object_name}': {e}")
+            raise
+
+    def complete_multipart_upload(
+            self,
+            object_name: str,
+            bucket_name: str,
+            upload_id: str,
+            parts: list[dict]
+    ) -> bool:
+        """
+        Assemble the uploaded parts into the final object.
+
+        Args:
+            object_name: S3 object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
+            parts: [{"PartNumber": n, "ETag": etag}, ...] in ascending order
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.s3_client.complete_multipart_upload(
+                Bucket=bucket_name,
+                Key=object_name,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+            logger.info(f"Completed multipart upload of '{object_name}' with {len(parts)} parts")
+            return True
+        except ClientError as e:
+            logger.error(f"Failed to complete multipart upload: {e}")
+            return False
+
+    def abort_multipart_upload(self, object_name: str, bucket_name: str, upload_id: str) -> bool:
+        """
+        Abort a multipart upload and discard its parts.
+
+        Args:
+            object_name: S3 object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.s3_client.abort_multipart_upload(Bucket=bucket_name, Key=object_name, UploadId=upload_id)
+            logger.info(f"Aborted multipart upload of '{object_name}'")
+            return True
+        except ClientError as e:
+            logger.error(f"Failed to abort multipart upload: {e}")
+            return False
+
     def download_file(self, object_name: str, bucket_name: str, file_path: str) -> bool:
         """
         Download a file from S3 storage.
@@ -128,6 +251,56 @@ class S3StorageActions(StorageAction):
             logger.error(f"Failed to download file: {e}")
             return False
 
+    def get_object(
+            self,
+            object_name: str,
+            bucket_name: str,
+            byte_range: Optional[str] = None,
+            if_match: Optional[str] = None,
+            if_unmodified_since: Optional[datetime] = None
+    ) -> StorageObject:
+        """
+        Open an object for streaming, optionally restricted to a byte range.
+
+        Args:
+            object_name: S3 object name
+            bucket_name: Bucket name or did where the file is stored
+            byte_range: HTTP Range value (e.g. "bytes=0-1023")
+            if_match: Only serve the object if its ETag matches
+            if_unmodified_since: Only serve the object if unmodified since this time
+
+        Returns:
+            Handle on the object body
+        """
+        params: dict = {'Bucket': bucket_name, 'Key': object_name}
+        if byte_range:
+            params['Range'] = byte_range
+        if if_match:
+            params['IfMatch'] = if_match
+        if if_unmodified_since:
+            params['IfUnmodifiedSince'] = if_unmodified_since
+
+        try:
+            response = self.s3_client.get_object(**params)
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code in ('NoSuchKey', '404'):
+                raise FileNotFoundError(2, "No such file or directory", object_name)
+            if code == 'InvalidRange':
+                raise RangeNotSatisfiableError()
+            if code == 'PreconditionFailed':
+                raise PreconditionFailedError()
+            raise
+
+        return StorageObject(
+            body=response['Body'],
+            content_length=response['ContentLength'],
+            etag=response.get('ETag'),
+            content_type=response.get('ContentType'),
+            content_range=response.get('ContentRange'),
+            last_modified=response.get('LastModified')
+        )
+
     def delete_file(self, object_name: str, bucket_name: str) -> bool:
         """
         Delete a file from S3 storage.
@@ -147,9 +320,38 @@ class S3StorageActions(StorageAction):
             logger.error(f"Failed to delete file: {e}")
             return False
 
+    def delete_files(self, object_names: list[str], bucket_name: str) -> dict[str, Optional[str]]:
+        """
+        Delete up to 1000 files from S3 storage in a single request.
+
+        Args:
+            object_names: S3 object names to delete
+            bucket_name: Bucket name or did where the files are stored
+
+        Returns:
+            Mapping of every object name to an error message, or None if deleted
+        """
+        results: dict[str, Optional[str]] = {name: None for name in object_names}
+        try:
+            response = self.s3_client.delete_objects(
+                Bucket=bucket_name,
+                Delete={
+                    'Objects': [{'Key': name} for name in object_names],
+                    'Quiet': True
+                }
+            )
+        except ClientError as e:
+            logger.error(f"Failed to delete files: {e}")
+            return {name: str(e) for name in object_names}
+
+        for error in response.get('Errors', []):
+            results[error['Key']] = error.get('Message') or error.get('Code')
+        logger.info(f"Deleted {len(object_names) - len(response.get('Errors', []))} objects")
+        return results
+
     def list_files(self, bucket_name: str, prefix: str = "", ) -> list:
         """
-        List files in S3 storage.
+        List files in S3 storage, following continuation tokens past 1000 keys.
 
         Args:
             bucket_name: Bucket name or did where the file will be stored
@@ -158,18 +360,49 @@ class S3StorageActions(StorageAction):
         Returns:
             List of object keys
         """
+        keys = []
+        token = None
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=bucket_name,
-                Prefix=prefix
-            )
-
-            if 'Contents' in response:
-                return [obj['Key'] for obj in response['Contents']]
+            while True:
+                page, token = self.list_files_page(bucket_name, prefix=prefix, continuation_token=token)
+                keys.extend(page)
+                if token is None:
+                    return keys
+        except ClientError:
             return []
+
+    def list_files_page(
+            self,
+            bucket_name: str,
+            prefix: str = "",
+            continuation_token: Optional[str] = None,
+            max_keys: int = 1000
+    ) -> tuple[list[str], Optional[str]]:
+        """
+        List one page of object keys.
+
+        Args:
+            bucket_name: Bucket name or did where the files are stored
+            prefix: Optional prefix to filter files
+            continuation_token: Token returned with the previous page, if any
+            max_keys: Maximum number of keys returned
+
+        Returns:
+            Object keys of the page and the token of the next page, or None on the last page
+        """
+        params = {'Bucket': bucket_name, 'Prefix': prefix, 'MaxKeys': max_keys}
+        if continuation_token:
+            params['ContinuationToken'] = continuation_token
+
+        try:
+            response = self.s3_client.list_objects_v2(**params)
         except ClientError as e:
             logger.error(f"Failed to list files: {e}")
-            return []
+            raise
+
+        keys = [obj['Key'] for obj in response.get('Contents', [])]
+        next_token = response.get('NextContinuationToken') if response.get('IsTruncated') else None
+        return keys, next_token
 
     def get_presigned_url(
             self,
@@ -188,6 +421,15 @@ class S3StorageActions(StorageAction):
         Returns:
             Presigned URL or None if failed
         """
+        if self.url_cache is None:
+            return self._sign_download(bucket_name, object_name, expiration)
+        return self.url_cache.get(
+            (bucket_name, object_name),
+            expiration,
+            lambda: self._sign_download(bucket_name, object_name, expiration)
+        )
+
+    def _sign_download(self, bucket_name: str, object_name: str, expiration: int) -> Optional[str]:
         try:
             url = self.s3_client.generate_presigned_url(
                 'get_object',
@@ -199,3 +441,85 @@ class S3StorageActions(StorageAction):
         except ClientError as e:
             logger.error(f"Failed to generate presigned URL: {e}")
             return None
+
+    def object_exists(self, bucket_name: str, object_name: str) -> bool:
+        """
+        Check whether an object is stored.
+
+        Args:
+            bucket_name: Bucket name or did where the file is stored
+            object_name: S3 object name
+
+        Returns:
+            True if the object exists, False otherwise
+        """
+        try:
+            self.s3_client.head_object(Bucket=bucket_name, Key=object_name)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def get_presigned_upload_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        """
+        Generate a presigned URL for uploading a file with a single PUT.
+
+        Args:
+            bucket_name: Bucket name or did where the file will be stored
+            object_name: S3 object name
+            expiration: URL expiration time in seconds (default: 1 hour)
+
+        Returns:
+            Presigned URL or None if failed
+        """
+        try:
+            return self.s3_client.generate_presigned_url(
+                'put_object',
+                Params={'Bucket': bucket_name, 'Key': object_name},
+                ExpiresIn=expiration
+            )
+        except ClientError as e:
+            logger.error(f"Failed to generate presigned upload URL: {e}")
+            return None
+
+    def get_presigned_part_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            upload_id: str,
+            part_number: int,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        """
+        Generate a presigned URL for uploading one part of a multipart upload.
+
+        Args:
+            bucket_name: Bucket name or did where the file will be stored
+            object_name: S3 object name
+            upload_id: Id returned by create_multipart_upload
+            part_number: 1-based position of the part
+            expiration: URL expiration time in seconds (default: 1 hour)
+
+        Returns:
+            Presigned URL or None if failed
+        """
+        try:
+            return self.s3_client.generate_presigned_url(
+                'upload_part',
+                Params={
+                    'Bucket': bucket_name,
+                    'Key': object_name,
+                    'UploadId': upload_id,
+                    'PartNumber': part_number
+                },
+                ExpiresIn=expiration
+            )
+        except ClientError as e:
+            logger.error(f"Failed to generate presigned part URL: {e}")
+            return None
@@ -1,9 +1,85 @@
+import os
 from abc import ABC, abstractmethod
-from typing import Optional, BinaryIO
+from datetime import datetime
+from typing import Optional, BinaryIO, Iterator
+
+
+class StorageObject:
+    """Open handle on an object body streamed from storage."""
+
+    def __init__(
+            self,
+            body: BinaryIO,
+            content_length: int,
+            etag: Optional[str] = None,
+            content_type: Optional[str] = None,
+            content_range: Optional[str] = None,
+            last_modified: Optional[datetime] = None
+    ):
+        """
+        Args:
+            body: File-like object positioned at the first byte to serve
+            content_length: Number of bytes that will be read from body
+            etag: Entity tag reported by the backend (quoted)
+            content_type: MIME type reported by the backend
+            content_range: Content-Range value when only part of the object is served
+            last_modified: Last modification time reported by the backend
+        """
+        self.body = body
+        self.content_length = content_length
+        self.etag = etag
+        self.content_type = content_type
+        self.content_range = content_range
+        self.last_modified = last_modified
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        """Yield the body in chunks of at most chunk_size bytes, closing it at the end."""
+        try:
+            while True:
+                chunk = self.body.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        self.body.close()
+
+
+class FileStorageObject(StorageObject):
+    """
+    StorageObject whose body is an OS-level file served from ``offset``.
+
+    Chunks are read with pread, leaving the file position untouched.
+    """
+
+    def __init__(self, body: BinaryIO, offset: int, content_length: int, **kwargs):
+        super().__init__(body, content_length, **kwargs)
+        self.offset = offset
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        """Yield the served slice of the file in chunks of at most chunk_size bytes, closing it at the end."""
+        fd = self.body.fileno()
+        position = self.offset
+        remaining = self.content_length
+        try:
+            while remaining > 0:
+                chunk = os.pread(fd, min(chunk_size, remaining), position)
+                if not chunk:
+                    break
+                position += len(chunk)
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            self.close()
 
 
 class StorageAction(ABC):
 
+    # Whether clients can be handed presigned URLs to upload straight to storage
+    supports_presigned_uploads: bool = True
+
     @abstractmethod
     def create_bucket(self, bucket_name: str, acl: str = 'private') -> bool:
         """
@@ -40,6 +116,81 @@ class StorageAction(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_multipart_upload(self, object_name: str, bucket_name: str) -> str:
+        """
+        Start a multipart upload.
+
+        Args:
+            object_name: S3 object name
+            bucket_name: Bucket name or did where the file will be stored
+
+        Returns:
+            The upload id identifying the multipart upload
+        """
+        pass
+
+    @abstractmethod
+    def upload_part(
+            self,
+            object_name: str,
+            bucket_name: str,
+            upload_id: str,
+            part_number: int,
+            data: bytes
+    ) -> str:
+        """
+        Upload one part of a multipart upload.
+
+        Args:
+            object_name: S3 object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
+            part_number: 1-based position of the part
+            data: Part content
+
+        Returns:
+            The ETag of the stored part
+        """
+        pass
+
+    @abstractmethod
+    def complete_multipart_upload(
+            self,
+            object_name: str,
+            bucket_name: str,
+            upload_id: str,
+            parts: list[dict]
+    ) -> bool:
+        """
+        Assemble the uploaded parts into the final object.
+
+        Args:
+            object_name: S3 object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
+            parts: [{"PartNumber": n, "ETag": etag}, ...] in ascending order
+
+        Returns:
+            True if successful, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    def abort_multipart_upload(self, object_name: str, bucket_name: str, upload_id: str) -> bool:
+        """
+        Abort a multipart upload and discard its parts.
+
+        Args:
+            object_name: S3 object name
+            bucket_name: Bucket name or did where the file will be stored
+            upload_id: Id returned by create_multipart_upload
+
+        Returns:
+            True if successful, False otherwise
+        """
+        pass
+
     @abstractmethod
     def download_file(self, object_name: str, bucket_name: str, file_path: str) -> bool:
         """
@@ -54,6 +205,35 @@ class StorageAction(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_object(
+            self,
+            object_name: str,
+            bucket_name: str,
+            byte_range: Optional[str] = None,
+            if_match: Optional[str] = None,
+            if_unmodified_since: Optional[datetime] = None
+    ) -> StorageObject:
+        """
+        Open an object for streaming, optionally restricted to a byte range.
+
+        Args:
+            object_name: S3 object name
+            bucket_name: Bucket name or did where the file is stored
+            byte_range: HTTP Range value (e.g. "bytes=0-1023")
+            if_match: Only serve the object if its ETag matches
+            if_unmodified_since: Only serve the object if unmodified since this time
+
+        Returns:
+            Handle on the object body
+
+        Raises:
+            FileNotFoundError: if the object does not exist
+            RangeNotSatisfiableError: if the range lies outside the object
+            PreconditionFailedError: if a precondition does not hold
+        """
+        pass
+
     @abstractmethod
     def delete_file(self, object_name: str, bucket_name: str) -> bool:
         """
@@ -67,6 +247,20 @@ class StorageAction(ABC):
         """
         pass
 
+    @abstractmethod
+    def delete_files(self, object_names: list[str], bucket_name: str) -> dict[str, Optional[str]]:
+        """
+        Delete up to 1000 files from S3 storage in a single request.
+
+        Args:
+            object_names: S3 object names to delete
+            bucket_name: Bucket name or did where the files are stored
+
+        Returns:
+            Mapping of every object name to an error message, or None if deleted
+        """
+        pass
+
     @abstractmethod
     def list_files(self, bucket_name: str, prefix: str = "") -> list:
         """
@@ -81,6 +275,28 @@ class StorageAction(ABC):
         """
         pass
 
+    @abstractmethod
+    def list_files_page(
+            self,
+            bucket_name: str,
+            prefix: str = "",
+            continuation_token: Optional[str] = None,
+            max_keys: int = 1000
+    ) -> tuple[list[str], Optional[str]]:
+        """
+        List one page of object keys.
+
+        Args:
+            bucket_name: Bucket name or did where the files are stored
+            prefix: Optional prefix to filter files
+            continuation_token: Token returned with the previous page, if any
+            max_keys: Maximum number of keys returned
+
+        Returns:
+            Object keys of the page and the token of the next page, or None on the last page
+        """
+        pass
+
     @abstractmethod
     def get_presigned_url(
             self,
@@ -100,3 +316,77 @@ class StorageAction(ABC):
             Presigned URL or None if failed
         """
         pass
+
+    @abstractmethod
+    def object_exists(self, bucket_name: str, object_name: str) -> bool:
+        """
+        Check whether an object is stored.
+
+        Args:
+            bucket_name: Bucket name or did where the file is stored
+            object_name: S3 object name
+
+        Returns:
+            True if the object exists, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    def get_presigned_upload_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        """
+        Generate a presigned URL for uploading a file with a single PUT.
+
+        Args:
+            bucket_name: Bucket name or did where the file will be stored
+            object_name: S3 object name
+            expiration: URL expiration time in seconds (default: 1 hour)
+
+        Returns:
+            Presigned URL or None if failed
+        """
+        pass
+
+    @abstractmethod
+    def get_presigned_part_url(
+            self,
+            bucket_name: str,
+            object_name: str,
+            upload_id: str,
+            part_number: int,
+            expiration: int = 3600
+    ) -> Optional[str]:
+        """
+        Generate a presigned URL for uploading one part of a multipart upload.
+
+        Args:
+            bucket_name: Bucket name or did where the file will be stored
+            object_name: S3 object name
+            upload_id: Id returned by create_multipart_upload
+            part_number: 1-based position of the part
+            expiration: URL expiration time in seconds (default: 1 hour)
+
+        Returns:
+            Presigned URL or None if failed
+        """
+        pass
+
+    def invalidate(self, bucket_name: str, object_name: str):
+        """
+        Forget anything cached about an object written without going through the backend.
+
+        Args:
+            bucket_name: Bucket name or did where the file is stored
+            object_name: S3 object name
+        """
+        pass
+
+    def close(self):
+        """
+        Release any resources (connection pools, file handles) held by the backend.
+        """
+        pass
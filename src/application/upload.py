@@ -0,0 +1,148 @@
+import io
+import asyncio
+import logging
+from typing import AsyncIterator, Optional
+
+from config.settings import settings
+from src.application.types.storage import StorageAction
+from src.core.exceptions import InternalServerError
+from src.core.executor import StorageExecutor
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+
+class MultipartUploader:
+    """
+    Feed an async byte stream into a multipart upload, part by part.
+
+    At most ``concurrency`` parts are in flight while the next one is being
+    filled, so memory stays around ``part_size * (concurrency + 1)`` whatever
+    the object size. Bodies smaller than one part skip multipart and are sent
+    with a single upload_fileobj call.
+    """
+
+    def __init__(
+            self,
+            storage: StorageAction,
+            executor: StorageExecutor,
+            bucket_name: str,
+            object_name: str,
+            part_size: int = settings.S3_MULTIPART_PART_SIZE,
+            concurrency: int = settings.S3_MULTIPART_CONCURRENCY
+    ):
+        self.storage = storage
+        self.executor = executor
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.part_size = part_size
+        self.concurrency = concurrency
+
+        self.upload_id: Optional[str] = None
+        self.parts: list[dict] = []
+        self.size = 0
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks: list[asyncio.Task] = []
+
+    async def upload(self, stream: AsyncIterator[bytes]) -> int:
+        """
+        Consume the stream and store it as a single object.
+
+        The multipart upload is aborted if the stream fails (e.g. the client
+        disconnects) or any part is rejected, so no orphaned parts are left.
+
+        Returns:
+            Number of bytes stored
+
+        Raises:
+            InternalServerError: if the storage backend did not store the object
+        """
+        buffer = bytearray()
+        try:
+            async for chunk in stream:
+                buffer += chunk
+                self.size += len(chunk)
+                while len(buffer) >= self.part_size:
+                    part = bytes(buffer[:self.part_size])
+                    del buffer[:self.part_size]
+                    await self._submit(part)
+
+            if self.upload_id is None:
+                stored = await self.executor.run(
+                    self.storage.upload_fileobj,
+                    file_obj=io.BytesIO(bytes(buffer)),
+                    object_name=self.object_name,
+                    bucket_name=self.bucket_name
+                )
+                if not stored:
+                    raise InternalServerError(f"Upload of {self.object_name} could not be stored")
+                return self.size
+
+            if buffer:
+                await self._submit(bytes(buffer))
+
+            await asyncio.gather(*self._tasks)
+            self.parts.sort(key=lambda part: part['PartNumber'])
+
+            completed = await self.executor.run(
+                self.storage.complete_multipart_upload,
+                object_name=self.object_name,
+                bucket_name=self.bucket_name,
+                upload_id=self.upload_id,
+                parts=self.parts
+            )
+            if not completed:
+                raise InternalServerError(f"Multipart upload of {self.object_name} could not be completed")
+            return self.size
+        except BaseException:
+            await asyncio.shield(self._abort())
+            raise
+
+    async def _submit(self, data: bytes):
+        if self.upload_id is None:
+            self.upload_id = await self.executor.run(
+                self.storage.create_multipart_upload,
+                object_name=self.object_name,
+                bucket_name=self.bucket_name
+            )
+
+        # Stop reading the request body while every slot is busy
+        await self._slots.acquire()
+        for task in self._tasks:
+            error = task.exception() if task.done() else None
+            if error is not None:
+                self._slots.release()
+                raise error
+        part_number = len(self._tasks) + 1
+        self._tasks.append(asyncio.create_task(self._upload_part(part_number, data)))
+
+    async def _upload_part(self, part_number: int, data: bytes):
+        try:
+            etag = await self.executor.run(
+                self.storage.upload_part,
+                object_name=self.object_name,
+                bucket_name=self.bucket_name,
+                upload_id=self.upload_id,
+                part_number=part_number,
+                data=data
+            )
+            self.parts.append({'PartNumber': part_number, 'ETag': etag})
+        finally:
+            self._slots.release()
+
+    async def _abort(self):
+        # A part already handed to a worker thread cannot be stopped: wait for the
+        # in-flight parts, at most `concurrency` of them, so none lands after the abort
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self.upload_id is not None:
+            logger.warning(f"Aborting multipart upload of {self.object_name}")
+            try:
+                await self.executor.run(
+                    self.storage.abort_multipart_upload,
+                    object_name=self.object_name,
+                    bucket_name=self.bucket_name,
+                    upload_id=self.upload_id
+                )
+            except Exception as e:
+                logger.error(f"Failed to abort multipart upload of {self.object_name}: {e}")
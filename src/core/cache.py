@@ -0,0 +1,120 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after a time to live"""
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: Optional[float] = None):
+        """
+        Args:
+            max_size: Maximum number of entries before the least recently used is evicted
+            ttl: Lifetime in seconds of cached values
+            negative_ttl: Lifetime in seconds of cached None values (defaults to ttl)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Cache a value; None values use the negative time to live unless ttl is given"""
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Snapshot of cache usage for metrics"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class PresignedUrlCache:
+    """
+    Presigned urls reused while enough of their lifetime is left.
+
+    A url signed for ``expiration`` seconds is handed out again for
+    ``(1 - min_remaining) * expiration`` seconds, so every url returned is
+    still valid for at least ``min_remaining`` of its lifetime.
+    """
+
+    def __init__(self, max_size: int, min_remaining: float):
+        """
+        Args:
+            max_size: Maximum number of urls kept
+            min_remaining: Fraction of its lifetime a url must have left to be reused
+        """
+        self.min_remaining = min_remaining
+        self._urls = TTLCache(max_size=max_size, ttl=0)
+        self._lock = threading.Lock()
+        self.signatures = 0
+
+    def get(self, key: Hashable, expiration: int, sign: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Return a reusable url for a key, signing a new one with sign if there is none.
+
+        Args:
+            key: What the url gives access to, e.g. (bucket, object)
+            expiration: Lifetime in seconds of the urls sign makes
+            sign: Builds a new url, or returns None if it cannot
+        """
+        cached = self._urls.get((key, expiration))
+        if cached is not MISSING:
+            return cached
+
+        url = sign()
+        with self._lock:
+            self.signatures += 1
+        if url is not None:
+            self._urls.set((key, expiration), url, ttl=expiration * (1 - self.min_remaining))
+        return url
+
+    def stats(self) -> dict:
+        """Snapshot of url reuse for metrics"""
+        stats = self._urls.stats()
+        with self._lock:
+            stats["signatures"] = self.signatures
+        return stats
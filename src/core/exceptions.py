@@ -51,6 +51,20 @@ class ConflictError(BaseAPIException):
         super().__init__(message, status_code=409)
 
 
+class PreconditionFailedError(BaseAPIException):
+    """Precondition failed error exception"""
+
+    def __init__(self, message: str = "Precondition failed"):
+        super().__init__(message, status_code=412)
+
+
+class RangeNotSatisfiableError(BaseAPIException):
+    """Range not satisfiable error exception"""
+
+    def __init__(self, message: str = "Requested range not satisfiable"):
+        super().__init__(message, status_code=416)
+
+
 class InternalServerError(BaseAPIException):
     """Internal server error exception"""
 
@@ -58,6 +72,13 @@ class InternalServerError(BaseAPIException):
         super().__init__(message, status_code=500)
 
 
+class ServiceUnavailableError(BaseAPIException):
+    """Service unavailable error exception"""
+
+    def __init__(self, message: str = "Service unavailable"):
+        super().__init__(message, status_code=503)
+
+
 class BucketNotFound(BaseAPIException):
     """Bucket not found exception"""
 
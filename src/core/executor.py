@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from src.core.exceptions import ServiceUnavailableError
+
+
+class StorageExecutor:
+    """
+    Bounded thread pool running blocking storage calls off the event loop.
+
+    Storage calls, upload parts and the chunks of streamed downloads all run
+    here. Work the framework itself sends to its own thread pool (spooling
+    multipart form uploads, sync dependencies, background tasks) does not.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the pool and await its result.
+
+        Raises:
+            ServiceUnavailableError: when every worker is busy and the queue is full
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ServiceUnavailableError("Storage backend is saturated, retry later")
+            self._pending += 1
+        return await self._dispatch(fn, args, kwargs)
+
+    async def iterate(self, iterator: Iterator[Any]) -> AsyncIterator[Any]:
+        """
+        Pull the items of a blocking iterator on the pool, one at a time.
+
+        Meant for response bodies whose first call went through run: steps
+        are never rejected, so a response already started is not cut short,
+        but each one counts against the bound for new calls.
+        """
+        end = object()
+        while True:
+            with self._lock:
+                self._pending += 1
+            item = await self._dispatch(next, (iterator, end), {})
+            if item is end:
+                return
+            yield item
+
+    async def _dispatch(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        future = self._pool.submit(self._call, fn, args, kwargs)
+        # Release the slot when the work is really done, not when the awaiting
+        # request goes away, so cancelled requests still count against the bound
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _call(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def stats(self) -> dict:
+        """Snapshot of pool usage for metrics"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
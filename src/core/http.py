@@ -0,0 +1,142 @@
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Union
+from urllib.parse import quote
+
+from src.core.exceptions import RangeNotSatisfiableError
+
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_byte_range(value: Optional[str]) -> Optional[str]:
+    """
+    Normalise a Range header to a single byte range.
+
+    Multiple ranges and malformed values are ignored, which per RFC 9110 means
+    serving the full representation.
+    """
+    if not value:
+        return None
+
+    match = _BYTE_RANGE.match(value.replace(" ", ""))
+    if match is None:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if start and end and int(start) > int(end):
+        return None
+
+    return f"bytes={start}-{end}"
+
+
+def resolve_byte_range(byte_range: Optional[str], size: int) -> tuple[int, int, Optional[str]]:
+    """
+    Resolve a normalised byte range against an object size.
+
+    Returns:
+        First and last byte served, and the Content-Range value if only part of the object is served
+
+    Raises:
+        RangeNotSatisfiableError: if the range starts past the end of the object
+    """
+    if not byte_range:
+        return 0, size - 1, None
+
+    first, last = byte_range.removeprefix("bytes=").split("-")
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiableError()
+    return start, end, f"bytes {start}-{end}/{size}"
+
+
+def parse_if_range(value: Optional[str]) -> Optional[Union[str, datetime]]:
+    """
+    Parse an If-Range header into an entity tag or an HTTP date.
+
+    Weak entity tags can never satisfy If-Range, so they yield None like an
+    unparseable value does.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.startswith('"'):
+        return value
+    if value.startswith("W/"):
+        return None
+
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an HTTP date header, None if it is missing or malformed"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value.strip())
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def format_http_date(value: datetime) -> str:
+    """Format a time as an HTTP date"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an entity tag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match: "W/"
+    prefixes are ignored on both sides, and "*" matches any tag.
+    """
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def is_not_modified(
+        if_none_match: Optional[str],
+        if_modified_since: Optional[str],
+        etag: Optional[str],
+        last_modified: Optional[datetime]
+) -> bool:
+    """
+    Evaluate the conditional headers of a GET against the current validators.
+
+    If-Modified-Since is only looked at when If-None-Match is absent, as RFC
+    9110 requires; HTTP dates have a one second resolution, so sub-second
+    modifications compare as the second they happened in.
+
+    Returns:
+        True if the client copy is current and a 304 can be sent
+    """
+    if if_none_match:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    since = parse_http_date(if_modified_since)
+    if since is None or last_modified is None:
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+
+def content_disposition(file_name: str) -> str:
+    """Build an attachment Content-Disposition header for a file name"""
+    quoted = quote(file_name)
+    if quoted != file_name:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{file_name}"'
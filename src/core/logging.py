@@ -76,4 +76,4 @@ def setup_logging():
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance"""
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
@@ -0,0 +1,31 @@
+import json
+import base64
+from typing import Optional
+
+from src.core.exceptions import ValidationError
+
+
+def encode_cursor(*key: str) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor"""
+    raw = json.dumps({"k": list(key)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], parts: int = 1) -> Optional[tuple[str, ...]]:
+    """Decode a cursor produced by encode_cursor for a sort key of ``parts`` values"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)["k"]
+    except (ValueError, KeyError, TypeError):
+        raise ValidationError("Invalid pagination cursor")
+    if not isinstance(key, list) or len(key) != parts or not all(isinstance(part, str) for part in key):
+        raise ValidationError("Invalid pagination cursor")
+    return tuple(key)
+
+
+def like_prefix(prefix: str) -> str:
+    """Build a LIKE pattern matching values starting with prefix"""
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
@@ -0,0 +1,38 @@
+from typing import Mapping, Optional
+
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
+
+from src.application.types.storage import StorageObject
+from src.core.executor import StorageExecutor
+
+
+class StorageObjectResponse(StreamingResponse):
+    """
+    Stream a StorageObject to the client in chunks.
+
+    Chunks are read on the storage executor, like the call that opened the
+    object, rather than on the framework's own thread pool. Local objects
+    are read with pread from their open file. There is no sendfile path: an
+    ASGI app never sees the socket, and uvicorn offers no zero-copy send
+    extension to hand the file to.
+    """
+
+    def __init__(
+            self,
+            stored: StorageObject,
+            executor: StorageExecutor,
+            chunk_size: int,
+            status_code: int = 200,
+            headers: Optional[Mapping[str, str]] = None,
+            media_type: Optional[str] = None,
+            background: Optional[BackgroundTask] = None
+    ):
+        super().__init__(
+            executor.iterate(stored.iter_chunks(chunk_size)),
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            background=background
+        )
+        self.stored = stored
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait for it and get the same result or exception. Meant for the
+    blocking code run on executor threads.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.issued = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn, or wait for the call already running for key, and return its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.issued += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        """Snapshot of coalescing for metrics"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "issued": self.issued,
+                "coalesced": self.coalesced,
+            }
+
+
+class AsyncSingleFlight:
+    """
+    Coalesce concurrent coroutine calls for the same key into one.
+
+    The first caller for a key starts the call as a task; callers arriving
+    before it completes await the same task. A caller that goes away does
+    not cancel the call for the others.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.issued = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn, or join the call already running for key, and return its result"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+            self.issued += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieved here too, in case every caller went away before the end
+        if not task.cancelled():
+            task.exception()
+
+    def forget(self, key: Hashable):
+        """Let the next call for key start afresh instead of joining the running one"""
+        self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        """Snapshot of coalescing for metrics"""
+        return {
+            "in_flight": len(self._calls),
+            "issued": self.issued,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,253 @@
+import logging
+import uuid
+import httpx
+from typing import Optional
+
+from datetime import datetime, timezone
+from config.settings import settings
+
+from src.schema.requests.storage import Bucket as BaseBucket, StoredBucket, FileObject
+from src.schema.response.storage import BucketSummary
+from src.database import queries
+from src.core.cache import TTLCache
+from src.core.singleflight import AsyncSingleFlight
+from src.database.batching import GraphQLBatcher
+from src.database.engine import MetadataEngine
+from src.core.pagination import like_prefix
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def create_graphql_client() -> httpx.AsyncClient:
+    """
+    Build the long-lived HTTP client shared by every AsyncDatabaseEngine.
+
+    The client owns the connection pool to Hasura, so it is created once per
+    process (see the application lifespan) and closed on shutdown.
+    """
+    return httpx.AsyncClient(
+        http2=settings.GRAPHQL_HTTP2,
+        timeout=httpx.Timeout(
+            settings.GRAPHQL_READ_TIMEOUT,
+            connect=settings.GRAPHQL_CONNECT_TIMEOUT,
+            pool=settings.GRAPHQL_POOL_TIMEOUT
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.GRAPHQL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.GRAPHQL_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.GRAPHQL_KEEPALIVE_EXPIRY
+        )
+    )
+
+
+class AsyncDatabaseEngine(MetadataEngine):
+    """Non-blocking variant of DatabaseEngine running on a shared pooled client."""
+
+    def __init__(
+            self,
+            client: httpx.AsyncClient,
+            token,
+            bucket_cache: Optional[TTLCache] = None,
+            flights: Optional[AsyncSingleFlight] = None,
+            batcher: Optional[GraphQLBatcher] = None,
+            admin_secret: Optional[str] = None
+    ):
+        super().__init__(bucket_cache=bucket_cache, flights=flights)
+        self.batcher = batcher
+
+        self.graphql_endpoint = f"{settings.GRAPHQL_HOST}/{settings.GRAPHQL_ENDPOINT}"
+        self.client = client
+        # The admin secret, for service tasks only, lets Hasura see every owner's rows
+        if admin_secret is not None:
+            self.headers = {"x-hasura-admin-secret": admin_secret}
+        else:
+            self.headers = {"Authorization": f"Bearer {token}"}
+
+    async def _execute(self, query: str, variables: Optional[dict] = None) -> dict:
+        # Reads share documents with concurrent reads of the same token; mutations go alone
+        if self.batcher is not None and query.lstrip().startswith("query"):
+            return await self.batcher.execute(query, variables, self.headers)
+
+        payload: dict = {'query': query}
+        if variables is not None:
+            payload['variables'] = variables
+
+        response = await self.client.post(
+            self.graphql_endpoint,
+            json=payload,
+            headers=self.headers
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_bucket(self, bucket_name: str, owner_id: uuid.UUID) -> Optional[StoredBucket]:
+        result = await self._execute(queries.GET_BUCKET_BY_NAME_OWNER, {
+            "name": bucket_name,
+            "owner": str(owner_id)
+        })
+
+        # Raised rather than answered as None, which the bucket cache would keep as "missing"
+        if "errors" in result:
+            raise Exception(f"Query failed: {result['errors']}")
+
+        data = result.get('data', {}).get('storage_bucket', [])
+        return StoredBucket(**data[0]) if data else None
+
+    async def fetch_public_bucket_ids(self) -> set[uuid.UUID]:
+        result = await self._execute(queries.GET_PUBLIC_BUCKET_IDS)
+
+        if "errors" in result:
+            raise Exception(f"Query failed: {result['errors']}")
+
+        return {uuid.UUID(row["id"]) for row in result.get('data', {}).get('storage_bucket', [])}
+
+    async def insert_bucket(self, bucket_data: BaseBucket, user_id: uuid.UUID) -> Optional[StoredBucket]:
+        result = await self._execute(queries.CREATE_BUCKET, {
+            "name": bucket_data.name,
+            "public": bucket_data.public
+        })
+
+        if "errors" in result:
+            raise Exception(f"Mutation failed: {result['errors']}")
+
+        data = result.get('data', {}).get('insert_storage_bucket_one')
+        return StoredBucket(**data) if data else None
+
+    async def fetch_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID) -> Optional[FileObject]:
+        result = await self._execute(queries.GET_FILE, {
+            "bucketName": bucket_name,
+            "fileName": file_name
+        })
+
+        if "errors" in result:
+            logger.error(f"Hasura Error: {result['errors']}")
+            raise Exception(str(result['errors']))
+
+        # Navigate the nested data: bucket -> objects -> first item
+        data = result.get('data', {}).get('storage_bucket', [])
+        if data and data[0].get('objects'):
+            return FileObject(**data[0]['objects'][0])
+
+        return None
+
+    async def get_file_rows(
+            self,
+            bucket_name: str,
+            owner_id: uuid.UUID,
+            limit: int,
+            after: Optional[str] = None,
+            prefix: Optional[str] = None
+    ) -> list[dict]:
+        conditions = []
+        if prefix:
+            conditions.append({"name": {"_like": like_prefix(prefix)}})
+        if after is not None:
+            conditions.append({"name": {"_gt": after}})
+
+        result = await self._execute(queries.GET_FILES_PAGE, {
+            "bucketName": bucket_name,
+            "where": {"_and": conditions},
+            "limit": limit
+        })
+
+        if "errors" in result:
+            logger.error(f"Hasura Error: {result['errors']}")
+            raise Exception(str(result['errors']))
+
+        data = result.get('data', {}).get('storage_bucket', [])
+        if data and data[0].get('objects'):
+            return data[0]['objects']
+        return []
+
+    async def get_files_by_name(
+            self,
+            bucket_name: str,
+            file_names: list[str],
+            owner_id: uuid.UUID
+    ) -> list[FileObject]:
+        result = await self._execute(queries.GET_FILES_BY_NAME, {
+            "bucketName": bucket_name,
+            "fileNames": file_names
+        })
+
+        if "errors" in result:
+            logger.error(f"Hasura Error: {result['errors']}")
+            raise Exception(str(result['errors']))
+
+        data = result.get('data', {}).get('storage_bucket', [])
+        if data and data[0].get('objects'):
+            return [FileObject(**fdata) for fdata in data[0]['objects']]
+        return []
+
+    async def get_buckets(
+            self,
+            owner_id: uuid.UUID,
+            limit: int,
+            after: Optional[tuple[str, str]] = None
+    ) -> list[BucketSummary]:
+        conditions: list[dict] = [{"owner": {"_eq": str(owner_id)}}]
+        if after is not None:
+            name, bucket_id = after
+            conditions.append({"_or": [
+                {"name": {"_gt": name}},
+                {"name": {"_eq": name}, "id": {"_gt": bucket_id}}
+            ]})
+
+        result = await self._execute(queries.GET_BUCKETS_PAGE, {
+            "where": {"_and": conditions},
+            "limit": limit
+        })
+
+        if "errors" in result:
+            logger.error(f"Hasura Error: {result['errors']}")
+            raise Exception(str(result['errors']))
+
+        buckets = result.get('data', {}).get('storage_bucket', [])
+        return [BucketSummary(**bucket) for bucket in buckets]
+
+    async def upsert_file(self, bucket_id: uuid.UUID, file_name: str) -> dict:
+        result = await self._execute(queries.UPSERT_FILE, {
+            "bucketId": str(bucket_id),
+            "name": file_name,
+            "now": datetime.now(timezone.utc).isoformat()
+        })
+
+        if "errors" in result:
+            raise Exception(f"Upsert failed: {result['errors']}")
+
+        return result.get('data', {}).get('insert_storage_object_one')
+
+    async def delete_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID):
+        result = await self._execute(queries.DELETE_FILE, {
+            "fileName": file_name,
+            "bucketName": bucket_name
+        })
+
+        if "errors" in result:
+            raise Exception(f"Delete failed: {result['errors']}")
+
+        # Check if anything was actually deleted
+        affected_rows = result.get('data', {}).get('delete_storage_object', {}).get('affected_rows', 0)
+
+        if affected_rows == 0:
+            raise FileNotFoundError(f"File {file_name} not found or unauthorized")
+
+        return True
+
+    async def delete_files(
+            self,
+            bucket_name: str,
+            file_names: list[str],
+            owner_id: uuid.UUID
+    ) -> list[FileObject]:
+        result = await self._execute(queries.DELETE_FILES, {
+            "fileNames": file_names,
+            "bucketName": bucket_name
+        })
+
+        if "errors" in result:
+            raise Exception(f"Delete failed: {result['errors']}")
+
+        deleted = result.get('data', {}).get('delete_storage_object', {}).get('returning', [])
+        return [FileObject(**fdata) for fdata in deleted]
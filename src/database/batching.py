@@ -0,0 +1,222 @@
+import re
+import json
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_OPERATION = re.compile(r"^\s*query\b\s*\w*\s*(?:\((?P<variables>[^)]*)\))?\s*\{(?P<body>.*)\}\s*$", re.DOTALL)
+_NAME = re.compile(r"[A-Za-z_]\w*")
+_VARIABLE = re.compile(r"\$(\w+)")
+
+
+def _alias_fields(body: str, prefix: str) -> Optional[tuple[str, dict[str, str]]]:
+    """
+    Alias every top-level field of a selection set with a unique prefix.
+
+    Returns:
+        The rewritten selection and a mapping of each alias to the response key it replaces;
+        None if an alias is not followed by a field
+    """
+    out = []
+    aliases = {}
+    depth = 0
+    position = 0
+    while position < len(body):
+        char = body[position]
+        if char in "{(":
+            depth += 1
+        elif char in "})":
+            depth -= 1
+        elif char == '"':
+            end = body.index('"', position + 1)
+            out.append(body[position:end + 1])
+            position = end + 1
+            continue
+        elif depth == 0:
+            match = _NAME.match(body, position)
+            if match:
+                name = match.group()
+                rest = body[match.end():].lstrip()
+                if rest.startswith(":"):
+                    # Already aliased: keep the alias as the response key, skip to the field
+                    position = body.index(":", match.end()) + 1
+                    field = _NAME.search(body, position)
+                    if field is None:
+                        return None
+                    out.append(f"{prefix}{name}: {field.group()}")
+                    aliases[f"{prefix}{name}"] = name
+                    position = field.end()
+                else:
+                    out.append(f"{prefix}{name}: {name}")
+                    aliases[f"{prefix}{name}"] = name
+                    position = match.end()
+                continue
+        out.append(char)
+        position += 1
+    return "".join(out), aliases
+
+
+def merge_queries(operations: list[tuple[str, Optional[dict]]]) -> Optional[tuple[str, dict, list[dict[str, str]]]]:
+    """
+    Merge several GraphQL queries into one document.
+
+    Top-level fields and variables of the i-th query are prefixed with
+    ``b<i>_`` so the queries cannot clash.
+
+    Returns:
+        The document, its variables and, per query, the mapping of its aliases to
+        its own response keys; None if a query is not a plain query operation
+    """
+    definitions = []
+    selections = []
+    variables = {}
+    aliases = []
+    for index, (query, values) in enumerate(operations):
+        match = _OPERATION.match(query)
+        if match is None:
+            return None
+        prefix = f"b{index}_"
+        if match.group("variables"):
+            definitions.append(_VARIABLE.sub(rf"${prefix}\1", match.group("variables")))
+        aliased = _alias_fields(_VARIABLE.sub(rf"${prefix}\1", match.group("body")), prefix)
+        if aliased is None:
+            return None
+        body, mapping = aliased
+        selections.append(body)
+        aliases.append(mapping)
+        variables.update({f"{prefix}{name}": value for name, value in (values or {}).items()})
+
+    header = f"query Batch({', '.join(definitions)})" if definitions else "query Batch"
+    return header + " {" + "\n".join(selections) + "}", variables, aliases
+
+
+class _Batch:
+    def __init__(self, headers: dict):
+        self.headers = headers
+        self.operations: list[tuple[str, Optional[dict]]] = []
+        self.futures: dict[str, asyncio.Future] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def add(self, query: str, variables: Optional[dict]) -> asyncio.Future:
+        # Identical queries in the same batch are sent once
+        key = json.dumps([query, variables], sort_keys=True, default=str)
+        future = self.futures.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.futures[key] = future
+            self.operations.append((query, variables))
+        return future
+
+
+class GraphQLBatcher:
+    """
+    Send the GraphQL queries issued within a short window as one document.
+
+    Queries are grouped by Authorization header: Hasura applies the
+    permissions of the token a document is sent with, so only queries made
+    with the same token can share a document. A batch is sent ``window``
+    seconds after its first query, or as soon as it holds ``max_size``
+    distinct queries; each caller gets the response it would have had alone.
+    If Hasura rejects the merged document, its queries are sent one by one.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, endpoint: str, window: float, max_size: int):
+        """
+        Args:
+            client: Shared client to Hasura
+            endpoint: GraphQL endpoint URL
+            window: Seconds a batch waits for more queries after its first one
+            max_size: Number of distinct queries that sends a batch right away
+        """
+        self.client = client
+        self.endpoint = endpoint
+        self.window = window
+        self.max_size = max_size
+        self._pending: dict[str, _Batch] = {}
+        self._sending: set[asyncio.Task] = set()
+        self.queries = 0
+        self.documents = 0
+        self.fallbacks = 0
+
+    async def execute(self, query: str, variables: Optional[dict], headers: dict) -> dict:
+        """Queue a query in the batch of its token and wait for its response"""
+        key = headers.get("Authorization", "")
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _Batch(headers)
+            batch.timer = asyncio.get_running_loop().call_later(self.window, self._flush, key, batch)
+
+        self.queries += 1
+        future = batch.add(query, variables)
+        if len(batch.operations) >= self.max_size:
+            self._flush(key, batch)
+        # Shared by every caller of an identical query: one going away must not cancel it
+        return await asyncio.shield(future)
+
+    def _flush(self, key: str, batch: _Batch):
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._send(batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _post(self, query: str, variables: Optional[dict], headers: dict) -> dict:
+        payload: dict = {'query': query}
+        if variables is not None:
+            payload['variables'] = variables
+        self.documents += 1
+        response = await self.client.post(self.endpoint, json=payload, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def _send(self, batch: _Batch):
+        futures = list(batch.futures.values())
+        try:
+            merged = merge_queries(batch.operations) if len(batch.operations) > 1 else None
+            if merged is None:
+                results = await asyncio.gather(*(
+                    self._post(query, variables, batch.headers) for query, variables in batch.operations
+                ))
+            else:
+                document, variables, aliases = merged
+                result = await self._post(document, variables, batch.headers)
+                if "errors" in result or not isinstance(result.get("data"), dict):
+                    # One bad query fails the whole document: give each query its own answer
+                    logger.warning(f"Batched GraphQL document failed, resending {len(futures)} queries alone")
+                    self.fallbacks += 1
+                    results = await asyncio.gather(*(
+                        self._post(query, values, batch.headers) for query, values in batch.operations
+                    ))
+                else:
+                    data = result["data"]
+                    results = [
+                        {"data": {key: data.get(alias) for alias, key in mapping.items()}}
+                        for mapping in aliases
+                    ]
+        except BaseException as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        """Snapshot of batching for metrics"""
+        return {
+            "pending_batches": len(self._pending),
+            "queries": self.queries,
+            "documents": self.documents,
+            "fallbacks": self.fallbacks,
+        }
@@ -8,8 +8,7 @@ from config.settings import settings
 
 from src.schema.requests.storage import Bucket as BaseBucket, FileObject
 from src.core.exceptions import BucketNotFound
-
-import os
+from src.database import queries
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,17 +30,7 @@ class DatabaseEngine:
         })
 
     def get_bucket_by_id(self, bucket_id: str) -> Optional[BaseBucket]:
-        query = """
-            query GetBucket($name: String!) {
-              storage_bucket(where: {
-                name: {_eq: $name}
-              }, limit: 1) {
-                id
-                name
-                owner
-              }
-            }
-        """
+        query = queries.GET_BUCKET_BY_NAME
 
         variables = {
             "name": bucket_id
@@ -64,18 +53,7 @@ class DatabaseEngine:
         return BaseBucket(**data[0]) if data else None
 
     def get_bucket_by_id_user(self, bucket_name: str, owner_id: uuid.UUID) -> Optional[BaseBucket]:
-        query = """
-            query GetBucket($name: String!, $owner: uuid!) {
-              storage_bucket(where: {
-                name: {_eq: $name}, 
-                owner: {_eq: $owner}
-              }, limit: 1) {
-                id
-                name
-                owner
-              }
-            }
-        """
+        query = queries.GET_BUCKET_BY_NAME_OWNER
 
         variables = {
             "name": bucket_name,
@@ -99,20 +77,11 @@ class DatabaseEngine:
         return BaseBucket(**data[0]) if data else None
 
     def create_bucket(self, bucket_data: BaseBucket, user_id: uuid.UUID) -> Optional[BaseBucket]:
-        mutation = """
-        mutation CreateBucket($name: String!) {
-          insert_storage_bucket_one(object: {
-            name: $name
-          }) {
-            id
-            name
-            owner
-          }
-        }
-        """
+        mutation = queries.CREATE_BUCKET
 
         variables = {
-            "name": bucket_data.name
+            "name": bucket_data.name,
+            "public": bucket_data.public
         }
 
         logger.warning(f"graph ql url {self.graphql_endpoint}")
@@ -131,20 +100,7 @@ class DatabaseEngine:
         return BaseBucket(**data) if data else None
 
     def get_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID) -> Optional[FileObject]:
-        query = """
-            query GetFile($bucketName: String!, $fileName: String!) {
-              storage_bucket(where: {
-                name: {_eq: $bucketName}
-              }, limit: 1) {
-                objects(where: {name: {_eq: $fileName}}, limit: 1) {
-                    bucket_id
-                    id
-                    last_modified
-                    name
-                }
-              }
-            }
-        """
+        query = queries.GET_FILE
 
         variables = {
             "bucketName": bucket_name,
@@ -171,21 +127,7 @@ class DatabaseEngine:
         return None
 
     def get_files(self, bucket_name: str, owner_id: uuid.UUID) -> list[FileObject]:
-        query = """
-            query GetFile($bucketName: String!) {
-              storage_bucket(
-                where: { name: { _eq: $bucketName } }
-                limit: 1
-              ) {
-                objects {
-                  id
-                  name
-                  bucket_id
-                  last_modified
-                }
-              }
-            }
-        """
+        query = queries.GET_FILES
 
         variables = {
             "bucketName": bucket_name
@@ -211,18 +153,10 @@ class DatabaseEngine:
         return results
 
     def get_buckets(self, owner_id: uuid.UUID) -> list[BaseBucket]:
-        query = """
-            query GetFile {
-              storage_bucket {
-                owner
-                name
-                id
-              }
-            }
-        """
+        query = queries.GET_BUCKETS
         response = self.session.post(
             self.graphql_endpoint,
-            json={'query': query}
+            json={'query': query, 'variables': {'owner': str(owner_id)}}
         )
 
         result = response.json()
@@ -245,25 +179,7 @@ class DatabaseEngine:
             raise BucketNotFound(bucket_name)
 
         # Note the singular 'object' in the mutation name
-        mutation = """
-            mutation UpsertFile($bucketId: uuid!, $name: String!, $now: timestamptz!) {
-              insert_storage_object_one(
-                object: {
-                  bucket_id: $bucketId,
-                  name: $name,
-                  last_modified: $now
-                },
-                on_conflict: {
-                  constraint: object_bucket_id_name_key, 
-                  update_columns: [last_modified]
-                }
-              ) {
-                id
-                name
-                last_modified
-              }
-            }
-        """
+        mutation = queries.UPSERT_FILE
 
         variables = {
             "bucketId": str(bucket_data.id),
@@ -284,18 +200,7 @@ class DatabaseEngine:
         return result.get('data', {}).get('insert_storage_object_one')
 
     def delete_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID):
-        mutation = """
-            mutation DeleteFile($fileName: String!, $bucketName: String!) {
-              delete_storage_object(where: {
-                name: {_eq: $fileName},
-                bucket: {
-                  name: {_eq: $bucketName}
-                }
-              }) {
-                affected_rows
-              }
-            }
-        """
+        mutation = queries.DELETE_FILE
 
         variables = {
             "fileName": file_name,
@@ -0,0 +1,326 @@
+import asyncio
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from src.schema.requests.storage import Bucket, StoredBucket, FileObject
+from src.schema.response.storage import BucketSummary
+from src.core.cache import TTLCache, MISSING
+from src.core.exceptions import BucketNotFound
+from src.core.singleflight import AsyncSingleFlight
+
+
+class MetadataEngine(ABC):
+    """
+    Bucket and object metadata, scoped to the bucket owner.
+
+    Implementations only fetch and change rows; bucket lookups go through the
+    optional shared bucket cache here, and whole-bucket walks are built on
+    top of get_file_rows.
+
+    Bucket and object lookups also go through the optional shared
+    AsyncSingleFlight: identical lookups in flight at the same time, for the
+    same owner, share one round trip. A lookup joining a query already in
+    flight may miss a write that completed after that query was sent, as if
+    it had arrived a round trip earlier.
+    """
+
+    def __init__(self, bucket_cache: Optional[TTLCache] = None, flights: Optional[AsyncSingleFlight] = None):
+        self.bucket_cache = bucket_cache
+        self.flights = flights
+
+    async def _coalesce(self, key: tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        if self.flights is None:
+            return await fetch()
+        return await self.flights.do(key, fetch)
+
+    async def get_bucket_by_id_user(self, bucket_name: str, owner_id: uuid.UUID) -> Optional[StoredBucket]:
+        """
+        Get a bucket of the user by name.
+
+        Args:
+            bucket_name: Bucket name
+            owner_id: UID of the bucket owner
+
+        Returns:
+            The bucket, or None if the user has no bucket with this name
+        """
+        cache_key = (bucket_name, str(owner_id))
+        if self.bucket_cache is not None:
+            cached = self.bucket_cache.get(cache_key)
+            if cached is not MISSING:
+                return cached
+
+        bucket = await self._coalesce(
+            ("bucket", bucket_name, str(owner_id)),
+            lambda: self.fetch_bucket(bucket_name, owner_id)
+        )
+
+        # Missing buckets are cached too, for the shorter negative TTL
+        if self.bucket_cache is not None:
+            self.bucket_cache.set(cache_key, bucket)
+
+        return bucket
+
+    async def create_bucket(self, bucket_data: Bucket, user_id: uuid.UUID) -> Optional[StoredBucket]:
+        """
+        Create a bucket owned by the user.
+
+        Args:
+            bucket_data: Bucket to create
+            user_id: UID of the bucket owner
+
+        Returns:
+            The created bucket
+        """
+        bucket = await self.insert_bucket(bucket_data, user_id)
+
+        # Drop a cached "not found" so the new bucket is usable right away
+        if self.bucket_cache is not None:
+            self.bucket_cache.invalidate((bucket_data.name, str(user_id)))
+        if self.flights is not None:
+            self.flights.forget(("bucket", bucket_data.name, str(user_id)))
+
+        return bucket
+
+    async def get_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID) -> Optional[FileObject]:
+        """
+        Get the metadata of one object.
+
+        Args:
+            bucket_name: Bucket name
+            file_name: Object name
+            owner_id: UID of the bucket owner
+
+        Returns:
+            The object, or None if it does not exist
+        """
+        return await self._coalesce(
+            ("file", bucket_name, file_name, str(owner_id)),
+            lambda: self.fetch_file(bucket_name, file_name, owner_id)
+        )
+
+    async def create_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID) -> dict:
+        """
+        Record an object, or refresh its last modification time if it exists.
+
+        Args:
+            bucket_name: Bucket name
+            file_name: Object name
+            owner_id: UID of the bucket owner
+
+        Returns:
+            The id, name and last_modified of the object
+        """
+        bucket = await self.get_bucket_by_id_user(bucket_name, owner_id)
+        if bucket is None:
+            raise BucketNotFound(bucket_name)
+        return await self.upsert_file(bucket.id, file_name)
+
+    async def get_files(
+            self,
+            bucket_name: str,
+            owner_id: uuid.UUID,
+            limit: int,
+            after: Optional[str] = None,
+            prefix: Optional[str] = None
+    ) -> list[FileObject]:
+        """
+        Fetch one page of a bucket's objects ordered by name.
+
+        Object names are unique within a bucket, so the name of the last object
+        of a page is enough to resume after it.
+        """
+        rows = await self.get_file_rows(bucket_name, owner_id, limit, after=after, prefix=prefix)
+        return [FileObject(**row) for row in rows]
+
+    async def iter_files(
+            self,
+            bucket_name: str,
+            owner_id: uuid.UUID,
+            page_size: int,
+            after: Optional[str] = None,
+            prefix: Optional[str] = None
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Walk a bucket's objects page by page, as rows from get_file_rows.
+
+        The next page is requested while the caller consumes the current one.
+        """
+        pending = asyncio.ensure_future(
+            self.get_file_rows(bucket_name, owner_id, page_size, after=after, prefix=prefix)
+        )
+        try:
+            while True:
+                page = await pending
+                if len(page) < page_size:
+                    if page:
+                        yield page
+                    return
+                pending = asyncio.ensure_future(
+                    self.get_file_rows(bucket_name, owner_id, page_size, after=page[-1]['name'], prefix=prefix)
+                )
+                yield page
+        finally:
+            if not pending.done():
+                pending.cancel()
+
+    @abstractmethod
+    async def fetch_bucket(self, bucket_name: str, owner_id: uuid.UUID) -> Optional[StoredBucket]:
+        """
+        Read a bucket of the user by name, bypassing the bucket cache.
+
+        Args:
+            bucket_name: Bucket name
+            owner_id: UID of the bucket owner
+
+        Returns:
+            The bucket, or None if the user has no bucket with this name
+        """
+        pass
+
+    @abstractmethod
+    async def fetch_public_bucket_ids(self) -> set[uuid.UUID]:
+        """
+        Read the ids of the public buckets of every owner.
+
+        Only the public bucket refresh calls this, on an engine allowed to see
+        every bucket.
+
+        Returns:
+            Ids of the buckets flagged public
+        """
+        pass
+
+    @abstractmethod
+    async def insert_bucket(self, bucket_data: Bucket, user_id: uuid.UUID) -> Optional[StoredBucket]:
+        """
+        Insert a bucket owned by the user.
+
+        Args:
+            bucket_data: Bucket to create
+            user_id: UID of the bucket owner
+
+        Returns:
+            The created bucket
+        """
+        pass
+
+    @abstractmethod
+    async def fetch_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID) -> Optional[FileObject]:
+        """
+        Read the metadata of one object, without coalescing.
+
+        Args:
+            bucket_name: Bucket name
+            file_name: Object name
+            owner_id: UID of the bucket owner
+
+        Returns:
+            The object, or None if it does not exist
+        """
+        pass
+
+    @abstractmethod
+    async def get_file_rows(
+            self,
+            bucket_name: str,
+            owner_id: uuid.UUID,
+            limit: int,
+            after: Optional[str] = None,
+            prefix: Optional[str] = None
+    ) -> list[dict]:
+        """
+        Fetch one page of a bucket's objects ordered by name, as JSON-ready rows.
+
+        Args:
+            bucket_name: Bucket name
+            owner_id: UID of the bucket owner
+            limit: Maximum number of rows returned
+            after: Only return objects named after this one
+            prefix: Only return objects whose name starts with this prefix
+
+        Returns:
+            Rows with the id, name, bucket_id and last_modified of each object, as strings
+        """
+        pass
+
+    @abstractmethod
+    async def get_files_by_name(
+            self,
+            bucket_name: str,
+            file_names: list[str],
+            owner_id: uuid.UUID
+    ) -> list[FileObject]:
+        """
+        Get the metadata of several objects of a bucket.
+
+        Args:
+            bucket_name: Bucket name
+            file_names: Object names
+            owner_id: UID of the bucket owner
+
+        Returns:
+            The objects found, in no particular order
+        """
+        pass
+
+    @abstractmethod
+    async def get_buckets(
+            self,
+            owner_id: uuid.UUID,
+            limit: int,
+            after: Optional[tuple[str, str]] = None
+    ) -> list[BucketSummary]:
+        """
+        Fetch one page of the user's buckets ordered by name, then id.
+
+        Args:
+            owner_id: UID of the bucket owner
+            limit: Maximum number of buckets returned
+            after: (name, id) of the last bucket of the previous page
+        """
+        pass
+
+    @abstractmethod
+    async def upsert_file(self, bucket_id: uuid.UUID, file_name: str) -> dict:
+        """
+        Record an object of a bucket already resolved for its owner, or refresh
+        its last modification time if it exists.
+
+        Args:
+            bucket_id: Id of the bucket
+            file_name: Object name
+
+        Returns:
+            The id, name and last_modified of the object
+        """
+        pass
+
+    @abstractmethod
+    async def delete_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID) -> bool:
+        """
+        Delete the metadata of one object.
+
+        Raises:
+            FileNotFoundError: If the object does not exist
+
+        Returns:
+            True once deleted
+        """
+        pass
+
+    @abstractmethod
+    async def delete_files(
+            self,
+            bucket_name: str,
+            file_names: list[str],
+            owner_id: uuid.UUID
+    ) -> list[FileObject]:
+        """
+        Delete the metadata of several objects of a bucket.
+
+        Returns:
+            The objects actually deleted
+        """
+        pass
@@ -0,0 +1,164 @@
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from typing import Optional
+
+from src.schema.requests.storage import Bucket as BaseBucket, StoredBucket, FileObject
+from src.schema.response.storage import BucketSummary
+from src.core.exceptions import BucketNotFound, ConflictError, ValidationError
+from src.core.cache import TTLCache
+from src.database.engine import MetadataEngine
+
+
+class MemoryMetadataStore:
+    """
+    Process-local metadata tables shared by every InMemoryEngine.
+
+    Rows live in dicts; each owner's buckets and each bucket's objects are
+    also kept as sorted lists so keyset pages and prefix scans are a bisect
+    away. Nothing here awaits, so every engine call runs atomically on the
+    event loop without locks.
+    """
+
+    def __init__(self):
+        # (owner, name) -> bucket
+        self.buckets: dict[tuple[str, str], StoredBucket] = {}
+        # owner -> sorted (name, id)
+        self.bucket_index: dict[str, list[tuple[str, str]]] = {}
+        # bucket id -> object name -> row
+        self.objects: dict[uuid.UUID, dict[str, dict]] = {}
+        # bucket id -> sorted object names
+        self.object_index: dict[uuid.UUID, list[str]] = {}
+
+
+class InMemoryEngine(MetadataEngine):
+    """Metadata engine over a MemoryMetadataStore, for tests and load-test baselines."""
+
+    def __init__(self, store: MemoryMetadataStore, bucket_cache: Optional[TTLCache] = None):
+        super().__init__(bucket_cache=bucket_cache)
+        self.store = store
+
+    async def fetch_bucket(self, bucket_name: str, owner_id: uuid.UUID) -> Optional[StoredBucket]:
+        return self.store.buckets.get((str(owner_id), bucket_name))
+
+    async def fetch_public_bucket_ids(self) -> set[uuid.UUID]:
+        return {bucket.id for bucket in self.store.buckets.values() if bucket.public}
+
+    async def insert_bucket(self, bucket_data: BaseBucket, user_id: uuid.UUID) -> Optional[StoredBucket]:
+        if not bucket_data.name:
+            raise ValidationError("Bucket name is required")
+        key = (str(user_id), bucket_data.name)
+        if key in self.store.buckets:
+            raise ConflictError(f"Bucket {bucket_data.name} already exists")
+
+        bucket = StoredBucket(id=uuid.uuid4(), name=bucket_data.name, owner=user_id, public=bucket_data.public)
+        self.store.buckets[key] = bucket
+        insort(self.store.bucket_index.setdefault(str(user_id), []), (bucket.name, str(bucket.id)))
+        self.store.objects[bucket.id] = {}
+        self.store.object_index[bucket.id] = []
+        return bucket
+
+    async def fetch_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID) -> Optional[FileObject]:
+        bucket = self.store.buckets.get((str(owner_id), bucket_name))
+        if bucket is None:
+            return None
+        row = self.store.objects[bucket.id].get(file_name)
+        return FileObject(**row) if row else None
+
+    async def get_file_rows(
+            self,
+            bucket_name: str,
+            owner_id: uuid.UUID,
+            limit: int,
+            after: Optional[str] = None,
+            prefix: Optional[str] = None
+    ) -> list[dict]:
+        bucket = self.store.buckets.get((str(owner_id), bucket_name))
+        if bucket is None:
+            return []
+
+        names = self.store.object_index[bucket.id]
+        start = bisect_right(names, after) if after is not None else 0
+        if prefix:
+            start = max(start, bisect_left(names, prefix))
+
+        rows = []
+        objects = self.store.objects[bucket.id]
+        for name in names[start:start + limit]:
+            if prefix and not name.startswith(prefix):
+                break
+            rows.append(objects[name])
+        return rows
+
+    async def get_files_by_name(
+            self,
+            bucket_name: str,
+            file_names: list[str],
+            owner_id: uuid.UUID
+    ) -> list[FileObject]:
+        bucket = self.store.buckets.get((str(owner_id), bucket_name))
+        if bucket is None:
+            return []
+
+        objects = self.store.objects[bucket.id]
+        return [FileObject(**objects[name]) for name in file_names if name in objects]
+
+    async def get_buckets(
+            self,
+            owner_id: uuid.UUID,
+            limit: int,
+            after: Optional[tuple[str, str]] = None
+    ) -> list[BucketSummary]:
+        index = self.store.bucket_index.get(str(owner_id), [])
+        start = bisect_right(index, tuple(after)) if after is not None else 0
+        return [BucketSummary(id=uuid.UUID(bucket_id), name=name) for name, bucket_id in index[start:start + limit]]
+
+    async def upsert_file(self, bucket_id: uuid.UUID, file_name: str) -> dict:
+        objects = self.store.objects.get(bucket_id)
+        if objects is None:
+            raise BucketNotFound(str(bucket_id))
+
+        existing = objects.get(file_name)
+        row = {
+            "id": existing["id"] if existing else str(uuid.uuid4()),
+            "name": file_name,
+            "bucket_id": str(bucket_id),
+            "last_modified": datetime.now(timezone.utc).isoformat()
+        }
+        # Rows are replaced, never changed in place, so pages already handed out stay valid
+        objects[file_name] = row
+        if existing is None:
+            insort(self.store.object_index[bucket_id], file_name)
+
+        return {"id": row["id"], "name": file_name, "last_modified": row["last_modified"]}
+
+    def _remove(self, bucket_id: uuid.UUID, file_name: str) -> Optional[dict]:
+        row = self.store.objects[bucket_id].pop(file_name, None)
+        if row is not None:
+            names = self.store.object_index[bucket_id]
+            del names[bisect_left(names, file_name)]
+        return row
+
+    async def delete_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID) -> bool:
+        bucket = self.store.buckets.get((str(owner_id), bucket_name))
+        if bucket is None or self._remove(bucket.id, file_name) is None:
+            raise FileNotFoundError(f"File {file_name} not found or unauthorized")
+
+        return True
+
+    async def delete_files(
+            self,
+            bucket_name: str,
+            file_names: list[str],
+            owner_id: uuid.UUID
+    ) -> list[FileObject]:
+        bucket = self.store.buckets.get((str(owner_id), bucket_name))
+        if bucket is None:
+            return []
+
+        deleted = []
+        for file_name in file_names:
+            row = self._remove(bucket.id, file_name)
+            if row is not None:
+                deleted.append(FileObject(**row))
+        return deleted
@@ -0,0 +1,150 @@
+import logging
+import uuid
+from typing import Optional
+
+import asyncpg
+
+from config.settings import settings
+
+from src.schema.requests.storage import Bucket as BaseBucket, StoredBucket, FileObject
+from src.schema.response.storage import BucketSummary
+from src.database import sql
+from src.core.cache import TTLCache
+from src.core.singleflight import AsyncSingleFlight
+from src.database.engine import MetadataEngine
+from src.core.pagination import like_prefix
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def create_database_pool() -> asyncpg.Pool:
+    """
+    Build the connection pool shared by every PostgresEngine.
+
+    DATABASE_URL is either a full postgres:// DSN or the database host, in
+    which case the other DATABASE_* settings complete it. Each connection keeps
+    its own cache of prepared statements, so the fixed statements in
+    src.database.sql are parsed and planned once per connection.
+    """
+    options = {
+        "min_size": settings.DATABASE_POOL_MIN_SIZE,
+        "max_size": settings.DATABASE_POOL_MAX_SIZE,
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "command_timeout": settings.DATABASE_COMMAND_TIMEOUT
+    }
+    if settings.DATABASE_URL.startswith(("postgres://", "postgresql://")):
+        return await asyncpg.create_pool(dsn=settings.DATABASE_URL, **options)
+
+    return await asyncpg.create_pool(
+        host=settings.DATABASE_URL,
+        port=int(settings.DATABASE_PORT or 5432),
+        user=settings.DATABASE_USERNAME,
+        password=settings.DATABASE_PASSWORD,
+        database=settings.DATABASE_NAME,
+        **options
+    )
+
+
+def _object_row(record: asyncpg.Record) -> dict:
+    """Shape an object row like the JSON returned by Hasura"""
+    row = {}
+    for key, value in record.items():
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        elif key == "last_modified" and value is not None:
+            value = value.isoformat()
+        row[key] = value
+    return row
+
+
+class PostgresEngine(MetadataEngine):
+    """
+    Metadata engine talking to Postgres directly instead of through Hasura.
+
+    Hasura applies the owner permissions from the caller's token; here every
+    statement filters on the owner explicitly, so a user only ever sees and
+    changes rows of buckets they own.
+    """
+
+    def __init__(
+            self,
+            pool: asyncpg.Pool,
+            bucket_cache: Optional[TTLCache] = None,
+            flights: Optional[AsyncSingleFlight] = None
+    ):
+        super().__init__(bucket_cache=bucket_cache, flights=flights)
+        self.pool = pool
+
+    async def fetch_bucket(self, bucket_name: str, owner_id: uuid.UUID) -> Optional[StoredBucket]:
+        record = await self.pool.fetchrow(sql.GET_BUCKET_BY_NAME_OWNER, bucket_name, owner_id)
+        return StoredBucket(**dict(record)) if record else None
+
+    async def fetch_public_bucket_ids(self) -> set[uuid.UUID]:
+        records = await self.pool.fetch(sql.GET_PUBLIC_BUCKET_IDS)
+        return {record["id"] for record in records}
+
+    async def insert_bucket(self, bucket_data: BaseBucket, user_id: uuid.UUID) -> Optional[StoredBucket]:
+        record = await self.pool.fetchrow(sql.CREATE_BUCKET, bucket_data.name, user_id, bucket_data.public)
+        return StoredBucket(**dict(record)) if record else None
+
+    async def fetch_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID) -> Optional[FileObject]:
+        record = await self.pool.fetchrow(sql.GET_FILE, bucket_name, owner_id, file_name)
+        return FileObject(**_object_row(record)) if record else None
+
+    async def get_file_rows(
+            self,
+            bucket_name: str,
+            owner_id: uuid.UUID,
+            limit: int,
+            after: Optional[str] = None,
+            prefix: Optional[str] = None
+    ) -> list[dict]:
+        records = await self.pool.fetch(
+            sql.GET_FILES_PAGE,
+            bucket_name,
+            owner_id,
+            after,
+            like_prefix(prefix) if prefix else None,
+            limit
+        )
+        return [_object_row(record) for record in records]
+
+    async def get_files_by_name(
+            self,
+            bucket_name: str,
+            file_names: list[str],
+            owner_id: uuid.UUID
+    ) -> list[FileObject]:
+        records = await self.pool.fetch(sql.GET_FILES_BY_NAME, bucket_name, owner_id, file_names)
+        return [FileObject(**_object_row(record)) for record in records]
+
+    async def get_buckets(
+            self,
+            owner_id: uuid.UUID,
+            limit: int,
+            after: Optional[tuple[str, str]] = None
+    ) -> list[BucketSummary]:
+        name, bucket_id = after if after is not None else (None, None)
+        records = await self.pool.fetch(sql.GET_BUCKETS_PAGE, owner_id, name, bucket_id, limit)
+        return [BucketSummary(**dict(record)) for record in records]
+
+    async def upsert_file(self, bucket_id: uuid.UUID, file_name: str) -> dict:
+        record = await self.pool.fetchrow(sql.UPSERT_FILE, bucket_id, file_name)
+        return _object_row(record)
+
+    async def delete_file(self, bucket_name: str, file_name: str, owner_id: uuid.UUID):
+        record = await self.pool.fetchrow(sql.DELETE_FILE, bucket_name, owner_id, file_name)
+        if record is None:
+            raise FileNotFoundError(f"File {file_name} not found or unauthorized")
+
+        return True
+
+    async def delete_files(
+            self,
+            bucket_name: str,
+            file_names: list[str],
+            owner_id: uuid.UUID
+    ) -> list[FileObject]:
+        records = await self.pool.fetch(sql.DELETE_FILES, bucket_name, owner_id, file_names)
+        return [FileObject(**_object_row(record)) for record in records]
@@ -0,0 +1,187 @@
+GET_BUCKET_BY_NAME = """
+    query GetBucket($name: String!) {
+      storage_bucket(where: {
+        name: {_eq: $name}
+      }, limit: 1) {
+        id
+        name
+        owner
+        public
+      }
+    }
+"""
+
+GET_BUCKET_BY_NAME_OWNER = """
+    query GetBucket($name: String!, $owner: uuid!) {
+      storage_bucket(where: {
+        name: {_eq: $name},
+        owner: {_eq: $owner}
+      }, limit: 1) {
+        id
+        name
+        owner
+        public
+      }
+    }
+"""
+
+GET_PUBLIC_BUCKET_IDS = """
+    query GetPublicBuckets {
+      storage_bucket(where: {public: {_eq: true}}) {
+        id
+      }
+    }
+"""
+
+CREATE_BUCKET = """
+    mutation CreateBucket($name: String!, $public: Boolean!) {
+      insert_storage_bucket_one(object: {
+        name: $name,
+        public: $public
+      }) {
+        id
+        name
+        owner
+        public
+      }
+    }
+"""
+
+GET_FILE = """
+    query GetFile($bucketName: String!, $fileName: String!) {
+      storage_bucket(where: {
+        name: {_eq: $bucketName}
+      }, limit: 1) {
+        objects(where: {name: {_eq: $fileName}}, limit: 1) {
+            bucket_id
+            id
+            last_modified
+            name
+        }
+      }
+    }
+"""
+
+GET_FILES = """
+    query GetFile($bucketName: String!) {
+      storage_bucket(
+        where: { name: { _eq: $bucketName } }
+        limit: 1
+      ) {
+        objects {
+          id
+          name
+          bucket_id
+          last_modified
+        }
+      }
+    }
+"""
+
+GET_FILES_PAGE = """
+    query GetFilesPage($bucketName: String!, $where: storage_object_bool_exp!, $limit: Int!) {
+      storage_bucket(
+        where: { name: { _eq: $bucketName } }
+        limit: 1
+      ) {
+        objects(where: $where, order_by: { name: asc }, limit: $limit) {
+          id
+          name
+          bucket_id
+          last_modified
+        }
+      }
+    }
+"""
+
+GET_FILES_BY_NAME = """
+    query GetFilesByName($bucketName: String!, $fileNames: [String!]!) {
+      storage_bucket(
+        where: { name: { _eq: $bucketName } }
+        limit: 1
+      ) {
+        objects(where: { name: { _in: $fileNames } }) {
+          id
+          name
+          bucket_id
+          last_modified
+        }
+      }
+    }
+"""
+
+GET_BUCKETS = """
+    query GetBuckets($owner: uuid!) {
+      storage_bucket(
+        where: { owner: { _eq: $owner } }
+        order_by: [{ name: asc }, { id: asc }]
+      ) {
+        owner
+        name
+        id
+      }
+    }
+"""
+
+GET_BUCKETS_PAGE = """
+    query GetBucketsPage($where: storage_bucket_bool_exp!, $limit: Int!) {
+      storage_bucket(
+        where: $where
+        order_by: [{ name: asc }, { id: asc }]
+        limit: $limit
+      ) {
+        name
+        id
+      }
+    }
+"""
+
+UPSERT_FILE = """
+    mutation UpsertFile($bucketId: uuid!, $name: String!, $now: timestamptz!) {
+      insert_storage_object_one(
+        object: {
+          bucket_id: $bucketId,
+          name: $name,
+          last_modified: $now
+        },
+        on_conflict: {
+          constraint: object_bucket_id_name_key,
+          update_columns: [last_modified]
+        }
+      ) {
+        id
+        name
+        last_modified
+      }
+    }
+"""
+
+DELETE_FILE = """
+    mutation DeleteFile($fileName: String!, $bucketName: String!) {
+      delete_storage_object(where: {
+        name: {_eq: $fileName},
+        bucket: {
+          name: {_eq: $bucketName}
+        }
+      }) {
+        affected_rows
+      }
+    }
+"""
+
+DELETE_FILES = """
+    mutation DeleteFiles($fileNames: [String!]!, $bucketName: String!) {
+      delete_storage_object(where: {
+        name: {_in: $fileNames},
+        bucket: {
+          name: {_eq: $bucketName}
+        }
+      }) {
+        returning {
+          bucket_id
+          id
+          name
+        }
+      }
+    }
+"""
@@ -0,0 +1,74 @@
+GET_BUCKET_BY_NAME_OWNER = """
+    SELECT id, name, owner, public
+    FROM storage.bucket
+    WHERE name = $1 AND owner = $2
+    LIMIT 1
+"""
+
+GET_PUBLIC_BUCKET_IDS = """
+    SELECT id
+    FROM storage.bucket
+    WHERE public
+"""
+
+CREATE_BUCKET = """
+    INSERT INTO storage.bucket (name, owner, public)
+    VALUES ($1, $2, $3)
+    RETURNING id, name, owner, public
+"""
+
+GET_FILE = """
+    SELECT o.bucket_id, o.id, o.last_modified, o.name
+    FROM storage.object o
+    JOIN storage.bucket b ON b.id = o.bucket_id
+    WHERE b.name = $1 AND b.owner = $2 AND o.name = $3
+    LIMIT 1
+"""
+
+GET_FILES_PAGE = """
+    SELECT o.id, o.name, o.bucket_id, o.last_modified
+    FROM storage.object o
+    JOIN storage.bucket b ON b.id = o.bucket_id
+    WHERE b.name = $1 AND b.owner = $2
+      AND ($3::text IS NULL OR o.name > $3)
+      AND ($4::text IS NULL OR o.name LIKE $4)
+    ORDER BY o.name
+    LIMIT $5
+"""
+
+GET_FILES_BY_NAME = """
+    SELECT o.bucket_id, o.id, o.last_modified, o.name
+    FROM storage.object o
+    JOIN storage.bucket b ON b.id = o.bucket_id
+    WHERE b.name = $1 AND b.owner = $2 AND o.name = ANY($3::text[])
+"""
+
+GET_BUCKETS_PAGE = """
+    SELECT id, name
+    FROM storage.bucket
+    WHERE owner = $1
+      AND ($2::text IS NULL OR (name, id) > ($2, $3::uuid))
+    ORDER BY name, id
+    LIMIT $4
+"""
+
+UPSERT_FILE = """
+    INSERT INTO storage.object (bucket_id, name, last_modified)
+    VALUES ($1, $2, now())
+    ON CONFLICT (bucket_id, name) DO UPDATE SET last_modified = EXCLUDED.last_modified
+    RETURNING id, name, last_modified
+"""
+
+DELETE_FILE = """
+    DELETE FROM storage.object o
+    USING storage.bucket b
+    WHERE b.id = o.bucket_id AND b.name = $1 AND b.owner = $2 AND o.name = $3
+    RETURNING o.id
+"""
+
+DELETE_FILES = """
+    DELETE FROM storage.object o
+    USING storage.bucket b
+    WHERE b.id = o.bucket_id AND b.name = $1 AND b.owner = $2 AND o.name = ANY($3::text[])
+    RETURNING o.bucket_id, o.id, o.name
+"""
@@ -115,9 +115,9 @@ async def file_not_found_exception_handler(request: Request, exc: FileNotFoundEr
 
 def setup_exception_handlers(app: FastAPI):
     """Setup exception handlers"""
-    app.add_exception_handler(BaseAPIException, base_api_exception_handler)
-    app.add_exception_handler(RequestValidationError, validation_exception_handler)
-    app.add_exception_handler(HTTPException, http_exception_handler)
-    app.add_exception_handler(StarletteHTTPException, http_exception_handler)
-    app.add_exception_handler(Exception, general_exception_handler)
-    app.add_exception_handler(FileNotFoundError, file_not_found_exception_handler)
+    app.exception_handler(BaseAPIException)(base_api_exception_handler)
+    app.exception_handler(RequestValidationError)(validation_exception_handler)
+    app.exception_handler(HTTPException)(http_exception_handler)
+    app.exception_handler(StarletteHTTPException)(http_exception_handler)
+    app.exception_handler(Exception)(general_exception_handler)
+    app.exception_handler(FileNotFoundError)(file_not_found_exception_handler)
@@ -11,6 +11,11 @@ class Bucket(BaseModel):
     owner: Optional[uuid.UUID] = Field(default=None, description="UID of the bucket ownder")
 
 
+class StoredBucket(Bucket):
+    name: str = Field(..., description="Bucket Name")
+    id: uuid.UUID = Field(..., description="UID of the bucket")
+
+
 class FileObject(BaseModel):
     bucket_id: Optional[uuid.UUID] = Field(default=None, description="UID of the bucket")
     id: Optional[uuid.UUID] = Field(default=None, description="UID of the file")
@@ -21,3 +26,28 @@ class FileObject(BaseModel):
 class NewObject(BaseModel):
     bucke_name: str = Field(..., description="Bucket Name")
     file_path: Optional[str] = Field(default="", description="Bucket Name")
+
+
+class NewUploadSession(BaseModel):
+    file_name: str = Field(..., description="Name of the object being uploaded")
+    length: int = Field(..., ge=0, description="Total size of the upload in bytes")
+
+
+class PresignedUploadRequest(BaseModel):
+    file_name: str = Field(..., description="Name of the object being uploaded")
+    size: int = Field(..., ge=0, description="Size of the object in bytes")
+
+
+class UploadedPart(BaseModel):
+    part_number: int = Field(..., ge=1, description="1-based position of the part")
+    etag: str = Field(..., description="ETag returned by storage for the part")
+
+
+class PresignedUploadComplete(BaseModel):
+    file_name: str = Field(..., description="Name of the uploaded object")
+    upload_id: Optional[str] = Field(default=None, description="Multipart upload id, if any")
+    parts: list[UploadedPart] = Field(default_factory=list, description="Uploaded parts for multipart uploads")
+
+
+class BatchRequest(BaseModel):
+    keys: list[str] = Field(..., min_length=1, description="Object names to operate on")
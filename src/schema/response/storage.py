@@ -1,5 +1,11 @@
+import uuid
+
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
+from src.schema.requests.storage import FileObject
+
 
 class MainResponse(BaseModel):
     accepted: bool = Field(default=True, description="Request has been accepted")
@@ -11,3 +17,54 @@ class FileAccepted(MainResponse):
 
 class NewBucket(MainResponse):
     pass
+
+
+class UploadSessionStatus(BaseModel):
+    id: uuid.UUID = Field(..., description="Upload session id")
+    offset: int = Field(..., description="Bytes received so far")
+    length: int = Field(..., description="Declared total size in bytes")
+    expires_at: float = Field(..., description="Unix time after which the session is discarded")
+
+
+class PresignedPart(BaseModel):
+    part_number: int = Field(..., description="1-based position of the part")
+    url: str = Field(..., description="Presigned PUT url for the part")
+
+
+class PresignedUpload(BaseModel):
+    file_name: str = Field(..., description="Name of the object being uploaded")
+    url: Optional[str] = Field(default=None, description="Presigned PUT url for single request uploads")
+    upload_id: Optional[str] = Field(default=None, description="Multipart upload id for large objects")
+    part_size: Optional[int] = Field(default=None, description="Size of every part but the last")
+    parts: list[PresignedPart] = Field(default_factory=list, description="Presigned part urls")
+    expires_in: int = Field(..., description="Seconds before the urls expire")
+
+
+class BatchItemResult(BaseModel):
+    key: str = Field(..., description="Object name")
+    success: bool = Field(..., description="Whether the operation succeeded for this object")
+    error: Optional[str] = Field(default=None, description="Reason of the failure")
+
+
+class BatchResult(BaseModel):
+    results: list[BatchItemResult] = Field(default_factory=list, description="Per object outcome")
+
+
+class BatchFiles(BaseModel):
+    files: list[FileObject] = Field(default_factory=list, description="Metadata of the objects found")
+    missing: list[str] = Field(default_factory=list, description="Requested objects that do not exist")
+
+
+class FilePage(BaseModel):
+    items: list[FileObject] = Field(default_factory=list, description="Objects of this page, ordered by name")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor of the next page, if any")
+
+
+class BucketSummary(BaseModel):
+    id: uuid.UUID = Field(..., description="UID of the bucket")
+    name: str = Field(..., description="Bucket Name")
+
+
+class BucketPage(BaseModel):
+    items: list[BucketSummary] = Field(default_factory=list, description="Buckets of this page, ordered by name")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor of the next page, if any")
@@ -0,0 +1,86 @@
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from config.settings import settings
+from src.application.types.local import LocalStorageActions
+from src.application.types.storage import StorageAction
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def app_settings(tmp_path, monkeypatch):
+    """Run the app on the local backend and the in-memory metadata engine, everything under tmp_path"""
+    overrides = {
+        "STORAGE_TYPE": "local",
+        "METADATA_ENGINE": "memory",
+        "LOCAL_STORAGE_ROOT": str(tmp_path / "storage"),
+        "LOCAL_STORAGE_BASE_URL": "http://testserver/v1/local",
+        "UPLOAD_SESSION_DIR": str(tmp_path / "uploads"),
+        "DEDUP_ROOT": str(tmp_path / "dedup"),
+        "STORAGE_CACHE_ROOT": str(tmp_path / "cache"),
+        "STORAGE_DEDUP": False,
+        "STORAGE_CACHE": False,
+    }
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+    return settings
+
+
+@pytest.fixture
+def client(app_settings):
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def token_for():
+    """Build a bearer token for a user"""
+
+    def build(user_id: uuid.UUID, expires_in: int = 3600) -> str:
+        claims = {"sub": str(user_id), "aud": "authenticated", "exp": int(time.time()) + expires_in}
+        return jwt.encode(claims, settings.GOTRUE_JWT_SECRET, algorithm=settings.ALGORITHM)
+
+    return build
+
+
+@pytest.fixture
+def user_id() -> uuid.UUID:
+    return uuid.uuid4()
+
+
+@pytest.fixture
+def auth(token_for, user_id) -> dict:
+    return {"Authorization": f"Bearer {token_for(user_id)}"}
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    """Local backend with a bucket named "b", without fsync"""
+    storage = LocalStorageActions(str(tmp_path / "local"), fsync="never", signing_key="key")
+    storage.create_bucket("b")
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def read_object():
+    """Read a whole stored object"""
+
+    def read(storage: StorageAction, object_name: str, bucket_name: str = "b", **kwargs) -> bytes:
+        stored = storage.get_object(object_name, bucket_name, **kwargs)
+        try:
+            return b"".join(stored.iter_chunks(64 * 1024))
+        finally:
+            stored.close()
+
+    return read
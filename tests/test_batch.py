@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+
+from config.settings import settings
+from src.application import manager
+
+
+@pytest.fixture
+def objects(client, auth):
+    client.post("/v1/buckets", json={"name": "b"}, headers=auth)
+    names = ["a.txt", "b.txt", "c.txt"]
+    for name in names:
+        client.put(f"/v1/buckets/b/{name}", content=name.encode(), headers=auth)
+    return names
+
+
+def test_batch_delete_reports_each_key(client, auth, objects):
+    response = client.post("/v1/buckets/b/batch/delete", json={"keys": ["a.txt", "nope", "a.txt"]}, headers=auth)
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"key": "a.txt", "success": True, "error": None},
+        {"key": "nope", "success": False, "error": "File not found"},
+    ]
+    assert client.get("/v1/buckets/b/a.txt", headers=auth).status_code == 404
+    assert client.get("/v1/buckets/b/b.txt", headers=auth).content == b"b.txt"
+
+
+def test_batch_delete_splits_storage_requests(client, auth, objects, monkeypatch):
+    monkeypatch.setattr(manager, "MAX_DELETE_OBJECTS", 2)
+    storage = client.app.state.storage_registry.default()
+    delete_files = storage.delete_files
+    calls = []
+
+    def recording(object_names, bucket_name):
+        calls.append(list(object_names))
+        return delete_files(object_names, bucket_name)
+
+    monkeypatch.setattr(storage, "delete_files", recording)
+
+    response = client.post("/v1/buckets/b/batch/delete", json={"keys": objects}, headers=auth)
+
+    assert all(result["success"] for result in response.json()["results"])
+    assert sorted(len(names) for names in calls) == [1, 2]
+    assert all(client.get(f"/v1/buckets/b/{name}", headers=auth).status_code == 404 for name in objects)
+
+
+def test_batch_get_returns_found_and_missing(client, auth, objects):
+    response = client.post("/v1/buckets/b/batch/get", json={"keys": ["c.txt", "nope", "a.txt"]}, headers=auth)
+
+    body = response.json()
+    assert sorted(file["name"] for file in body["files"]) == ["a.txt", "c.txt"]
+    assert body["missing"] == ["nope"]
+
+
+def test_batch_is_scoped_to_the_owner(client, auth, objects, token_for):
+    stranger = {"Authorization": f"Bearer {token_for(uuid.uuid4())}"}
+
+    response = client.post("/v1/buckets/b/batch/delete", json={"keys": ["a.txt"]}, headers=stranger)
+
+    assert response.json()["results"][0]["success"] is False
+    assert client.get("/v1/buckets/b/a.txt", headers=auth).status_code == 200
+
+
+def test_batch_size_is_bounded(client, auth, objects, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_KEYS", 2)
+
+    assert client.post("/v1/buckets/b/batch/get", json={"keys": objects}, headers=auth).status_code == 422
+    assert client.post("/v1/buckets/b/batch/get", json={"keys": []}, headers=auth).status_code == 422
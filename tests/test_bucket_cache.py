@@ -0,0 +1,140 @@
+import time
+import uuid
+
+import httpx
+import pytest
+
+from src.core.cache import MISSING, TTLCache
+from src.database.async_database import AsyncDatabaseEngine
+from src.database.memory import InMemoryEngine, MemoryMetadataStore
+from src.schema.requests.storage import Bucket
+
+
+class CountingEngine(InMemoryEngine):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fetches = 0
+
+    async def fetch_bucket(self, bucket_name, owner_id):
+        self.fetches += 1
+        return await super().fetch_bucket(bucket_name, owner_id)
+
+
+def test_entries_expire():
+    cache = TTLCache(max_size=10, ttl=0.05)
+    cache.set("key", "value")
+
+    assert cache.get("key") == "value"
+    time.sleep(0.06)
+    assert cache.get("key") is MISSING
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_none_uses_the_negative_ttl():
+    cache = TTLCache(max_size=10, ttl=60, negative_ttl=0.05)
+    cache.set("missing", None)
+    cache.set("present", "value")
+
+    assert cache.get("missing") is None
+    time.sleep(0.06)
+    assert cache.get("missing") is MISSING
+    assert cache.get("present") == "value"
+
+
+def test_non_positive_ttl_is_not_cached():
+    cache = TTLCache(max_size=10, ttl=60, negative_ttl=0)
+    cache.set("missing", None)
+
+    assert cache.get("missing") is MISSING
+
+
+@pytest.mark.anyio
+async def test_bucket_lookups_are_cached():
+    owner = uuid.uuid4()
+    engine = CountingEngine(MemoryMetadataStore(), bucket_cache=TTLCache(max_size=10, ttl=60))
+    await engine.create_bucket(Bucket(name="b"), owner)
+
+    first = await engine.get_bucket_by_id_user("b", owner)
+    second = await engine.get_bucket_by_id_user("b", owner)
+
+    assert first == second
+    assert engine.fetches == 1
+
+
+@pytest.mark.anyio
+async def test_missing_bucket_is_cached_until_created():
+    owner = uuid.uuid4()
+    engine = CountingEngine(MemoryMetadataStore(), bucket_cache=TTLCache(max_size=10, ttl=60, negative_ttl=60))
+
+    assert await engine.get_bucket_by_id_user("b", owner) is None
+    assert await engine.get_bucket_by_id_user("b", owner) is None
+    assert engine.fetches == 1
+
+    await engine.create_bucket(Bucket(name="b"), owner)
+    assert (await engine.get_bucket_by_id_user("b", owner)).name == "b"
+
+
+@pytest.mark.anyio
+async def test_buckets_are_cached_per_owner():
+    store = MemoryMetadataStore()
+    engine = InMemoryEngine(store, bucket_cache=TTLCache(max_size=10, ttl=60))
+    owner, other = uuid.uuid4(), uuid.uuid4()
+    await engine.create_bucket(Bucket(name="b"), owner)
+
+    assert await engine.get_bucket_by_id_user("b", owner) is not None
+    assert await engine.get_bucket_by_id_user("b", other) is None
+
+
+def graphql_engine(handler, cache: TTLCache) -> AsyncDatabaseEngine:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncDatabaseEngine(client, token="token", bucket_cache=cache)
+
+
+@pytest.mark.anyio
+async def test_graphql_errors_are_raised_and_not_cached():
+    cache = TTLCache(max_size=10, ttl=60, negative_ttl=60)
+    engine = graphql_engine(lambda request: httpx.Response(200, json={"errors": [{"message": "boom"}]}), cache)
+
+    with pytest.raises(Exception, match="Query failed"):
+        await engine.get_bucket_by_id_user("b", uuid.uuid4())
+    assert cache.stats()["size"] == 0
+
+
+@pytest.mark.anyio
+async def test_http_errors_are_raised_and_not_cached():
+    cache = TTLCache(max_size=10, ttl=60, negative_ttl=60)
+    engine = graphql_engine(lambda request: httpx.Response(503, text="unavailable"), cache)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await engine.get_bucket_by_id_user("b", uuid.uuid4())
+    assert cache.stats()["size"] == 0
+
+
+@pytest.mark.anyio
+async def test_graphql_bucket_is_cached():
+    cache = TTLCache(max_size=10, ttl=60)
+    owner = uuid.uuid4()
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        row = {"id": str(uuid.uuid4()), "name": "b", "owner": str(owner), "public": False}
+        return httpx.Response(200, json={"data": {"storage_bucket": [row]}})
+
+    engine = graphql_engine(handler, cache)
+
+    assert (await engine.get_bucket_by_id_user("b", owner)).name == "b"
+    assert (await engine.get_bucket_by_id_user("b", owner)).name == "b"
+    assert len(calls) == 1
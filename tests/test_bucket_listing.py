@@ -0,0 +1,73 @@
+import json
+import uuid
+
+import httpx
+import pytest
+
+from src.core.pagination import encode_cursor
+from src.database.async_database import AsyncDatabaseEngine
+
+
+def create(client, headers, *names):
+    for name in names:
+        assert client.post("/v1/buckets", json={"name": name}, headers=headers).status_code == 201
+
+
+def list_names(client, headers, **params) -> list[list[str]]:
+    pages = []
+    cursor = None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/v1/buckets", params=query, headers=headers).json()
+        pages.append([bucket["name"] for bucket in body["items"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_only_the_callers_buckets_are_listed(client, auth, token_for):
+    other = {"Authorization": f"Bearer {token_for(uuid.uuid4())}"}
+    create(client, auth, "mine-b", "mine-a")
+    create(client, other, "theirs", "mine-a")
+
+    assert list_names(client, auth) == [["mine-a", "mine-b"]]
+    assert list_names(client, other) == [["mine-a", "theirs"]]
+
+
+def test_buckets_are_paginated_by_name(client, auth):
+    create(client, auth, "d", "a", "c", "e", "b")
+
+    assert list_names(client, auth, limit=2) == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_bucket_cursor_needs_a_bucket_id(client, auth):
+    create(client, auth, "a")
+
+    response = client.get("/v1/buckets", params={"cursor": encode_cursor("a", "not-a-uuid")}, headers=auth)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_graphql_listing_filters_and_seeks_in_the_query():
+    sent = []
+
+    def handler(request):
+        sent.append(json.loads(request.content))
+        return httpx.Response(200, json={"data": {"storage_bucket": []}})
+
+    owner, last_id = uuid.uuid4(), uuid.uuid4()
+    engine = AsyncDatabaseEngine(httpx.AsyncClient(transport=httpx.MockTransport(handler)), token="token")
+
+    await engine.get_buckets(owner, limit=10, after=("photos", str(last_id)))
+
+    assert "order_by: [{ name: asc }, { id: asc }]" in sent[0]["query"]
+    variables = sent[0]["variables"]
+    assert variables["limit"] == 10
+    assert variables["where"]["_and"] == [
+        {"owner": {"_eq": str(owner)}},
+        {"_or": [
+            {"name": {"_gt": "photos"}},
+            {"name": {"_eq": "photos"}, "id": {"_gt": str(last_id)}},
+        ]},
+    ]
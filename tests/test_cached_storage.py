@@ -0,0 +1,178 @@
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from src.application.types import cached
+from src.application.types.cached import CachedStorageActions
+from src.core.exceptions import PreconditionFailedError
+
+
+class Reads(list):
+    """Backend reads, as (object, range), and wrappers for the body of the next ones"""
+
+    def __init__(self):
+        super().__init__()
+        self.hooks: list = []
+
+
+@pytest.fixture
+def reads(local_storage, monkeypatch):
+    reads = Reads()
+    get_object = local_storage.get_object
+
+    def record(object_name, bucket_name, *args, **kwargs):
+        stored = get_object(object_name, bucket_name, *args, **kwargs)
+        reads.append((object_name, kwargs.get("byte_range", args[0] if args else None)))
+        if reads.hooks:
+            stored.iter_chunks = reads.hooks.pop(0)(stored.iter_chunks)
+        return stored
+
+    monkeypatch.setattr(local_storage, "get_object", record)
+    return reads
+
+
+@pytest.fixture
+def cache(local_storage, reads, tmp_path):
+    cache = CachedStorageActions(local_storage, str(tmp_path / "cache"), max_bytes=10, max_object_size=8)
+    yield cache
+    cache._filler.shutdown(wait=True)
+
+
+def put(storage, name: str, data: bytes):
+    assert storage.upload_fileobj(io.BytesIO(data), name, "b")
+
+
+def wait_until_filled(cache: CachedStorageActions):
+    deadline = time.monotonic() + 5
+    while cache.stats()["filling"]:
+        assert time.monotonic() < deadline, "copy not finished"
+        time.sleep(0.01)
+
+
+def test_misses_are_copied_once_and_then_served_from_disk(cache, local_storage, reads, read_object):
+    put(local_storage, "a", b"abcdef")
+
+    assert read_object(cache, "a") == b"abcdef"
+    wait_until_filled(cache)
+    assert read_object(cache, "a", byte_range="bytes=2-3") == b"cd"
+    with pytest.raises(PreconditionFailedError):
+        cache.get_object("a", "b", if_match='"other"')
+
+    assert reads == [("a", None)]
+    stats = cache.stats()
+    assert (stats["objects"], stats["bytes"], stats["misses"]) == (1, 6, 1)
+
+
+def test_least_recently_read_objects_are_evicted(cache, local_storage, reads, read_object):
+    for name in ("a", "b", "c"):
+        put(local_storage, name, name.encode() * 4)
+
+    for name in ("a", "b", "a", "c"):
+        read_object(cache, name)
+        wait_until_filled(cache)
+
+    # 10 bytes hold two objects of 4: b was read least recently when c came in
+    assert list(cache._entries) == [("b", "a"), ("b", "c")]
+    assert cache.stats()["evictions"] == 1
+    assert len([path for path in cache.root.rglob("*") if path.is_file()]) == 2
+
+
+def test_large_objects_are_read_from_the_backend(cache, local_storage, reads, read_object):
+    put(local_storage, "big", b"x" * 9)
+
+    assert read_object(cache, "big") == b"x" * 9
+    assert read_object(cache, "big") == b"x" * 9
+    assert cache.stats()["objects"] == 0
+    # Only the first read opens it to find its size; then it is known to be too large
+    assert len(reads) == 3
+
+
+def test_writes_invalidate_the_cached_copy(cache, local_storage, read_object):
+    put(local_storage, "a", b"old")
+    read_object(cache, "a")
+    wait_until_filled(cache)
+
+    put(cache, "a", b"new")
+
+    assert read_object(cache, "a") == b"new"
+    cache.delete_file("a", "b")
+    with pytest.raises(FileNotFoundError):
+        cache.get_object("a", "b")
+
+
+def test_copies_written_meanwhile_are_served_but_not_kept(cache, local_storage, reads, read_object):
+    put(local_storage, "a", b"old")
+    release = threading.Event()
+
+    def gated(iter_chunks):
+        def iterate(chunk_size):
+            release.wait()
+            yield from iter_chunks(chunk_size)
+        return iterate
+
+    reads.hooks.append(gated)
+    stored = cache.get_object("a", "b")
+    put(cache, "a", b"new")
+    release.set()
+
+    assert b"".join(stored.iter_chunks(1024)) == b"old"
+    wait_until_filled(cache)
+    assert cache.stats()["objects"] == 0
+    assert read_object(cache, "a") == b"new"
+
+
+def test_readers_resume_from_the_backend_when_a_copy_fails(cache, local_storage, reads, monkeypatch):
+    monkeypatch.setattr(cached, "COPY_CHUNK_SIZE", 2)
+    put(local_storage, "a", b"abcdef")
+    # The copy fails once the reader follows it
+    failed = threading.Event()
+
+    def broken(iter_chunks):
+        def iterate(chunk_size):
+            chunks = iter_chunks(chunk_size)
+            yield next(chunks)
+            chunks.close()
+            failed.wait()
+            raise OSError("connection reset")
+        return iterate
+
+    reads.hooks.append(broken)
+    stored = cache.get_object("a", "b")
+    failed.set()
+
+    assert b"".join(stored.iter_chunks(1024)) == b"abcdef"
+    wait_until_filled(cache)
+    assert reads[-1] == ("a", "bytes=2-5")
+    assert cache.stats()["objects"] == 0
+    assert list((cache.root / "tmp").iterdir()) == []
+
+
+def test_stale_copies_are_revalidated(cache, local_storage, read_object):
+    put(local_storage, "a", b"old")
+    read_object(cache, "a")
+    wait_until_filled(cache)
+    cache.revalidate_after = 0
+
+    # Written straight to the backend, bypassing the cache
+    put(local_storage, "a", b"new")
+
+    assert read_object(cache, "a") == b"new"
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_copies_of_dead_processes_are_swept(local_storage, tmp_path):
+    root = tmp_path / "cache"
+    dead, alive = root / str(2 ** 22 + 1), root / str(os.getppid())
+    for directory in (dead, alive, root / str(os.getpid())):
+        directory.mkdir(parents=True)
+        (directory / "copy").write_bytes(b"x")
+
+    cache = CachedStorageActions(local_storage, str(root), max_bytes=10, max_object_size=8)
+    cache._filler.shutdown(wait=True)
+
+    assert not dead.exists()
+    assert (alive / "copy").exists()
+    assert not (cache.root / "copy").exists()
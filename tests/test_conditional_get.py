@@ -0,0 +1,140 @@
+import hashlib
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from config.settings import settings
+from src.application.manager import StorageManager
+from src.core.http import etag_matches, format_http_date, is_not_modified, parse_if_range
+from src.schema.requests.storage import FileObject
+
+MODIFIED = datetime(2024, 5, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ('"a"', True),
+    ('"b", "a"', True),
+    ('W/"a"', True),
+    ("*", True),
+    ('"b"', False),
+])
+def test_etag_matches_weakly(header, expected):
+    assert etag_matches(header, '"a"') is expected
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    later = format_http_date(MODIFIED + timedelta(days=1))
+
+    assert not is_not_modified('"b"', later, '"a"', MODIFIED)
+    assert is_not_modified(None, later, '"a"', MODIFIED)
+    # HTTP dates drop the fraction of a second
+    assert is_not_modified(None, format_http_date(MODIFIED), '"a"', MODIFIED)
+    assert not is_not_modified(None, format_http_date(MODIFIED - timedelta(seconds=1)), '"a"', MODIFIED)
+    assert not is_not_modified(None, "yesterday", '"a"', MODIFIED)
+    assert not is_not_modified('"a"', None, None, None)
+
+
+def test_parse_if_range():
+    assert parse_if_range(' "a" ') == '"a"'
+    assert parse_if_range('W/"a"') is None
+    assert parse_if_range("Wed, 01 May 2024 12:00:00 GMT") == MODIFIED.replace(microsecond=0)
+    assert parse_if_range("soon") is None
+
+
+@pytest.fixture
+def manager(local_storage):
+    return StorageManager("b", local_storage, engine=None, executor=None)
+
+
+def test_validators_come_from_the_metadata(manager, monkeypatch):
+    monkeypatch.setattr(settings, "PRESIGNED_UPLOAD_EXPIRATION", 3600)
+    object_id = uuid.uuid4()
+    stored = FileObject(id=object_id, name="a", bucket_id=uuid.uuid4(), last_modified=MODIFIED.isoformat())
+
+    etag, last_modified = manager.file_validators(stored)
+
+    assert etag == f'"{object_id.hex}-{int(MODIFIED.timestamp() * 1_000_000):x}"'
+    assert last_modified == MODIFIED
+    assert manager.file_validators(stored.model_copy(update={"id": None})) == (None, None)
+
+    # Still inside the window a presigned url may rewrite the bytes in
+    recent = datetime.now(timezone.utc).isoformat()
+    assert manager.file_validators(stored.model_copy(update={"last_modified": recent})) == (None, None)
+
+
+@pytest.fixture
+def bucket(client, auth):
+    client.post("/v1/buckets", json={"name": "b"}, headers=auth)
+    return "b"
+
+
+@pytest.fixture
+def backend_reads(client, monkeypatch):
+    """Objects opened on the storage backend"""
+    storage = client.app.state.storage_registry.default()
+    get_object = storage.get_object
+    reads = []
+
+    def record(object_name, bucket_name, *args, **kwargs):
+        reads.append(object_name)
+        return get_object(object_name, bucket_name, *args, **kwargs)
+
+    monkeypatch.setattr(storage, "get_object", record)
+    return reads
+
+
+def test_not_modified_is_answered_from_the_metadata(client, auth, bucket, backend_reads, monkeypatch):
+    monkeypatch.setattr(settings, "PRESIGNED_UPLOAD_EXPIRATION", 0)
+    client.put("/v1/buckets/b/a.txt", content=b"hello", headers=auth)
+
+    response = client.get("/v1/buckets/b/a.txt", headers=auth)
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+    assert response.content == b"hello"
+    backend_reads.clear()
+
+    for conditional in ({"If-None-Match": etag}, {"If-Modified-Since": last_modified}):
+        response = client.get("/v1/buckets/b/a.txt", headers={**auth, **conditional})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+    assert backend_reads == []
+
+    client.put("/v1/buckets/b/a.txt", content=b"world", headers=auth)
+    response = client.get("/v1/buckets/b/a.txt", headers={**auth, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.content == b"world"
+
+
+def test_if_range_is_checked_against_the_metadata(client, auth, bucket, monkeypatch):
+    monkeypatch.setattr(settings, "PRESIGNED_UPLOAD_EXPIRATION", 0)
+    client.put("/v1/buckets/b/a.txt", content=b"hello", headers=auth)
+    etag = client.get("/v1/buckets/b/a.txt", headers=auth).headers["etag"]
+
+    matching = client.get("/v1/buckets/b/a.txt", headers={**auth, "Range": "bytes=1-2", "If-Range": etag})
+    stale = client.get("/v1/buckets/b/a.txt", headers={**auth, "Range": "bytes=1-2", "If-Range": '"old"'})
+
+    assert (matching.status_code, matching.content) == (206, b"el")
+    assert (stale.status_code, stale.content) == (200, b"hello")
+
+
+def test_presigned_puts_are_not_hidden_by_a_304(client, auth, bucket, monkeypatch):
+    monkeypatch.setattr(settings, "PRESIGNED_UPLOAD_EXPIRATION", 3600)
+    client.put("/v1/buckets/b/a.txt", content=b"old", headers=auth)
+    # Written long before any presigned url could have been issued for it
+    for objects in client.app.state.metadata_store.objects.values():
+        for row in objects.values():
+            row["last_modified"] = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+    etag = client.get("/v1/buckets/b/a.txt", headers=auth).headers["etag"]
+    assert client.get("/v1/buckets/b/a.txt", headers={**auth, "If-None-Match": etag}).status_code == 304
+
+    url = client.post("/v1/uploads/b/presigned", json={"file_name": "a.txt", "size": 3}, headers=auth).json()["url"]
+    assert client.put(url, content=b"new").status_code == 200
+
+    # The url bypasses the metadata: the backend's own validators are used until it expires
+    response = client.get("/v1/buckets/b/a.txt", headers={**auth, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.content == b"new"
+    assert response.headers["etag"] == f'"{hashlib.md5(b"new").hexdigest()}"'
+
+    response = client.get("/v1/buckets/b/a.txt", headers={**auth, "If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
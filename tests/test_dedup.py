@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+
+from config.settings import settings
+from src.application.types.dedup import DedupStorageActions, run_blob_gc
+from src.core.exceptions import ServiceUnavailableError
+from src.core.executor import StorageExecutor
+
+
+class Stream:
+    """Non-seekable readable, like a request body"""
+
+    def __init__(self, data: bytes):
+        self.source = io.BytesIO(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self.source.read(size)
+
+
+@pytest.fixture
+def sent(local_storage, monkeypatch):
+    """Blobs sent to the backend, in order"""
+    sent = []
+    upload_fileobj = local_storage.upload_fileobj
+
+    def record(file_obj, object_name, bucket_name, metadata=None):
+        sent.append(object_name)
+        return upload_fileobj(file_obj, object_name, bucket_name, metadata)
+
+    monkeypatch.setattr(local_storage, "upload_fileobj", record)
+    return sent
+
+
+@pytest.fixture
+def dedup(local_storage, sent, tmp_path):
+    dedup = DedupStorageActions(local_storage, str(tmp_path / "dedup"), grace_period=0)
+    dedup.create_bucket("b")
+    yield dedup
+    dedup._index.close()
+
+
+def blob(dedup: DedupStorageActions, digest: str):
+    return dedup._db.execute("SELECT refcount, orphaned, collecting FROM blobs WHERE digest = ?", (digest,)).fetchone()
+
+
+def test_identical_content_is_stored_once(dedup, local_storage, sent, read_object):
+    digest = hashlib.sha256(b"same").hexdigest()
+
+    assert dedup.upload_fileobj(io.BytesIO(b"same"), "a", "b")
+    assert dedup.upload_fileobj(Stream(b"same"), "copy", "b")
+
+    assert sent == [digest]
+    assert blob(dedup, digest) == (2, None, None)
+    assert read_object(dedup, "copy") == b"same"
+    stored = dedup.get_object("a", "b")
+    stored.close()
+    assert stored.etag == f'"{digest}"'
+    assert list(dedup.root.joinpath("tmp").iterdir()) == []
+
+
+def test_overwriting_and_deleting_release_references(dedup):
+    first, second = hashlib.sha256(b"one").hexdigest(), hashlib.sha256(b"two").hexdigest()
+    dedup.upload_fileobj(io.BytesIO(b"one"), "a", "b")
+    dedup.upload_fileobj(io.BytesIO(b"one"), "c", "b")
+    dedup.upload_fileobj(io.BytesIO(b"two"), "a", "b")
+
+    assert blob(dedup, first)[:2] == (1, None)
+    dedup.delete_files(["c", "missing"], "b")
+    refcount, orphaned, _ = blob(dedup, first)
+    assert refcount == 0 and orphaned is not None
+    assert blob(dedup, second)[0] == 1
+
+
+def test_orphaned_blobs_are_collected_after_the_grace_period(dedup, local_storage):
+    digest = hashlib.sha256(b"data").hexdigest()
+    dedup.upload_fileobj(io.BytesIO(b"data"), "a", "b")
+    dedup.delete_file("a", "b")
+
+    dedup.grace_period = 3600
+    assert dedup.collect_garbage() == 0
+    assert local_storage.object_exists("blobs", digest)
+
+    dedup.grace_period = 0
+    assert dedup.collect_garbage() == 1
+    assert blob(dedup, digest) is None
+    assert not local_storage.object_exists("blobs", digest)
+
+
+def test_orphaned_blobs_are_reused_until_collected(dedup, sent):
+    digest = hashlib.sha256(b"data").hexdigest()
+    dedup.upload_fileobj(io.BytesIO(b"data"), "a", "b")
+    dedup.delete_file("a", "b")
+
+    dedup.upload_fileobj(io.BytesIO(b"data"), "b", "b")
+
+    assert sent == [digest]
+    assert blob(dedup, digest) == (1, None, None)
+    assert dedup.collect_garbage() == 0
+
+
+def test_uploads_of_blobs_being_collected_are_refused(dedup):
+    digest = hashlib.sha256(b"data").hexdigest()
+    dedup.upload_fileobj(io.BytesIO(b"data"), "a", "b")
+    dedup.delete_file("a", "b")
+    dedup._db.execute("UPDATE blobs SET collecting = 1e12 WHERE digest = ?", (digest,))
+
+    with pytest.raises(ServiceUnavailableError):
+        dedup.upload_fileobj(io.BytesIO(b"data"), "a", "b")
+    assert not dedup.object_exists("b", "a")
+
+
+def test_blobs_the_backend_kept_are_collected_again(dedup, local_storage, monkeypatch):
+    digest = hashlib.sha256(b"data").hexdigest()
+    dedup.upload_fileobj(io.BytesIO(b"data"), "a", "b")
+    dedup.delete_file("a", "b")
+    monkeypatch.setattr(local_storage, "delete_files", lambda names, bucket: {name: "busy" for name in names})
+
+    assert dedup.collect_garbage() == 0
+    assert blob(dedup, digest) is not None and blob(dedup, digest)[2] is None
+
+    monkeypatch.undo()
+    assert dedup.collect_garbage() == 1
+
+
+def test_multipart_uploads_are_deduplicated(dedup, sent, read_object):
+    dedup.upload_fileobj(io.BytesIO(b"onetwo"), "whole", "b")
+    upload_id = dedup.create_multipart_upload("parts", "b")
+    parts = [
+        {"PartNumber": number, "ETag": dedup.upload_part("parts", "b", upload_id, number, data)}
+        for number, data in ((1, b"one"), (2, b"two"))
+    ]
+
+    assert dedup.complete_multipart_upload("parts", "b", upload_id, parts)
+    assert sent == [hashlib.sha256(b"onetwo").hexdigest()]
+    assert read_object(dedup, "parts") == b"onetwo"
+    assert dedup.get_presigned_upload_url("b", "x") is None
+
+
+@pytest.mark.anyio
+async def test_blob_gc_runs_until_cancelled(dedup, local_storage, monkeypatch):
+    digest = hashlib.sha256(b"data").hexdigest()
+    dedup.upload_fileobj(io.BytesIO(b"data"), "a", "b")
+    dedup.delete_file("a", "b")
+    monkeypatch.setattr(settings, "DEDUP_GC_INTERVAL", 0.01)
+    executor = StorageExecutor(max_workers=1, max_queue=1)
+
+    task = asyncio.create_task(run_blob_gc(lambda: [dedup], executor))
+    try:
+        for _ in range(100):
+            if not local_storage.object_exists("blobs", digest):
+                break
+            await asyncio.sleep(0.01)
+        assert not local_storage.object_exists("blobs", digest)
+    finally:
+        task.cancel()
+        executor.shutdown()
+    with pytest.raises(asyncio.CancelledError):
+        await task
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.exceptions import ServiceUnavailableError
+from src.core.executor import StorageExecutor
+from src.errors.handlers import setup_exception_handlers
+
+
+@pytest.fixture
+def executor():
+    executor = StorageExecutor(max_workers=1, max_queue=1)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.anyio
+async def test_run_returns_the_result_off_the_event_loop(executor):
+    name = await executor.run(lambda: threading.current_thread().name)
+
+    assert name.startswith("storage")
+    assert executor.stats()["completed"] == 1
+
+
+@pytest.mark.anyio
+async def test_run_rejects_calls_once_workers_and_queue_are_full(executor):
+    release = threading.Event()
+    blocked = [
+        asyncio.create_task(executor.run(release.wait)),
+        asyncio.create_task(executor.run(release.wait)),
+    ]
+    await wait_for(lambda: executor.stats()["running"] == 1)
+
+    with pytest.raises(ServiceUnavailableError):
+        await executor.run(lambda: None)
+    assert executor.stats()["rejected"] == 1
+
+    release.set()
+    for task in blocked:
+        await task
+    assert await executor.run(lambda: "ok") == "ok"
+
+
+@pytest.mark.anyio
+async def test_run_propagates_exceptions_and_frees_the_slot(executor):
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await executor.run(fail)
+    assert executor.stats()["queued"] == 0
+    assert executor.stats()["running"] == 0
+
+
+@pytest.mark.anyio
+async def test_iterate_pulls_every_item_on_the_pool(executor):
+    threads = []
+
+    def items():
+        for item in range(3):
+            threads.append(threading.current_thread().name)
+            yield item
+
+    assert [item async for item in executor.iterate(items())] == [0, 1, 2]
+    assert all(name.startswith("storage") for name in threads)
+
+
+@pytest.mark.anyio
+async def test_iterate_is_not_rejected_when_saturated(executor):
+    release = threading.Event()
+    blocked = asyncio.create_task(executor.run(release.wait))
+    queued = asyncio.create_task(executor.run(release.wait))
+    await wait_for(lambda: executor.stats()["running"] == 1)
+
+    # The body of a response already started is read even with no slot left
+    body = asyncio.create_task(collect(executor.iterate(iter([b"a", b"b"]))))
+    release.set()
+    assert await body == [b"a", b"b"]
+    await blocked
+    await queued
+    assert executor.stats()["rejected"] == 0
+
+
+def test_rejection_is_answered_with_503():
+    app = FastAPI()
+    setup_exception_handlers(app)
+
+    @app.get("/")
+    async def saturated():
+        raise ServiceUnavailableError("Storage backend is saturated, retry later")
+
+    response = TestClient(app).get("/")
+
+    assert response.status_code == 503
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+async def wait_for(condition, timeout: float = 5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
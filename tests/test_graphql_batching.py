@@ -0,0 +1,138 @@
+import asyncio
+import json
+import re
+
+import httpx
+import pytest
+
+from src.database.batching import GraphQLBatcher, merge_queries
+
+BUCKET = "query GetBucket($name: String!) { bucket(where: {name: {_eq: $name}}) { id } }"
+FILES = (
+    'query GetFiles($bucket: uuid!) '
+    '{ files: object(where: {bucket_id: {_eq: $bucket}, name: {_like: "a}"}}) { name } }'
+)
+
+
+def test_queries_are_merged_with_prefixed_fields_and_variables():
+    document, variables, aliases = merge_queries([(BUCKET, {"name": "b"}), (FILES, {"bucket": "id"})])
+
+    assert document.startswith("query Batch($b0_name: String!, $b1_bucket: uuid!) {")
+    assert "b0_bucket: bucket(where: {name: {_eq: $b0_name}})" in document
+    # Existing aliases stay the response key; string literals are left alone
+    assert 'b1_files: object(where: {bucket_id: {_eq: $b1_bucket}, name: {_like: "a}"}})' in document
+    assert variables == {"b0_name": "b", "b1_bucket": "id"}
+    assert aliases == [{"b0_bucket": "bucket"}, {"b1_files": "files"}]
+
+
+def test_only_plain_queries_are_merged():
+    assert merge_queries([(BUCKET, None), ("mutation { delete_object { affected_rows } }", None)]) is None
+    assert merge_queries([(BUCKET, None), ("query { broken: }", None)]) is None
+
+
+class Hasura:
+    """GraphQL endpoint answering every top-level field with its own name"""
+
+    def __init__(self, fail_merged: bool = False, status: int = 200):
+        self.fail_merged = fail_merged
+        self.status = status
+        self.documents: list[dict] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        payload["token"] = request.headers.get("Authorization")
+        self.documents.append(payload)
+        if self.status != 200:
+            return httpx.Response(self.status)
+        if payload["query"].startswith("query Batch"):
+            if self.fail_merged:
+                return httpx.Response(200, json={"errors": [{"message": "bad field"}]})
+            fields = re.findall(r"(b\d+_\w+): ", payload["query"])
+            return httpx.Response(200, json={"data": {field: field for field in fields}})
+        return httpx.Response(200, json={"data": {"alone": payload.get("variables")}})
+
+
+@pytest.fixture
+def hasura():
+    return Hasura()
+
+
+@pytest.fixture
+async def batcher(hasura):
+    async with httpx.AsyncClient(transport=httpx.MockTransport(hasura)) as client:
+        yield GraphQLBatcher(client, "http://hasura/v1/graphql", window=0.01, max_size=10)
+
+
+def query(batcher: GraphQLBatcher, text: str, variables: dict, token: str = "Bearer a"):
+    return batcher.execute(text, variables, {"Authorization": token})
+
+
+@pytest.mark.anyio
+async def test_queries_within_the_window_share_one_document(batcher, hasura):
+    results = await asyncio.gather(
+        query(batcher, BUCKET, {"name": "b"}),
+        query(batcher, FILES, {"bucket": "id"}),
+        query(batcher, BUCKET, {"name": "b"}),
+    )
+
+    assert len(hasura.documents) == 1
+    assert hasura.documents[0]["variables"] == {"b0_name": "b", "b1_bucket": "id"}
+    assert results == [
+        {"data": {"bucket": "b0_bucket"}},
+        {"data": {"files": "b1_files"}},
+        {"data": {"bucket": "b0_bucket"}},
+    ]
+    assert batcher.stats() == {"pending_batches": 0, "queries": 3, "documents": 1, "fallbacks": 0}
+
+
+@pytest.mark.anyio
+async def test_batches_are_split_by_token(batcher, hasura):
+    results = await asyncio.gather(
+        query(batcher, BUCKET, {"name": "b"}, token="Bearer a"),
+        query(batcher, BUCKET, {"name": "b"}, token="Bearer b"),
+    )
+
+    # Each batch holds a single query, sent as it is
+    assert sorted(document["token"] for document in hasura.documents) == ["Bearer a", "Bearer b"]
+    assert [document["query"] for document in hasura.documents] == [BUCKET, BUCKET]
+    assert results == [{"data": {"alone": {"name": "b"}}}] * 2
+
+
+@pytest.mark.anyio
+async def test_full_batches_are_sent_without_waiting(hasura):
+    async with httpx.AsyncClient(transport=httpx.MockTransport(hasura)) as client:
+        batcher = GraphQLBatcher(client, "http://hasura/v1/graphql", window=60, max_size=2)
+        results = await asyncio.wait_for(asyncio.gather(
+            query(batcher, BUCKET, {"name": "a"}),
+            query(batcher, BUCKET, {"name": "b"}),
+        ), timeout=5)
+
+    assert len(hasura.documents) == 1
+    assert results == [{"data": {"bucket": "b0_bucket"}}, {"data": {"bucket": "b1_bucket"}}]
+
+
+@pytest.mark.anyio
+async def test_rejected_documents_fall_back_to_single_queries(batcher, hasura):
+    hasura.fail_merged = True
+
+    results = await asyncio.gather(
+        query(batcher, BUCKET, {"name": "a"}),
+        query(batcher, BUCKET, {"name": "b"}),
+    )
+
+    assert results == [{"data": {"alone": {"name": "a"}}}, {"data": {"alone": {"name": "b"}}}]
+    assert len(hasura.documents) == 3
+    assert batcher.stats()["fallbacks"] == 1
+
+
+@pytest.mark.anyio
+async def test_http_errors_reach_every_caller(batcher, hasura):
+    hasura.status = 503
+
+    results = await asyncio.gather(
+        query(batcher, BUCKET, {"name": "a"}),
+        query(batcher, BUCKET, {"name": "b"}),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
@@ -0,0 +1,71 @@
+import pytest
+
+from src.core.exceptions import RangeNotSatisfiableError
+from src.core.http import parse_byte_range, resolve_byte_range
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", "bytes=0-99"),
+    ("bytes=100-", "bytes=100-"),
+    ("bytes=-50", "bytes=-50"),
+    ("bytes = 5 - 9", "bytes=5-9"),
+    (None, None),
+    ("", None),
+    ("bytes=-", None),
+    ("bytes=9-5", None),
+    ("bytes=0-1,4-5", None),
+    ("items=0-1", None),
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header) == expected
+
+
+@pytest.mark.parametrize("byte_range, expected", [
+    (None, (0, 99, None)),
+    ("bytes=0-9", (0, 9, "bytes 0-9/100")),
+    ("bytes=90-", (90, 99, "bytes 90-99/100")),
+    ("bytes=90-500", (90, 99, "bytes 90-99/100")),
+    ("bytes=-10", (90, 99, "bytes 90-99/100")),
+    ("bytes=-500", (0, 99, "bytes 0-99/100")),
+])
+def test_resolve_byte_range(byte_range, expected):
+    assert resolve_byte_range(byte_range, 100) == expected
+
+
+def test_resolve_byte_range_past_the_end():
+    with pytest.raises(RangeNotSatisfiableError):
+        resolve_byte_range("bytes=100-", 100)
+
+
+def test_download_serves_a_range(client, auth):
+    body = bytes(range(256)) * 4
+    client.post("/v1/buckets", json={"name": "b"}, headers=auth)
+    client.put("/v1/buckets/b/object.bin", content=body, headers=auth)
+
+    response = client.get("/v1/buckets/b/object.bin", headers={**auth, "Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 10-19/{len(body)}"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.content == body[10:20]
+
+
+def test_download_without_range_streams_everything(client, auth):
+    body = b"x" * 100_000
+    client.post("/v1/buckets", json={"name": "b"}, headers=auth)
+    client.put("/v1/buckets/b/object.bin", content=body, headers=auth)
+
+    response = client.get("/v1/buckets/b/object.bin", headers=auth)
+
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(body))
+    assert response.content == body
+
+
+def test_download_of_an_unsatisfiable_range(client, auth):
+    client.post("/v1/buckets", json={"name": "b"}, headers=auth)
+    client.put("/v1/buckets/b/object.bin", content=b"0123456789", headers=auth)
+
+    response = client.get("/v1/buckets/b/object.bin", headers={**auth, "Range": "bytes=50-"})
+
+    assert response.status_code == 416
@@ -0,0 +1,83 @@
+import hashlib
+import time
+import uuid
+
+import pytest
+from jose import jwt
+
+from config.settings import settings
+from src.api import deps
+from src.api.deps import verify_token
+from src.core.cache import MISSING, TTLCache
+from src.core.exceptions import UnauthorizedError
+
+
+@pytest.fixture
+def cache():
+    return TTLCache(max_size=10, ttl=60)
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    calls = []
+    decode = jwt.decode
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(deps.jwt, "decode", counting)
+    return calls
+
+
+def test_verified_token_is_cached(cache, decodes, token_for, user_id):
+    token = token_for(user_id)
+
+    assert verify_token(token, cache) == user_id
+    assert verify_token(token, cache) == user_id
+    assert len(decodes) == 1
+
+
+def test_cache_entry_does_not_outlive_the_token(cache, token_for, user_id):
+    token = token_for(user_id, expires_in=-10)
+    digest = hashlib.sha256(token.encode()).digest()
+    # As if cached while still valid
+    cache.set(digest, (user_id, int(time.time()) - 10))
+
+    with pytest.raises(UnauthorizedError):
+        verify_token(token, cache)
+
+
+def test_ttl_is_capped_by_the_token_expiry(cache, token_for, user_id):
+    token = token_for(user_id, expires_in=1)
+    verify_token(token, cache)
+
+    time.sleep(1.1)
+
+    assert cache.get(hashlib.sha256(token.encode()).digest()) is MISSING
+
+
+def test_invalid_tokens_are_rejected_and_not_cached(cache, user_id):
+    forged = jwt.encode({"sub": str(user_id), "aud": "authenticated"}, "wrong-secret", algorithm=settings.ALGORITHM)
+    other_audience = jwt.encode({"sub": str(user_id), "aud": "anon"}, settings.GOTRUE_JWT_SECRET,
+                                algorithm=settings.ALGORITHM)
+
+    for token in (forged, other_audience, "not-a-jwt"):
+        with pytest.raises(UnauthorizedError):
+            verify_token(token, cache)
+    assert cache.stats()["size"] == 0
+
+
+def test_subject_must_be_a_uuid(cache):
+    token = jwt.encode({"sub": "admin", "aud": "authenticated"}, settings.GOTRUE_JWT_SECRET,
+                       algorithm=settings.ALGORITHM)
+
+    with pytest.raises(UnauthorizedError):
+        verify_token(token, cache)
+
+
+def test_requests_without_a_valid_token_are_refused(client, token_for):
+    assert client.post("/v1/buckets", json={"name": "b"}).status_code in (401, 403)
+
+    expired = {"Authorization": f"Bearer {token_for(uuid.uuid4(), expires_in=-10)}"}
+    assert client.post("/v1/buckets", json={"name": "b"}, headers=expired).status_code == 401
@@ -0,0 +1,126 @@
+import hashlib
+import io
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from src.application.types.local import LocalStorageActions, _prefix_upper_bound
+from src.core.exceptions import PreconditionFailedError
+
+
+def md5(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+
+def test_objects_are_written_atomically_and_indexed(local_storage, read_object):
+    assert local_storage.upload_fileobj(io.BytesIO(b"hello world"), "docs/a.txt", "b")
+
+    stored = local_storage.get_object("docs/a.txt", "b")
+    stored.close()
+    assert stored.etag == f'"{md5(b"hello world")}"'
+    assert stored.content_type == "text/plain"
+    assert stored.content_length == 11
+    assert read_object(local_storage, "docs/a.txt") == b"hello world"
+    assert read_object(local_storage, "docs/a.txt", byte_range="bytes=6-") == b"world"
+
+    digest = hashlib.sha256(b"docs/a.txt").hexdigest()
+    assert (local_storage.root / "buckets" / "b" / digest[:2] / digest[2:4] / digest).read_bytes() == b"hello world"
+    assert list((local_storage.root / "tmp").iterdir()) == []
+
+
+def test_uploads_need_an_existing_bucket(local_storage):
+    assert not local_storage.upload_fileobj(io.BytesIO(b"x"), "a", "missing")
+    assert not local_storage.create_bucket("../escape")
+    with pytest.raises(FileNotFoundError):
+        local_storage.create_multipart_upload("a", "missing")
+    assert list((local_storage.root / "tmp").iterdir()) == []
+
+
+def test_preconditions_are_checked_against_the_stored_object(local_storage, read_object):
+    local_storage.upload_fileobj(io.BytesIO(b"data"), "a", "b")
+    etag = f'"{md5(b"data")}"'
+
+    assert read_object(local_storage, "a", if_match=etag) == b"data"
+    with pytest.raises(PreconditionFailedError):
+        local_storage.get_object("a", "b", if_match='"other"')
+    with pytest.raises(PreconditionFailedError):
+        local_storage.get_object("a", "b", if_unmodified_since=datetime.now(timezone.utc) - timedelta(days=1))
+    with pytest.raises(FileNotFoundError):
+        local_storage.get_object("missing", "b")
+
+
+def test_multipart_uploads_are_assembled_with_an_s3_etag(local_storage, read_object):
+    upload_id = local_storage.create_multipart_upload("big", "b")
+    local_storage.upload_part("big", "b", upload_id, 2, b"stale")
+    second = local_storage.upload_part("big", "b", upload_id, 2, b"-two")
+    first = local_storage.upload_part("big", "b", upload_id, 1, b"one")
+
+    # Parts are only found under their own upload and key
+    with pytest.raises(FileNotFoundError):
+        local_storage.upload_part("other", "b", upload_id, 3, b"x")
+    assert not local_storage.complete_multipart_upload("big", "b", upload_id, [{"PartNumber": 2, "ETag": '"bad"'}])
+
+    parts = [{"PartNumber": 1, "ETag": first}, {"PartNumber": 2, "ETag": second}]
+    assert local_storage.complete_multipart_upload("big", "b", upload_id, parts)
+
+    stored = local_storage.get_object("big", "b")
+    stored.close()
+    expected = md5(bytes.fromhex(md5(b"one")) + bytes.fromhex(md5(b"-two")))
+    assert stored.etag == f'"{expected}-2"'
+    assert read_object(local_storage, "big") == b"one-two"
+    assert list((local_storage.root / "uploads").iterdir()) == []
+
+
+def test_aborted_uploads_are_not_recreated_by_late_parts(local_storage, monkeypatch):
+    upload_id = local_storage.create_multipart_upload("big", "b")
+    write_temp = local_storage._write_temp
+
+    def abort_while_writing(chunks):
+        written = write_temp(chunks)
+        assert local_storage.abort_multipart_upload("big", "b", upload_id)
+        return written
+
+    monkeypatch.setattr(local_storage, "_write_temp", abort_while_writing)
+
+    with pytest.raises(FileNotFoundError):
+        local_storage.upload_part("big", "b", upload_id, 1, b"late")
+    assert list((local_storage.root / "uploads").iterdir()) == []
+    assert list((local_storage.root / "tmp").iterdir()) == []
+
+
+def test_deletes_and_listings_use_the_index(local_storage):
+    for name in ("a/1", "a/2", "b/1"):
+        local_storage.upload_fileobj(io.BytesIO(name.encode()), name, "b")
+
+    assert local_storage.delete_files(["a/2", "missing"], "b") == {"a/2": None, "missing": None}
+    assert local_storage.delete_file("b/1", "b")
+    assert local_storage.list_files("b") == ["a/1"]
+    assert not local_storage.object_exists("b", "b/1")
+
+
+def test_prefix_upper_bound():
+    assert _prefix_upper_bound("a/") == "a0"
+    assert _prefix_upper_bound("a\U0010FFFF") == "b"
+    assert _prefix_upper_bound("\U0010FFFF") is None
+
+
+def test_presigned_urls_are_signed_and_expire(local_storage):
+    url = urlsplit(local_storage.get_presigned_part_url("b", "my file", "abc", 3, expiration=60))
+    params = {key: values[0] for key, values in parse_qs(url.query).items()}
+    assert url.path.endswith("/b/my%20file")
+
+    expires, signature = int(params["expires"]), params["signature"]
+    assert local_storage.verify_signature("PUT", "b", "my file", expires, signature, "abc", 3)
+    assert not local_storage.verify_signature("PUT", "b", "my file", expires, signature, "abc", 4)
+    assert not local_storage.verify_signature("GET", "b", "my file", expires, signature, "abc", 3)
+
+    expired = int(time.time()) - 1
+    signature = local_storage.sign("GET", "b", "my file", expired)
+    assert not local_storage.verify_signature("GET", "b", "my file", expired, signature)
+
+
+def test_unknown_fsync_policy(tmp_path):
+    with pytest.raises(ValueError):
+        LocalStorageActions(str(tmp_path), fsync="sometimes")
@@ -0,0 +1,113 @@
+import uuid
+
+import pytest
+
+from src.core.exceptions import BucketNotFound, ConflictError, ValidationError
+from src.database.memory import InMemoryEngine, MemoryMetadataStore
+from src.schema.requests.storage import Bucket
+
+
+@pytest.fixture
+def store():
+    return MemoryMetadataStore()
+
+
+@pytest.fixture
+def engine(store):
+    return InMemoryEngine(store)
+
+
+@pytest.mark.anyio
+async def test_buckets_are_unique_per_owner(engine):
+    owner = uuid.uuid4()
+    created = await engine.create_bucket(Bucket(name="b", public=True), owner)
+
+    assert await engine.get_bucket_by_id_user("b", owner) == created
+    assert await engine.get_bucket_by_id_user("b", uuid.uuid4()) is None
+    assert await engine.fetch_public_bucket_ids() == {created.id}
+    with pytest.raises(ConflictError):
+        await engine.create_bucket(Bucket(name="b"), owner)
+    with pytest.raises(ValidationError):
+        await engine.create_bucket(Bucket(name=""), owner)
+
+    # Another owner may reuse the name
+    assert (await engine.create_bucket(Bucket(name="b"), uuid.uuid4())).id != created.id
+
+
+@pytest.mark.anyio
+async def test_engines_share_their_store(store, engine):
+    owner = uuid.uuid4()
+    await engine.create_bucket(Bucket(name="b"), owner)
+    await engine.create_file("b", "a", owner)
+
+    other = InMemoryEngine(store)
+    assert (await other.get_file("b", "a", owner)).name == "a"
+
+
+@pytest.mark.anyio
+async def test_upsert_keeps_the_object_id(engine):
+    owner = uuid.uuid4()
+    await engine.create_bucket(Bucket(name="b"), owner)
+
+    first = await engine.create_file("b", "a", owner)
+    page = await engine.get_file_rows("b", owner, limit=10)
+    again = await engine.create_file("b", "a", owner)
+
+    assert again["id"] == first["id"]
+    assert again["last_modified"] >= first["last_modified"]
+    # Rows are replaced, so the page handed out before stays as it was
+    assert page[0]["last_modified"] == first["last_modified"]
+    assert [row["name"] for row in await engine.get_file_rows("b", owner, limit=10)] == ["a"]
+    with pytest.raises(BucketNotFound):
+        await engine.create_file("missing", "a", owner)
+
+
+@pytest.mark.anyio
+async def test_file_pages_are_ordered_by_name(engine):
+    owner = uuid.uuid4()
+    await engine.create_bucket(Bucket(name="b"), owner)
+    for name in ("logs/2", "a", "logs/1", "z", "logs/3"):
+        await engine.create_file("b", name, owner)
+
+    async def names(**kwargs):
+        return [row["name"] for row in await engine.get_file_rows("b", owner, **kwargs)]
+
+    assert await names(limit=2) == ["a", "logs/1"]
+    assert await names(limit=2, after="logs/1") == ["logs/2", "logs/3"]
+    assert await names(limit=10, prefix="logs/") == ["logs/1", "logs/2", "logs/3"]
+    assert await names(limit=10, prefix="logs/", after="logs/2") == ["logs/3"]
+    assert await names(limit=10, prefix="m") == []
+    assert await engine.get_file_rows("b", uuid.uuid4(), limit=10) == []
+
+
+@pytest.mark.anyio
+async def test_deletes_update_the_index(engine):
+    owner = uuid.uuid4()
+    await engine.create_bucket(Bucket(name="b"), owner)
+    for name in ("a", "b", "c"):
+        await engine.create_file("b", name, owner)
+
+    assert await engine.delete_file("b", "b", owner)
+    with pytest.raises(FileNotFoundError):
+        await engine.delete_file("b", "b", owner)
+    with pytest.raises(FileNotFoundError):
+        await engine.delete_file("b", "a", uuid.uuid4())
+
+    deleted = await engine.delete_files("b", ["c", "missing"], owner)
+    assert [file.name for file in deleted] == ["c"]
+    assert [row["name"] for row in await engine.get_file_rows("b", owner, limit=10)] == ["a"]
+    assert [file.name for file in await engine.get_files_by_name("b", ["a", "c"], owner)] == ["a"]
+
+
+@pytest.mark.anyio
+async def test_bucket_pages_seek_past_the_cursor(engine):
+    owner = uuid.uuid4()
+    for name in ("c", "a", "b"):
+        await engine.create_bucket(Bucket(name=name), owner)
+    await engine.create_bucket(Bucket(name="other"), uuid.uuid4())
+
+    first = await engine.get_buckets(owner, limit=2)
+    rest = await engine.get_buckets(owner, limit=2, after=(first[-1].name, str(first[-1].id)))
+
+    assert [bucket.name for bucket in first] == ["a", "b"]
+    assert [bucket.name for bucket in rest] == ["c"]
@@ -0,0 +1,80 @@
+import json
+import uuid
+
+import pytest
+
+from config.settings import settings
+from src.database.memory import InMemoryEngine, MemoryMetadataStore
+from src.schema.requests.storage import Bucket
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+@pytest.fixture
+def objects(client, auth, monkeypatch):
+    monkeypatch.setattr(settings, "FILES_STREAM_PAGE_SIZE", 2)
+    client.post("/v1/buckets", json={"name": "b"}, headers=auth)
+    names = [f"{index:02d}.txt" for index in range(7)]
+    for name in names:
+        client.post("/v1/buckets/b", files={"file": (name, b"x")}, headers=auth)
+    return names
+
+
+def test_whole_bucket_is_streamed_as_ndjson(client, auth, objects):
+    response = client.get("/v1/buckets/b", headers={**auth, **NDJSON})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == objects
+    assert all("last_modified" in row for row in rows)
+
+
+def test_stream_honours_prefix_and_cursor(client, auth, objects):
+    page = client.get("/v1/buckets/b", params={"limit": 3}, headers=auth).json()
+
+    response = client.get("/v1/buckets/b", params={"cursor": page["next_cursor"], "prefix": "0"},
+                          headers={**auth, **NDJSON})
+
+    assert [json.loads(line)["name"] for line in response.text.splitlines()] == objects[3:]
+
+
+def test_bad_cursor_fails_before_streaming(client, auth, objects):
+    response = client.get("/v1/buckets/b", params={"cursor": "garbage!"}, headers={**auth, **NDJSON})
+
+    assert response.status_code == 422
+
+
+def test_empty_bucket_streams_nothing(client, auth):
+    client.post("/v1/buckets", json={"name": "b"}, headers=auth)
+
+    response = client.get("/v1/buckets/b", headers={**auth, **NDJSON})
+
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+@pytest.mark.anyio
+async def test_iter_files_walks_every_page():
+    owner = uuid.uuid4()
+    engine = InMemoryEngine(MemoryMetadataStore())
+    bucket = await engine.create_bucket(Bucket(name="b"), owner)
+    for index in range(5):
+        await engine.upsert_file(bucket.id, f"{index}")
+
+    pages = [[row["name"] for row in page] async for page in engine.iter_files("b", owner, page_size=2)]
+
+    assert pages == [["0", "1"], ["2", "3"], ["4"]]
+
+
+@pytest.mark.anyio
+async def test_iter_files_stops_on_a_full_last_page():
+    owner = uuid.uuid4()
+    engine = InMemoryEngine(MemoryMetadataStore())
+    bucket = await engine.create_bucket(Bucket(name="b"), owner)
+    for index in range(4):
+        await engine.upsert_file(bucket.id, f"{index}")
+
+    pages = [[row["name"] for row in page] async for page in engine.iter_files("b", owner, page_size=2)]
+
+    assert pages == [["0", "1"], ["2", "3"]]
@@ -0,0 +1,86 @@
+import io
+
+import pytest
+
+from src.core.exceptions import ValidationError
+from src.core.pagination import decode_cursor, encode_cursor, like_prefix
+
+NAMES = ["a/1.txt", "a/2.txt", "a/3.txt", "b/1.txt", "c.txt"]
+
+
+@pytest.fixture
+def objects(client, auth):
+    client.post("/v1/buckets", json={"name": "b"}, headers=auth)
+    for name in reversed(NAMES):
+        client.post("/v1/buckets/b", files={"file": (name, name.encode())}, headers=auth)
+    return NAMES
+
+
+def list_all(client, auth, **params) -> list[list[str]]:
+    pages = []
+    cursor = None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/v1/buckets/b", params=query, headers=auth).json()
+        pages.append([item["name"] for item in body["items"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("a/é.txt")) == ("a/é.txt",)
+    assert decode_cursor(encode_cursor("bucket", "id"), parts=2) == ("bucket", "id")
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
+
+
+@pytest.mark.parametrize("cursor", ["%%%", encode_cursor("a", "b"), "eyJrIjpbMV19", "eyJ4IjpbXX0"])
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
+
+
+def test_like_prefix_escapes_wildcards():
+    assert like_prefix("50%_off\\") == "50\\%\\_off\\\\%"
+
+
+def test_files_are_paginated_in_name_order(client, auth, objects):
+    assert list_all(client, auth, limit=2) == [["a/1.txt", "a/2.txt"], ["a/3.txt", "b/1.txt"], ["c.txt"]]
+
+
+def test_prefix_filter(client, auth, objects):
+    assert list_all(client, auth, limit=2, prefix="a/") == [["a/1.txt", "a/2.txt"], ["a/3.txt"]]
+    assert list_all(client, auth, prefix="z") == [[]]
+
+
+def test_pages_resume_after_the_cursor_key(client, auth, objects):
+    first = client.get("/v1/buckets/b", params={"limit": 2}, headers=auth).json()
+    # Written before the cursor: neither repeated nor shifting the next page
+    client.post("/v1/buckets/b", files={"file": ("a/0.txt", b"new")}, headers=auth)
+
+    second = client.get("/v1/buckets/b", params={"limit": 2, "cursor": first["next_cursor"]}, headers=auth).json()
+
+    assert [item["name"] for item in second["items"]] == ["a/3.txt", "b/1.txt"]
+
+
+def test_invalid_cursor_is_a_422(client, auth, objects):
+    assert client.get("/v1/buckets/b", params={"cursor": "garbage!"}, headers=auth).status_code == 422
+
+
+def test_page_size_is_bounded(client, auth, objects):
+    assert client.get("/v1/buckets/b", params={"limit": 0}, headers=auth).status_code == 422
+    assert client.get("/v1/buckets/b", params={"limit": 100000}, headers=auth).status_code == 422
+
+
+def test_local_key_pages(local_storage):
+    for name in NAMES + ["a0", "a￿"]:
+        local_storage.upload_fileobj(file_obj=io.BytesIO(b"x"), object_name=name, bucket_name="b")
+
+    keys, token = local_storage.list_files_page("b", prefix="a/", max_keys=2)
+    assert keys == ["a/1.txt", "a/2.txt"]
+    keys, token = local_storage.list_files_page("b", prefix="a/", continuation_token=token, max_keys=2)
+    assert keys == ["a/3.txt"] and token is None
+
+    keys, _ = local_storage.list_files_page("b", prefix="a")
+    assert keys == ["a/1.txt", "a/2.txt", "a/3.txt", "a0", "a￿"]
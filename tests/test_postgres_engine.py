@@ -0,0 +1,144 @@
+import os
+import uuid
+from datetime import datetime, timezone
+
+import asyncpg
+import pytest
+
+from config.settings import settings
+from src.database import postgres
+from src.database.postgres import PostgresEngine, _object_row, create_database_pool
+from src.schema.requests.storage import Bucket
+
+# Integration tests run against a disposable database: they create the storage schema they need
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+SCHEMA = """
+    CREATE SCHEMA IF NOT EXISTS storage;
+    CREATE TABLE storage.bucket (
+        id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+        name text NOT NULL,
+        owner uuid NOT NULL,
+        public boolean NOT NULL DEFAULT false,
+        UNIQUE (owner, name)
+    );
+    CREATE TABLE storage.object (
+        id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+        bucket_id uuid NOT NULL REFERENCES storage.bucket (id) ON DELETE CASCADE,
+        name text NOT NULL,
+        last_modified timestamptz NOT NULL DEFAULT now(),
+        UNIQUE (bucket_id, name)
+    );
+"""
+
+
+def test_object_rows_are_shaped_like_hasura_json():
+    bucket_id, object_id = uuid.uuid4(), uuid.uuid4()
+    modified = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    row = _object_row({"bucket_id": bucket_id, "id": object_id, "name": "a.txt", "last_modified": modified})
+
+    assert row == {
+        "bucket_id": str(bucket_id),
+        "id": str(object_id),
+        "name": "a.txt",
+        "last_modified": "2024-01-02T03:04:05+00:00",
+    }
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("url, expected", [
+    ("postgresql://user:secret@db:5432/storage", {"dsn": "postgresql://user:secret@db:5432/storage"}),
+    ("db", {"host": "db", "port": 6543, "user": "user", "password": "secret", "database": "storage"}),
+])
+async def test_pool_is_built_from_the_database_settings(monkeypatch, url, expected):
+    calls = []
+
+    async def create_pool(**kwargs):
+        calls.append(kwargs)
+
+    monkeypatch.setattr(postgres.asyncpg, "create_pool", create_pool)
+    for name, value in {
+        "DATABASE_URL": url, "DATABASE_PORT": "6543", "DATABASE_USERNAME": "user",
+        "DATABASE_PASSWORD": "secret", "DATABASE_NAME": "storage", "DATABASE_POOL_MAX_SIZE": 7,
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+
+    await create_database_pool()
+
+    assert calls[0].items() >= expected.items()
+    assert calls[0]["max_size"] == 7
+    assert calls[0]["statement_cache_size"] == settings.DATABASE_STATEMENT_CACHE_SIZE
+
+
+@pytest.fixture
+async def engine():
+    if not DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    pool = await asyncpg.create_pool(dsn=DATABASE_URL, min_size=1, max_size=2)
+    async with pool.acquire() as connection:
+        await connection.execute("DROP TABLE IF EXISTS storage.object, storage.bucket")
+        await connection.execute(SCHEMA)
+    try:
+        yield PostgresEngine(pool)
+    finally:
+        async with pool.acquire() as connection:
+            await connection.execute("DROP TABLE IF EXISTS storage.object, storage.bucket")
+        await pool.close()
+
+
+@pytest.mark.anyio
+async def test_buckets_are_scoped_to_their_owner(engine):
+    owner, other = uuid.uuid4(), uuid.uuid4()
+    created = await engine.create_bucket(Bucket(name="photos", public=True), owner)
+
+    assert await engine.get_bucket_by_id_user("photos", owner) == created
+    assert await engine.get_bucket_by_id_user("photos", other) is None
+    assert await engine.fetch_public_bucket_ids() == {created.id}
+
+
+@pytest.mark.anyio
+async def test_files_are_upserted_listed_and_deleted(engine):
+    owner = uuid.uuid4()
+    bucket = await engine.create_bucket(Bucket(name="b"), owner)
+    first = await engine.upsert_file(bucket.id, "50%_a")
+    for name in ("50%_b", "500", "c"):
+        await engine.upsert_file(bucket.id, name)
+
+    again = await engine.upsert_file(bucket.id, "50%_a")
+    assert again["id"] == first["id"]
+    assert again["last_modified"] >= first["last_modified"]
+
+    # LIKE wildcards in the prefix are matched literally
+    page = await engine.get_file_rows("b", owner, limit=10, prefix="50%_")
+    assert [row["name"] for row in page] == ["50%_a", "50%_b"]
+    page = await engine.get_file_rows("b", owner, limit=2, after="50%_b")
+    assert [row["name"] for row in page] == ["500", "c"]
+
+    deleted = await engine.delete_files("b", ["c", "missing"], owner)
+    assert [file.name for file in deleted] == ["c"]
+    assert await engine.delete_files("b", ["500"], uuid.uuid4()) == []
+    assert [file.name for file in await engine.get_files_by_name("b", ["500", "c"], owner)] == ["500"]
+
+
+@pytest.mark.anyio
+async def test_bucket_pages_seek_past_the_cursor(engine):
+    owner = uuid.uuid4()
+    for name in ("c", "a", "b"):
+        await engine.create_bucket(Bucket(name=name), owner)
+
+    first = await engine.get_buckets(owner, limit=2)
+    rest = await engine.get_buckets(owner, limit=2, after=(first[-1].name, str(first[-1].id)))
+
+    assert [bucket.name for bucket in first + rest] == ["a", "b", "c"]
+
+
+@pytest.mark.anyio
+async def test_deleting_a_file_of_another_owner_raises(engine):
+    owner = uuid.uuid4()
+    bucket = await engine.create_bucket(Bucket(name="b"), owner)
+    await engine.upsert_file(bucket.id, "a")
+
+    with pytest.raises(FileNotFoundError):
+        await engine.delete_file("b", "a", uuid.uuid4())
+    assert await engine.delete_file("b", "a", owner)
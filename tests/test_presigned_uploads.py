@@ -0,0 +1,87 @@
+import pytest
+
+from config.settings import settings
+
+
+@pytest.fixture
+def bucket(client, auth):
+    client.post("/v1/buckets", json={"name": "b"}, headers=auth)
+    return "b"
+
+
+def presign(client, auth, file_name, size):
+    response = client.post("/v1/uploads/b/presigned", json={"file_name": file_name, "size": size}, headers=auth)
+    assert response.status_code == 201
+    return response.json()
+
+
+def complete(client, auth, file_name, upload_id=None, parts=()):
+    return client.post(
+        "/v1/uploads/b/presigned/complete",
+        json={"file_name": file_name, "upload_id": upload_id, "parts": list(parts)},
+        headers=auth
+    )
+
+
+def test_single_put_upload(client, auth, bucket):
+    upload = presign(client, auth, "direct.txt", 5)
+    assert upload["upload_id"] is None and upload["parts"] == []
+
+    # No bearer token: the signature is the authorization
+    assert client.put(upload["url"], content=b"hello").status_code == 200
+    assert complete(client, auth, "direct.txt").status_code == 201
+
+    assert client.get("/v1/buckets/b/direct.txt", headers=auth).content == b"hello"
+
+
+def test_multipart_upload(client, auth, bucket, monkeypatch):
+    monkeypatch.setattr(settings, "PRESIGNED_MULTIPART_THRESHOLD", 10)
+    monkeypatch.setattr(settings, "S3_MULTIPART_PART_SIZE", 8)
+    body = b"0123456789abcdefghij"
+
+    upload = presign(client, auth, "parts.bin", len(body))
+    assert upload["url"] is None
+    assert upload["part_size"] == 8
+    assert [part["part_number"] for part in upload["parts"]] == [1, 2, 3]
+
+    uploaded = []
+    for index, part in enumerate(upload["parts"]):
+        response = client.put(part["url"], content=body[index * 8:(index + 1) * 8])
+        assert response.status_code == 200
+        uploaded.append({"part_number": part["part_number"], "etag": response.headers["etag"]})
+
+    # Parts may be listed in any order
+    assert complete(client, auth, "parts.bin", upload["upload_id"], reversed(uploaded)).status_code == 201
+    assert client.get("/v1/buckets/b/parts.bin", headers=auth).content == body
+
+
+def test_tampered_url_is_forbidden(client, auth, bucket):
+    upload = presign(client, auth, "direct.txt", 5)
+
+    assert client.put(upload["url"].replace("direct.txt", "other.txt"), content=b"hello").status_code == 403
+    assert client.put(upload["url"][:-2] + "00", content=b"hello").status_code == 403
+
+
+def test_completing_an_object_never_sent_fails(client, auth, bucket):
+    presign(client, auth, "missing.txt", 5)
+
+    assert complete(client, auth, "missing.txt").status_code == 404
+    assert client.get("/v1/buckets/b/missing.txt", headers=auth).status_code == 404
+
+
+def test_completing_with_a_wrong_part_etag_is_a_conflict(client, auth, bucket, monkeypatch):
+    monkeypatch.setattr(settings, "PRESIGNED_MULTIPART_THRESHOLD", 4)
+    monkeypatch.setattr(settings, "S3_MULTIPART_PART_SIZE", 8)
+
+    upload = presign(client, auth, "parts.bin", 8)
+    client.put(upload["parts"][0]["url"], content=b"01234567")
+
+    response = complete(client, auth, "parts.bin", upload["upload_id"], [{"part_number": 1, "etag": '"0000"'}])
+
+    assert response.status_code == 409
+
+
+def test_presigning_for_a_missing_bucket(client, auth):
+    response = client.post("/v1/uploads/nope/presigned", json={"file_name": "x", "size": 1}, headers=auth)
+
+    assert response.status_code == 404
@@ -0,0 +1,74 @@
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from config.settings import settings
+from src.application.types.local import LocalStorageActions
+from src.core.cache import PresignedUrlCache
+
+
+class Signer:
+    def __init__(self, url="url"):
+        self.url = url
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return None if self.url is None else f"{self.url}-{self.calls}"
+
+
+def test_urls_are_reused_while_enough_lifetime_is_left():
+    cache = PresignedUrlCache(max_size=10, min_remaining=0.9)
+    sign = Signer()
+
+    first = cache.get(("b", "a"), 1, sign)
+    assert cache.get(("b", "a"), 1, sign) == first
+    assert cache.get(("b", "other"), 1, sign) != first
+    # A url of another lifetime is another url
+    assert cache.get(("b", "a"), 2, sign) != first
+
+    time.sleep(0.15)
+    assert cache.get(("b", "a"), 1, sign) != first
+    assert cache.stats()["signatures"] == sign.calls == 4
+
+
+def test_failed_signatures_are_not_reused():
+    cache = PresignedUrlCache(max_size=10, min_remaining=0.5)
+    sign = Signer(url=None)
+
+    assert cache.get("key", 60, sign) is None
+    assert cache.get("key", 60, sign) is None
+    assert sign.calls == 2
+
+
+def test_reused_local_urls_keep_their_signature(tmp_path):
+    storage = LocalStorageActions(
+        str(tmp_path), fsync="never", signing_key="key", url_cache=PresignedUrlCache(max_size=10, min_remaining=0.5)
+    )
+    try:
+        first = storage.get_presigned_url("b", "a.txt", expiration=60)
+        assert storage.get_presigned_url("b", "a.txt", expiration=60) == first
+
+        params = {key: values[0] for key, values in parse_qs(urlsplit(first).query).items()}
+        assert int(params["expires"]) - time.time() > 30
+        assert storage.verify_signature("GET", "b", "a.txt", int(params["expires"]), params["signature"])
+    finally:
+        storage.close()
+
+
+@pytest.fixture
+def redirect_downloads(app_settings, monkeypatch):
+    monkeypatch.setattr(settings, "DOWNLOAD_MODE", "redirect")
+
+
+def test_downloads_redirect_to_a_reused_url(redirect_downloads, client, auth):
+    client.post("/v1/buckets", json={"name": "b"}, headers=auth)
+    client.put("/v1/buckets/b/a.txt", content=b"hello", headers=auth)
+
+    first = client.get("/v1/buckets/b/a.txt", headers=auth, follow_redirects=False)
+    second = client.get("/v1/buckets/b/a.txt", headers=auth, follow_redirects=False)
+
+    assert first.status_code == 302
+    assert first.headers["location"] == second.headers["location"]
+    assert client.get(first.headers["location"]).content == b"hello"
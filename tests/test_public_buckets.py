@@ -0,0 +1,114 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from config.settings import settings
+from src.application.public import PublicBucketIndex, run_public_bucket_refresh
+from src.database.memory import InMemoryEngine, MemoryMetadataStore
+from src.schema.requests.storage import Bucket
+
+
+@pytest.fixture(autouse=True)
+def fast_refresh(app_settings, monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_BUCKETS_REFRESH_INTERVAL", 0.01)
+    monkeypatch.setattr(settings, "PUBLIC_DOWNLOAD_MODE", "stream")
+
+
+class BrokenEngine(InMemoryEngine):
+    async def fetch_public_bucket_ids(self):
+        raise ConnectionError("metadata database unreachable")
+
+
+@pytest.fixture
+def engine():
+    return InMemoryEngine(MemoryMetadataStore())
+
+
+@pytest.mark.anyio
+async def test_refresh_loads_the_public_buckets(engine):
+    index = PublicBucketIndex(max_age=60)
+    public = await engine.create_bucket(Bucket(name="pub", public=True), uuid.uuid4())
+    private = await engine.create_bucket(Bucket(name="priv"), uuid.uuid4())
+    assert not index.is_public(public.id)
+
+    await index.refresh(engine)
+
+    assert index.is_public(public.id)
+    assert not index.is_public(private.id)
+    assert index.stats()["buckets"] == 1
+
+
+@pytest.mark.anyio
+async def test_failed_refreshes_keep_the_ids_until_they_are_too_old(engine):
+    index = PublicBucketIndex(max_age=0.05)
+    public = await engine.create_bucket(Bucket(name="pub", public=True), uuid.uuid4())
+    await index.refresh(engine)
+
+    await index.refresh(BrokenEngine(engine.store))
+
+    assert index.is_public(public.id)
+    assert index.stats()["failures"] == 1
+    time.sleep(0.1)
+    assert not index.is_public(public.id)
+
+
+@pytest.mark.anyio
+async def test_refresh_runs_until_cancelled(engine):
+    index = PublicBucketIndex(max_age=60)
+    task = asyncio.create_task(run_public_bucket_refresh(index, engine))
+    await asyncio.sleep(0.05)
+    public = await engine.create_bucket(Bucket(name="pub", public=True), uuid.uuid4())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert index.is_public(public.id)
+    assert index.stats()["refreshes"] > 1
+
+
+def create_bucket(client, auth, name: str, public: bool) -> str:
+    client.post("/v1/buckets", json={"name": name, "public": public}, headers=auth)
+    client.put(f"/v1/buckets/{name}/a.txt", content=b"hello", headers=auth)
+    bucket_id = next(bucket["id"] for bucket in client.get("/v1/buckets", headers=auth).json()["items"]
+                     if bucket["name"] == name)
+    index = client.app.state.public_buckets
+    deadline = time.monotonic() + 5
+    while index.stats()["refreshes"] < 2 or (public and not index.is_public(uuid.UUID(bucket_id))):
+        assert time.monotonic() < deadline, "public buckets not refreshed"
+        time.sleep(0.01)
+    return bucket_id
+
+
+def test_public_objects_are_served_without_a_token(client, auth):
+    bucket_id = create_bucket(client, auth, "pub", public=True)
+
+    response = client.get(f"/v1/public/{bucket_id}/a.txt")
+    assert response.status_code == 200
+    assert response.content == b"hello"
+    assert response.headers["cache-control"] == settings.PUBLIC_CACHE_CONTROL
+
+    ranged = client.get(f"/v1/public/{bucket_id}/a.txt", headers={"Range": "bytes=1-2"})
+    assert (ranged.status_code, ranged.content) == (206, b"el")
+    cached = client.get(f"/v1/public/{bucket_id}/a.txt", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    assert client.get(f"/v1/public/{bucket_id}/missing.txt").status_code == 404
+
+
+def test_private_buckets_are_not_served(client, auth):
+    bucket_id = create_bucket(client, auth, "priv", public=False)
+
+    assert client.get(f"/v1/public/{bucket_id}/a.txt").status_code == 404
+    assert client.get(f"/v1/public/{uuid.uuid4()}/a.txt").status_code == 404
+
+
+def test_public_objects_redirect_to_a_presigned_url(client, auth, monkeypatch):
+    monkeypatch.setattr(settings, "PUBLIC_DOWNLOAD_MODE", "redirect")
+    bucket_id = create_bucket(client, auth, "pub", public=True)
+
+    response = client.get(f"/v1/public/{bucket_id}/a.txt", follow_redirects=False)
+
+    assert response.status_code == 302
+    assert client.get(response.headers["location"]).content == b"hello"
@@ -0,0 +1,87 @@
+import logging
+import uuid
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.core.middleware import RequestLoggingMiddleware
+
+
+def build_app(sample_rate: float = 1.0) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware, sample_rate=sample_rate)
+
+    @app.get("/id")
+    async def request_id(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]))
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    return app
+
+
+@pytest.fixture
+def logs(caplog):
+    caplog.set_level(logging.INFO, logger="src.core.middleware")
+    return caplog
+
+
+def middleware_records(logs) -> list[logging.LogRecord]:
+    return [record for record in logs.records if record.name == "src.core.middleware"]
+
+
+def completed(logs) -> list[logging.LogRecord]:
+    return [record for record in middleware_records(logs) if record.getMessage() == "Request completed"]
+
+
+def test_requests_get_an_id(logs):
+    with TestClient(build_app()) as client:
+        response = client.get("/id?x=1", headers={"User-Agent": "tests"})
+
+    request_id = response.headers["x-request-id"]
+    assert uuid.UUID(request_id)
+    assert response.json() == {"request_id": request_id}
+
+    started, done = middleware_records(logs)
+    assert (started.method, started.url, started.user_agent) == ("GET", "/id?x=1", "tests")
+    assert (done.request_id, done.status_code) == (request_id, 200)
+    assert done.process_time >= 0
+
+
+@pytest.mark.parametrize("incoming, kept", [
+    ("trace-1:a.b_c", True),
+    ("has spaces", False),
+    ("x" * 129, False),
+])
+def test_incoming_ids_are_only_kept_when_plain(incoming, kept):
+    with TestClient(build_app()) as client:
+        response = client.get("/id", headers={"X-Request-ID": incoming})
+
+    assert (response.headers["x-request-id"] == incoming) is kept
+    assert response.json()["request_id"] == response.headers["x-request-id"]
+
+
+def test_streamed_bodies_pass_through(logs):
+    with TestClient(build_app()) as client:
+        response = client.get("/stream")
+
+    assert response.content == b"abc"
+    assert "x-request-id" in response.headers
+    assert [record.status_code for record in completed(logs)] == [200]
+
+
+def test_unsampled_requests_are_logged_only_on_server_errors(logs):
+    with TestClient(build_app(sample_rate=0), raise_server_exceptions=False) as client:
+        assert client.get("/id").status_code == 200
+        assert client.get("/fail").status_code == 500
+
+    assert [record.getMessage() for record in middleware_records(logs)] == ["Request completed"]
+    assert completed(logs)[0].status_code == 500
@@ -0,0 +1,151 @@
+import time
+import uuid
+
+import pytest
+
+from config.settings import settings
+from src.application.resumable import UploadSession, UploadSessionStore, collect_expired_sessions
+
+BODY = bytes(range(256)) * 2
+
+
+@pytest.fixture
+def small_parts(monkeypatch):
+    # Parts of 100 bytes so a short body spans several of them
+    monkeypatch.setattr(settings, "S3_MULTIPART_PART_SIZE", 100)
+
+
+@pytest.fixture
+def bucket(client, auth):
+    client.post("/v1/buckets", json={"name": "b"}, headers=auth)
+    return "b"
+
+
+def open_session(client, auth, length=len(BODY), file_name="resumed.bin") -> str:
+    response = client.post("/v1/uploads/b/resumable", json={"file_name": file_name, "length": length}, headers=auth)
+    assert response.status_code == 201
+    assert response.headers["location"].endswith(response.json()["id"])
+    return response.json()["id"]
+
+
+def send(client, auth, session_id, offset, chunk):
+    return client.patch(
+        f"/v1/uploads/b/resumable/{session_id}",
+        content=chunk,
+        headers={**auth, "Upload-Offset": str(offset)}
+    )
+
+
+def test_chunks_are_appended_and_completed(client, auth, bucket, small_parts):
+    session_id = open_session(client, auth)
+
+    for offset in range(0, len(BODY), 70):
+        response = send(client, auth, session_id, offset, BODY[offset:offset + 70])
+        assert response.status_code == 204
+        assert response.headers["upload-offset"] == str(min(offset + 70, len(BODY)))
+
+    head = client.head(f"/v1/uploads/b/resumable/{session_id}", headers=auth)
+    assert head.headers["upload-offset"] == head.headers["upload-length"] == str(len(BODY))
+
+    assert client.post(f"/v1/uploads/b/resumable/{session_id}/complete", headers=auth).status_code == 201
+    assert client.get("/v1/buckets/b/resumed.bin", headers=auth).content == BODY
+    assert client.head(f"/v1/uploads/b/resumable/{session_id}", headers=auth).status_code == 404
+
+
+def test_wrong_offset_is_a_conflict(client, auth, bucket):
+    session_id = open_session(client, auth)
+    send(client, auth, session_id, 0, BODY[:10])
+
+    response = send(client, auth, session_id, 5, BODY[5:20])
+
+    assert response.status_code == 409
+    head = client.head(f"/v1/uploads/b/resumable/{session_id}", headers=auth)
+    assert head.headers["upload-offset"] == "10"
+
+
+def test_chunk_past_the_declared_length_is_rejected(client, auth, bucket):
+    session_id = open_session(client, auth, length=10)
+
+    assert send(client, auth, session_id, 0, b"x" * 11).status_code == 422
+
+
+def test_incomplete_upload_cannot_be_completed(client, auth, bucket):
+    session_id = open_session(client, auth)
+    send(client, auth, session_id, 0, BODY[:10])
+
+    response = client.post(f"/v1/uploads/b/resumable/{session_id}/complete", headers=auth)
+
+    assert response.status_code == 409
+
+
+def test_locked_session_is_a_conflict(client, auth, bucket):
+    session_id = open_session(client, auth)
+    store = client.app.state.upload_store
+
+    with store.lock(uuid.UUID(session_id)):
+        assert send(client, auth, session_id, 0, BODY[:10]).status_code == 409
+
+    assert send(client, auth, session_id, 0, BODY[:10]).status_code == 204
+
+
+def test_session_is_private_to_its_owner(client, auth, bucket, token_for):
+    session_id = open_session(client, auth)
+    stranger = {"Authorization": f"Bearer {token_for(uuid.uuid4())}"}
+
+    assert client.head(f"/v1/uploads/b/resumable/{session_id}", headers=stranger).status_code == 404
+    assert send(client, stranger, session_id, 0, BODY[:10]).status_code == 404
+
+
+def test_expired_session_is_not_found(client, auth, bucket, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_SESSION_TTL", -1)
+    session_id = open_session(client, auth)
+
+    assert client.head(f"/v1/uploads/b/resumable/{session_id}", headers=auth).status_code == 404
+    assert send(client, auth, session_id, 0, BODY[:10]).status_code == 404
+
+
+def test_cancel_aborts_the_multipart_upload(client, auth, bucket, small_parts):
+    session_id = open_session(client, auth)
+    send(client, auth, session_id, 0, BODY[:250])
+    uploads = client.app.state.storage_registry.default().root / "uploads"
+    assert len(list(uploads.iterdir())) == 1
+
+    assert client.delete(f"/v1/uploads/b/resumable/{session_id}", headers=auth).json()["accepted"] is True
+    assert list(uploads.iterdir()) == []
+    assert client.head(f"/v1/uploads/b/resumable/{session_id}", headers=auth).status_code == 404
+
+
+def test_collect_expired_sessions(tmp_path, local_storage):
+    store = UploadSessionStore(str(tmp_path / "sessions"))
+    bucket_id = uuid.uuid4()
+    # Sessions store uploads under the bucket id
+    local_storage.create_bucket(str(bucket_id))
+    upload_id = local_storage.create_multipart_upload("stale", str(bucket_id))
+    expired = UploadSession(
+        bucket_id=bucket_id, bucket_name="b", owner=uuid.uuid4(), file_name="stale",
+        length=10, upload_id=upload_id, expires_at=time.time() - 1
+    )
+    live = UploadSession(
+        bucket_id=bucket_id, bucket_name="b", owner=uuid.uuid4(), file_name="live",
+        length=10, expires_at=time.time() + 60
+    )
+    store.save(expired)
+    store.save(live)
+
+    assert collect_expired_sessions(store, local_storage) == 1
+    assert store.get(expired.id) is None
+    assert store.get(live.id) is not None
+    assert not (local_storage.root / "uploads" / upload_id).exists()
+
+
+def test_collection_skips_locked_sessions(tmp_path, local_storage):
+    store = UploadSessionStore(str(tmp_path / "sessions"))
+    session = UploadSession(
+        bucket_id=uuid.uuid4(), bucket_name="b", owner=uuid.uuid4(), file_name="busy",
+        length=10, expires_at=time.time() - 1
+    )
+    store.save(session)
+
+    with store.lock(session.id):
+        assert collect_expired_sessions(store, local_storage) == 0
+    assert collect_expired_sessions(store, local_storage) == 1
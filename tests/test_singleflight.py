@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.singleflight import AsyncSingleFlight, SingleFlight
+from src.database.memory import InMemoryEngine, MemoryMetadataStore
+from src.schema.requests.storage import Bucket
+
+
+def wait_until(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_concurrent_calls_share_one_run():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait()
+        return object()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flights.do, "key", fetch) for _ in range(4)]
+        wait_until(lambda: flights.stats()["coalesced"] == 3)
+        release.set()
+        results = {id(future.result()) for future in futures}
+
+    assert len(calls) == 1 and len(results) == 1
+    assert flights.stats() == {"in_flight": 0, "issued": 1, "coalesced": 3}
+
+
+def test_errors_reach_every_caller_and_are_not_kept():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait()
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(flights.do, "key", fail) for _ in range(2)]
+        wait_until(lambda: flights.stats()["coalesced"] == 1)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+    assert flights.do("key", lambda: "fresh") == "fresh"
+
+
+@pytest.mark.anyio
+async def test_concurrent_coroutines_share_one_task():
+    flights = AsyncSingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await release.wait()
+        return "result"
+
+    callers = [asyncio.create_task(flights.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*callers) == ["result"] * 3
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "issued": 1, "coalesced": 2}
+
+
+@pytest.mark.anyio
+async def test_a_caller_going_away_does_not_cancel_the_others():
+    flights = AsyncSingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "result"
+
+    first = asyncio.create_task(flights.do("key", fetch))
+    second = asyncio.create_task(flights.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "result"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.anyio
+async def test_forgotten_calls_are_not_joined():
+    flights = AsyncSingleFlight()
+    release = asyncio.Event()
+
+    async def stale():
+        await release.wait()
+        return "stale"
+
+    async def fresh():
+        return "fresh"
+
+    first = asyncio.create_task(flights.do("key", stale))
+    await asyncio.sleep(0)
+    flights.forget("key")
+
+    assert await flights.do("key", fresh) == "fresh"
+    release.set()
+    assert await first == "stale"
+
+
+class SlowEngine(InMemoryEngine):
+    """Memory engine whose bucket lookups wait to be released"""
+
+    def __init__(self):
+        super().__init__(MemoryMetadataStore())
+        self.flights = AsyncSingleFlight()
+        self.release = asyncio.Event()
+        self.fetches = 0
+
+    async def fetch_bucket(self, bucket_name, owner_id):
+        self.fetches += 1
+        await self.release.wait()
+        return await super().fetch_bucket(bucket_name, owner_id)
+
+
+@pytest.mark.anyio
+async def test_identical_bucket_lookups_are_coalesced_per_owner():
+    engine = SlowEngine()
+    owner, other = uuid.uuid4(), uuid.uuid4()
+    await engine.insert_bucket(Bucket(name="b"), owner)
+
+    lookups = [asyncio.create_task(engine.get_bucket_by_id_user("b", user)) for user in (owner, owner, other)]
+    await asyncio.sleep(0)
+    engine.release.set()
+    found = await asyncio.gather(*lookups)
+
+    assert engine.fetches == 2
+    assert found[0] is found[1] and found[0].name == "b"
+    assert found[2] is None
+
+
+@pytest.mark.anyio
+async def test_lookups_after_creating_a_bucket_do_not_join_older_ones():
+    engine = SlowEngine()
+    owner = uuid.uuid4()
+
+    before = asyncio.create_task(engine.get_bucket_by_id_user("b", owner))
+    await asyncio.sleep(0)
+    await engine.create_bucket(Bucket(name="b"), owner)
+    after = asyncio.create_task(engine.get_bucket_by_id_user("b", owner))
+    await asyncio.sleep(0)
+    engine.release.set()
+
+    assert (await after).name == "b"
+    assert engine.fetches == 2
+    await before
@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.application.types.local import LocalStorageActions
+from src.application.upload import MultipartUploader
+from src.core.executor import StorageExecutor
+
+
+class RecordingStorage(LocalStorageActions):
+    """Local backend counting multipart calls, optionally failing one part"""
+
+    def __init__(self, *args, fail_part=None, part_delay=0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_part = fail_part
+        self.part_delay = part_delay
+        self.part_numbers = []
+        self.aborted = []
+        self.events = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def upload_part(self, object_name, bucket_name, upload_id, part_number, data):
+        if part_number == self.fail_part:
+            raise OSError("part rejected")
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.part_delay)
+            self.part_numbers.append(part_number)
+            return super().upload_part(object_name, bucket_name, upload_id, part_number, data)
+        finally:
+            self.events.append(("part", part_number))
+            with self._lock:
+                self.in_flight -= 1
+
+    def abort_multipart_upload(self, object_name, bucket_name, upload_id):
+        self.aborted.append(upload_id)
+        self.events.append(("abort", upload_id))
+        return super().abort_multipart_upload(object_name, bucket_name, upload_id)
+
+
+@pytest.fixture
+def executor():
+    executor = StorageExecutor(max_workers=8, max_queue=8)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    def build(**kwargs):
+        storage = RecordingStorage(str(tmp_path / "local"), fsync="never", **kwargs)
+        storage.create_bucket("b")
+        return storage
+
+    return build
+
+
+async def chunks(body: bytes, size: int, fail_after=None):
+    for position in range(0, len(body), size):
+        if fail_after is not None and position >= fail_after:
+            raise ConnectionError("client went away")
+        yield body[position:position + size]
+        await asyncio.sleep(0)
+
+
+def uploads_left(storage) -> list:
+    return list((storage.root / "uploads").iterdir())
+
+
+@pytest.mark.anyio
+async def test_small_body_is_stored_in_one_call(storage, executor, read_object):
+    backend = storage()
+    uploader = MultipartUploader(backend, executor, "b", "small", part_size=100)
+
+    assert await uploader.upload(chunks(b"hello", 2)) == 5
+    assert uploader.upload_id is None
+    assert backend.part_numbers == []
+    assert read_object(backend, "small") == b"hello"
+
+
+@pytest.mark.anyio
+async def test_large_body_is_split_into_parts(storage, executor, read_object):
+    backend = storage()
+    body = bytes(range(256)) * 4
+    uploader = MultipartUploader(backend, executor, "b", "large", part_size=100, concurrency=3)
+
+    assert await uploader.upload(chunks(body, 33)) == len(body)
+    assert sorted(backend.part_numbers) == list(range(1, 12))
+    assert [part["PartNumber"] for part in uploader.parts] == list(range(1, 12))
+    assert read_object(backend, "large") == body
+    assert uploads_left(backend) == []
+
+
+@pytest.mark.anyio
+async def test_parts_in_flight_are_bounded(storage, executor):
+    backend = storage(part_delay=0.02)
+    uploader = MultipartUploader(backend, executor, "b", "bounded", part_size=10, concurrency=2)
+
+    await uploader.upload(chunks(b"x" * 200, 10))
+
+    assert backend.max_in_flight <= 2
+
+
+@pytest.mark.anyio
+async def test_rejected_part_aborts_the_upload(storage, executor):
+    backend = storage(fail_part=3)
+    uploader = MultipartUploader(backend, executor, "b", "broken", part_size=10, concurrency=2)
+
+    with pytest.raises(OSError):
+        await uploader.upload(chunks(b"x" * 100, 10))
+
+    assert backend.aborted == [uploader.upload_id]
+    assert uploads_left(backend) == []
+    assert not backend.object_exists("b", "broken")
+
+
+@pytest.mark.anyio
+async def test_failed_stream_aborts_the_upload(storage, executor):
+    backend = storage()
+    uploader = MultipartUploader(backend, executor, "b", "cut", part_size=10)
+
+    with pytest.raises(ConnectionError):
+        await uploader.upload(chunks(b"x" * 100, 10, fail_after=50))
+
+    assert backend.aborted == [uploader.upload_id]
+    assert uploads_left(backend) == []
+    assert not backend.object_exists("b", "cut")
+
+
+@pytest.mark.anyio
+async def test_abort_waits_for_parts_in_flight(storage, executor):
+    backend = storage(fail_part=2, part_delay=0.2)
+    uploader = MultipartUploader(backend, executor, "b", "racing", part_size=10, concurrency=3)
+
+    with pytest.raises(OSError):
+        await uploader.upload(chunks(b"x" * 100, 10))
+
+    # Parts 1 and 3 were still being written when part 2 failed
+    assert sorted(backend.events[:2]) == [("part", 1), ("part", 3)]
+    assert backend.events[2:] == [("abort", uploader.upload_id)]
+    assert uploads_left(backend) == []
@@ -0,0 +1,105 @@
+import io
+import uuid
+
+import pytest
+from fastapi import UploadFile
+
+from src.application.manager import StorageManager
+from src.core.exceptions import BucketNotFound, InternalServerError, ValidationError
+from src.core.executor import StorageExecutor
+from src.database.memory import InMemoryEngine, MemoryMetadataStore
+from src.schema.requests.storage import Bucket
+
+
+class FlakyEngine(InMemoryEngine):
+    """Memory engine whose object records can be made to fail, noting what storage held at the time"""
+
+    def __init__(self, storage):
+        super().__init__(MemoryMetadataStore())
+        self.storage = storage
+        self.fail = False
+        self.stored_when_recorded: list[bool] = []
+
+    async def upsert_file(self, bucket_id, file_name):
+        self.stored_when_recorded.append(self.storage.object_exists(str(bucket_id), file_name))
+        if self.fail:
+            raise ConnectionError("metadata database unreachable")
+        return await super().upsert_file(bucket_id, file_name)
+
+
+@pytest.fixture
+async def manager(local_storage, user_id):
+    executor = StorageExecutor(max_workers=2, max_queue=4)
+    manager = StorageManager("photos", local_storage, FlakyEngine(local_storage), executor)
+    await manager.create_bucket(Bucket(name="photos"), user_id)
+    yield manager
+    executor.shutdown()
+
+
+def upload(name: str, data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=name)
+
+
+async def stored_names(manager: StorageManager, user_id: uuid.UUID) -> list[str]:
+    bucket = await manager.engine.get_bucket_by_id_user("photos", user_id)
+    return manager.storage.list_files(str(bucket.id))
+
+
+@pytest.mark.anyio
+async def test_bytes_are_stored_before_they_are_recorded(manager, user_id, read_object):
+    url = await manager.upload_file(upload("a.txt", b"data"), user_id)
+
+    bucket = await manager.engine.get_bucket_by_id_user("photos", user_id)
+    assert manager.engine.stored_when_recorded == [True]
+    assert (await manager.engine.get_file("photos", "a.txt", user_id)).name == "a.txt"
+    assert read_object(manager.storage, "a.txt", str(bucket.id)) == b"data"
+    assert f"/{bucket.id}/a.txt?" in url
+
+
+@pytest.mark.anyio
+async def test_failed_stores_leave_no_record(manager, user_id, monkeypatch):
+    monkeypatch.setattr(manager.storage, "upload_fileobj", lambda **kwargs: False)
+
+    with pytest.raises(InternalServerError):
+        await manager.upload_file(upload("a.txt", b"data"), user_id)
+    assert manager.engine.stored_when_recorded == []
+    assert await manager.engine.get_file("photos", "a.txt", user_id) is None
+
+
+@pytest.mark.anyio
+async def test_unrecorded_bytes_are_deleted(manager, user_id):
+    manager.engine.fail = True
+
+    with pytest.raises(ConnectionError):
+        await manager.upload_file(upload("a.txt", b"data"), user_id)
+    assert await stored_names(manager, user_id) == []
+
+
+@pytest.mark.anyio
+async def test_overwritten_objects_keep_their_bytes_when_the_record_fails(manager, user_id):
+    await manager.upload_file(upload("a.txt", b"old"), user_id)
+    manager.engine.fail = True
+
+    with pytest.raises(ConnectionError):
+        await manager.upload_file(upload("a.txt", b"new"), user_id)
+    assert await stored_names(manager, user_id) == ["a.txt"]
+
+
+@pytest.mark.anyio
+async def test_uploads_are_checked_before_storing(manager, user_id):
+    with pytest.raises(ValidationError):
+        await manager.upload_file(upload("", b"data"), user_id)
+    with pytest.raises(BucketNotFound):
+        await manager.upload_file(upload("a.txt", b"data"), uuid.uuid4())
+    assert await stored_names(manager, user_id) == []
+
+
+@pytest.mark.anyio
+async def test_streamed_uploads_are_recorded_once_stored(manager, user_id):
+    async def body():
+        yield b"chunk"
+
+    await manager.upload_stream("s.bin", body(), user_id)
+
+    assert manager.engine.stored_when_recorded == [True]
+    assert await stored_names(manager, user_id) == ["s.bin"]